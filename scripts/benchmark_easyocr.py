@@ -0,0 +1,119 @@
+"""
+Benchmark EasyOCR CPU configurations on the synthetic samples.
+
+Compares latency and accuracy of:
+- baseline: full precision, EasyOCR default canvas (2560) / mag_ratio (1.0)
+- quantized: dynamic int8 recognizer, default canvas
+- quantized_adaptive: int8 recognizer + size-dependent canvas_size/mag_ratio
+
+Accuracy is measured as character similarity against the baseline output
+(the synthetic samples have no ground-truth transcripts) and as the share of
+ID-number fields the regex extractor still finds.
+
+Usage: python scripts/benchmark_easyocr.py [--runs 3] [--threads 0] [--json out.json]
+"""
+import argparse
+import difflib
+import glob
+import json
+import os
+import statistics
+import sys
+import time
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import cv2
+
+from src.ocr.easy_engine import EasyOCREngine, configure_torch_threads
+from src.classification.engine import DocumentClassifier
+from src.extraction.engine import ExtractionEngine
+
+SAMPLES_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "synthetic_data", "samples")
+
+CONFIGS = {
+    "baseline": {"quantize": False, "adaptive_scale": False},
+    "quantized": {"quantize": True, "adaptive_scale": False},
+    "quantized_adaptive": {"quantize": True, "adaptive_scale": True},
+}
+
+ID_FIELDS = ["aadhaar_number", "pan_number", "voter_id_number", "dl_number", "passport_number"]
+
+
+def id_fields_found(text, classifier, extractor):
+    doc_type = classifier.classify_by_rules(text)["type"]
+    fields = extractor.extract_by_regex(text, doc_type) if doc_type != "unknown" else {}
+    return {f: fields[f] for f in ID_FIELDS if f in fields}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark EasyOCR CPU configurations")
+    parser.add_argument("--runs", type=int, default=3, help="Timed runs per image (after 1 warmup)")
+    parser.add_argument("--threads", type=int, default=0, help="torch threads (0 = auto)")
+    parser.add_argument("--languages", default="en", help="Comma separated EasyOCR languages")
+    parser.add_argument("--json", dest="json_path", help="Write results to this JSON file")
+    args = parser.parse_args()
+
+    samples = sorted(glob.glob(os.path.join(SAMPLES_DIR, "*.jpg")))
+    if not samples:
+        print(f"No samples found in {SAMPLES_DIR}. Run scripts/generate_samples.py first.")
+        return
+
+    threads = configure_torch_threads(args.threads)
+    languages = [lang.strip() for lang in args.languages.split(",") if lang.strip()]
+    images = {os.path.basename(p): cv2.imread(p) for p in samples}
+
+    classifier = DocumentClassifier()
+    extractor = ExtractionEngine()
+
+    outputs = {}
+    latencies = {}
+    for name, config in CONFIGS.items():
+        engine = EasyOCREngine(languages=languages, device="cpu", **config)
+        outputs[name] = {}
+        latencies[name] = []
+        for image_name, image in images.items():
+            engine.extract(image)  # warmup
+            for _ in range(args.runs):
+                start = time.perf_counter()
+                text = engine.extract(image)
+                latencies[name].append((time.perf_counter() - start) * 1000)
+            outputs[name][image_name] = text
+        engine.close()
+
+    results = {"threads": threads, "languages": languages, "runs": args.runs, "configs": {}}
+    baseline = outputs["baseline"]
+    baseline_ids = {img: id_fields_found(text, classifier, extractor) for img, text in baseline.items()}
+
+    print(f"\nEasyOCR CPU benchmark ({len(images)} samples, {args.runs} runs, {threads} threads)")
+    print(f"{'config':<22}{'p50 ms':>10}{'mean ms':>10}{'similarity':>12}{'id recall':>11}")
+    for name in CONFIGS:
+        similarities = [
+            difflib.SequenceMatcher(None, baseline[img], outputs[name][img]).ratio()
+            for img in images
+        ]
+        expected = sum(len(v) for v in baseline_ids.values())
+        matched = 0
+        for img in images:
+            found = id_fields_found(outputs[name][img], classifier, extractor)
+            matched += sum(1 for f, v in baseline_ids[img].items() if found.get(f) == v)
+
+        row = {
+            "p50_ms": round(statistics.median(latencies[name]), 1),
+            "mean_ms": round(statistics.mean(latencies[name]), 1),
+            "similarity": round(statistics.mean(similarities), 4),
+            "id_recall": round(matched / expected, 4) if expected else None
+        }
+        results["configs"][name] = row
+        recall = f"{row['id_recall']:.2f}" if row["id_recall"] is not None else "n/a"
+        print(f"{name:<22}{row['p50_ms']:>10}{row['mean_ms']:>10}{row['similarity']:>12.3f}{recall:>11}")
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults written to {args.json_path}")
+
+
+if __name__ == "__main__":
+    main()
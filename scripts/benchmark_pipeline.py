@@ -0,0 +1,463 @@
+"""
+Benchmark the verification pipeline stage by stage on synthetic documents.
+
+Builds a corpus of N documents from the scripts/generate_samples.py
+templates, rendered at several resolutions (longest side in px) and
+Gaussian noise levels with a slight random skew, then times:
+
+- preprocessing sub-steps (deskew, denoise, enhance) and the full preprocessor
+- OCR on the preprocessed page
+- rule classification, regex extraction and validation on the OCR text
+- image checks (stamps/signatures, tampering, copy-move, portrait)
+- the full DocumentProcessor.process call
+
+Every stage gets warmup passes over the corpus, then timed repetitions.
+The JSON report has p50/p95/p99 latency, throughput (calls/s) and, per
+stage, the peak RSS sampled while that stage ran (warmup included) and
+rss_growth_mb, that peak minus the RSS when the stage started. RSS is
+read every few ms by a sampler thread (psutil when installed, else
+/proc/self/statm), since the kernel's ru_maxrss only ever grows and
+would credit every later stage with the largest earlier peak.
+LLM fallbacks are disabled unless --with-llm, so runs are comparable.
+Stages whose component can't load (e.g. no OCR engine) are reported as
+skipped.
+
+Usage:
+    python scripts/benchmark_pipeline.py run [--docs 12] [--resolutions 800,1600,2400]
+        [--noise 0,8,16] [--warmup 1] [--repeat 3] [--stages ocr,full] [--json out.json]
+    python scripts/benchmark_pipeline.py compare base.json new.json [--threshold 0.1] [--min-delta-ms 2]
+
+compare exits with status 1 when any stage's p50 or p95 regressed.
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import itertools
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import cv2
+import numpy as np
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+import generate_samples
+from src.classification.engine import DocumentClassifier
+from src.detection import detect_stamps_and_signatures
+from src.extraction.engine import ExtractionEngine
+from src.fraud import detect_copy_move, detect_tampering, extract_face
+from src.preprocessing.denoise import denoise_image
+from src.preprocessing.deskew import deskew_image
+from src.preprocessing.enhance import enhance_contrast
+from src.preprocessing.pipeline import ImagePreprocessor
+from src.validation.engine import ValidationEngine
+
+TEMPLATES = {
+    "aadhaar": generate_samples.create_aadhaar_card,
+    "pan": generate_samples.create_pan_card,
+    "voter_id": generate_samples.create_voter_id,
+    "driving_license": generate_samples.create_driving_license,
+    "passport": generate_samples.create_passport,
+    "birth_certificate": generate_samples.create_birth_certificate,
+}
+
+PERCENTILES = (50, 95, 99)
+
+
+# --- Corpus ---
+
+def render_variant(template: np.ndarray, long_side: int, noise: float, rng: np.random.Generator) -> np.ndarray:
+    """Rescale a template, skew it slightly and add Gaussian sensor noise."""
+    scale = long_side / max(template.shape[:2])
+    interpolation = cv2.INTER_AREA if scale < 1 else cv2.INTER_CUBIC
+    image = cv2.resize(template, None, fx=scale, fy=scale, interpolation=interpolation)
+
+    height, width = image.shape[:2]
+    angle = rng.uniform(-2.0, 2.0)
+    matrix = cv2.getRotationMatrix2D((width / 2, height / 2), angle, 1.0)
+    image = cv2.warpAffine(image, matrix, (width, height), borderValue=(255, 255, 255))
+
+    if noise > 0:
+        noisy = image.astype(np.float32) + rng.normal(0.0, noise, image.shape)
+        image = np.clip(noisy, 0, 255).astype(np.uint8)
+    return image
+
+
+def generate_corpus(out_dir: str, count: int, resolutions, noise_levels, seed: int = 0):
+    """Write `count` documents cycling through templates and resolution/noise variants."""
+    template_dir = os.path.join(out_dir, "templates")
+    os.makedirs(template_dir, exist_ok=True)
+    generate_samples.OUTPUT_DIR = template_dir
+    templates = {}
+    with contextlib.redirect_stdout(io.StringIO()):
+        for name, create in TEMPLATES.items():
+            templates[name] = cv2.imread(create())
+
+    variants = list(itertools.product(resolutions, noise_levels))
+    names = list(templates)
+    rng = np.random.default_rng(seed)
+    docs = []
+    for index in range(count):
+        name = names[index % len(names)]
+        long_side, noise = variants[index % len(variants)]
+        image = render_variant(templates[name], long_side, noise, rng)
+        path = os.path.join(out_dir, f"{index:03d}_{name}_{long_side}px_noise{noise:g}.jpg")
+        cv2.imwrite(path, image, [cv2.IMWRITE_JPEG_QUALITY, 90])
+        docs.append({
+            "path": path,
+            "template": name,
+            "variant": f"{long_side}px/noise{noise:g}",
+            "image": image
+        })
+    return docs
+
+
+# --- Measurement ---
+
+RSS_SAMPLE_INTERVAL_S = 0.005
+
+
+def peak_rss_mb() -> float:
+    """Process-lifetime peak RSS (never decreases)."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return round(peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024, 1)
+
+
+def current_rss_mb():
+    """Current RSS, or None where neither psutil nor /proc is available."""
+    if psutil is not None:
+        return psutil.Process().memory_info().rss / (1024 * 1024)
+    try:
+        with open("/proc/self/statm") as f:
+            resident_pages = int(f.read().split()[1])
+    except (OSError, IndexError, ValueError):
+        return None
+    return resident_pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+
+
+class RssSampler:
+    """Tracks the highest current RSS seen while the `with` block runs."""
+
+    def __init__(self, interval_s: float = RSS_SAMPLE_INTERVAL_S):
+        self.interval_s = interval_s
+        self.start_mb = None
+        self.peak_mb = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="rss-sampler", daemon=True)
+
+    def _sample(self):
+        rss = current_rss_mb()
+        if rss is not None and (self.peak_mb is None or rss > self.peak_mb):
+            self.peak_mb = rss
+
+    def _run(self):
+        while not self._stop.wait(self.interval_s):
+            self._sample()
+
+    def __enter__(self):
+        self.start_mb = current_rss_mb()
+        self.peak_mb = self.start_mb
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join()
+        self._sample()
+        return False
+
+
+def summarize(samples_ms, wall_s: float):
+    values = np.asarray(samples_ms)
+    row = {
+        "calls": len(values),
+        "mean_ms": round(float(values.mean()), 2),
+        "max_ms": round(float(values.max()), 2),
+        "throughput_per_s": round(len(values) / wall_s, 2) if wall_s > 0 else None
+    }
+    for p in PERCENTILES:
+        row[f"p{p}_ms"] = round(float(np.percentile(values, p)), 2)
+    return row
+
+
+def measure(func, docs, warmup: int, repeat: int):
+    """
+    Warm up over the corpus, then time `repeat` passes (one sample per call).
+    RSS is sampled throughout, so the peak belongs to this stage alone.
+    """
+    samples, by_variant = [], {}
+    with RssSampler() as rss:
+        for _ in range(warmup):
+            for doc in docs:
+                func(doc)
+
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for doc in docs:
+                call_start = time.perf_counter()
+                func(doc)
+                elapsed_ms = (time.perf_counter() - call_start) * 1000
+                samples.append(elapsed_ms)
+                by_variant.setdefault(doc["variant"], []).append(elapsed_ms)
+        wall_s = time.perf_counter() - start
+
+    row = summarize(samples, wall_s)
+    if rss.peak_mb is None:
+        row["peak_rss_mb"] = row["rss_growth_mb"] = None
+    else:
+        row["peak_rss_mb"] = round(rss.peak_mb, 1)
+        row["rss_growth_mb"] = round(rss.peak_mb - rss.start_mb, 1)
+    row["by_variant_p50_ms"] = {
+        variant: round(float(np.percentile(values, 50)), 2) for variant, values in sorted(by_variant.items())
+    }
+    return row
+
+
+def load_components(with_llm: bool):
+    """The full processor when it loads (needs an OCR engine), else the OCR-free components."""
+    try:
+        from src.orchestration.processor import DocumentProcessor
+        processor = DocumentProcessor()
+        components = {
+            "preprocessor": processor.preprocessor,
+            "ocr": processor.ocr,
+            "classifier": processor.classifier,
+            "extractor": processor.extractor,
+            "validator": processor.validator
+        }
+    except Exception as e:
+        print(f"DocumentProcessor unavailable ({e}); skipping OCR and full-pipeline stages")
+        processor = None
+        components = {
+            "preprocessor": ImagePreprocessor(),
+            "ocr": None,
+            "classifier": DocumentClassifier(),
+            "extractor": ExtractionEngine(),
+            "validator": ValidationEngine()
+        }
+    if not with_llm:
+        # Keep runs offline and comparable: rules/regex only
+        components["classifier"].close()
+        components["extractor"].close()
+    return processor, components
+
+
+def prepare_inputs(docs, components):
+    """Untimed pass producing each stage's inputs (preprocessed page, OCR text, fields)."""
+    for doc in docs:
+        doc["preprocessed"] = components["preprocessor"].process(doc["image"])
+        if components["ocr"] is None:
+            continue
+        doc["text"] = components["ocr"].extract_page(doc["preprocessed"]).text
+        doc["doc_type"] = components["classifier"].classify_by_rules(doc["text"])["type"]
+        doc["fields"] = components["extractor"].extract_by_regex(doc["text"], doc["doc_type"])
+
+
+def build_stages(processor, components):
+    """Stage name -> (callable taking a corpus doc, or None when unavailable)."""
+    ocr = components["ocr"]
+    has_text = ocr is not None
+    loop = asyncio.new_event_loop()
+
+    def full(doc):
+        result = loop.run_until_complete(
+            processor.process(doc["path"], run_fraud_check=True, describe_face=True)
+        )
+        if result.get("status") != "success":
+            raise RuntimeError(result.get("error"))
+
+    return {
+        "preprocess.deskew": lambda doc: deskew_image(doc["image"]),
+        "preprocess.denoise": lambda doc: denoise_image(doc["image"]),
+        "preprocess.enhance": lambda doc: enhance_contrast(doc["image"]),
+        "preprocess": lambda doc: components["preprocessor"].process(doc["image"]),
+        "ocr": (lambda doc: ocr.extract_page(doc["preprocessed"])) if has_text else None,
+        "classify.rules": (lambda doc: components["classifier"].classify_by_rules(doc["text"])) if has_text else None,
+        "extract.regex": (
+            lambda doc: components["extractor"].extract_by_regex(doc["text"], doc["doc_type"])
+        ) if has_text else None,
+        "validate": (lambda doc: components["validator"].validate(doc["fields"], doc["doc_type"])) if has_text else None,
+        "image_checks.stamps": lambda doc: detect_stamps_and_signatures(doc["image"]),
+        "image_checks.tamper": lambda doc: detect_tampering(doc["image"]),
+        "image_checks.copy_move": lambda doc: detect_copy_move(doc["image"]),
+        "image_checks.face": lambda doc: extract_face(doc["image"]),
+        "full": full if processor is not None else None,
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except Exception:
+        return None
+
+
+def run(args):
+    resolutions = [int(v) for v in args.resolutions.split(",") if v.strip()]
+    noise_levels = [float(v) for v in args.noise.split(",") if v.strip()]
+    selected = [s.strip() for s in args.stages.split(",") if s.strip()] if args.stages else None
+
+    with tempfile.TemporaryDirectory(prefix="docverify-bench-") as tmp:
+        corpus_dir = args.corpus_dir or tmp
+        docs = generate_corpus(corpus_dir, args.docs, resolutions, noise_levels, seed=args.seed)
+        print(f"Generated {len(docs)} documents ({len(resolutions)} resolutions x {len(noise_levels)} noise levels)")
+
+        processor, components = load_components(args.with_llm)
+        prepare_inputs(docs, components)
+        stages = build_stages(processor, components)
+
+        results = {}
+        print(f"\n{'stage':<26}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'calls/s':>10}{'peak MB':>10}")
+        for name, func in stages.items():
+            if selected and not any(name == s or name.startswith(s + ".") for s in selected):
+                continue
+            if func is None:
+                results[name] = {"skipped": "component unavailable"}
+                print(f"{name:<26}{'skipped':>10}")
+                continue
+            try:
+                row = measure(func, docs, args.warmup, args.repeat)
+            except Exception as e:
+                results[name] = {"skipped": f"failed: {e}"}
+                print(f"{name:<26}{'failed':>10}  {e}")
+                continue
+            results[name] = row
+            print(
+                f"{name:<26}{row['p50_ms']:>10}{row['p95_ms']:>10}{row['p99_ms']:>10}"
+                f"{row['throughput_per_s']:>10}{str(row['peak_rss_mb']):>10}"
+            )
+
+    report = {
+        "created_at": datetime.utcnow().isoformat(),
+        "git_commit": git_commit(),
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "ocr_engine": getattr(components["ocr"], "engine_name", None)
+        },
+        "config": {
+            "docs": args.docs,
+            "resolutions": resolutions,
+            "noise_levels": noise_levels,
+            "warmup": args.warmup,
+            "repeat": args.repeat,
+            "seed": args.seed,
+            "with_llm": args.with_llm
+        },
+        "peak_rss_mb": peak_rss_mb(),
+        "stages": results
+    }
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResults written to {args.json_path}")
+    return report
+
+
+# --- Comparison ---
+
+def compare_reports(base, new, threshold: float, min_delta_ms: float):
+    """Per-stage p50/p95 changes; a regression is slower by > threshold and > min_delta_ms."""
+    rows, regressions = [], []
+    for stage in sorted(set(base["stages"]) | set(new["stages"])):
+        old_row, new_row = base["stages"].get(stage), new["stages"].get(stage)
+        if not old_row or not new_row or "skipped" in old_row or "skipped" in new_row:
+            rows.append({"stage": stage, "status": "not comparable"})
+            continue
+        row = {"stage": stage, "status": "ok"}
+        for metric in ("p50_ms", "p95_ms"):
+            before, after = old_row[metric], new_row[metric]
+            change = (after - before) / before if before else 0.0
+            row[metric] = {"base": before, "new": after, "change": round(change, 4)}
+            if change > threshold and after - before > min_delta_ms:
+                row["status"] = "regression"
+            elif change < -threshold and before - after > min_delta_ms and row["status"] == "ok":
+                row["status"] = "improvement"
+        rows.append(row)
+        if row["status"] == "regression":
+            regressions.append(stage)
+    return rows, regressions
+
+
+def compare(args):
+    with open(args.base) as f:
+        base = json.load(f)
+    with open(args.new) as f:
+        new = json.load(f)
+    if base.get("config") != new.get("config"):
+        print("Warning: runs used different corpus/repetition settings; latencies may not be comparable")
+
+    rows, regressions = compare_reports(base, new, args.threshold, args.min_delta_ms)
+    print(f"\n{'stage':<26}{'base p50':>10}{'new p50':>10}{'change':>9}{'base p95':>10}{'new p95':>10}{'change':>9}  status")
+    for row in rows:
+        if "p50_ms" not in row:
+            print(f"{row['stage']:<26}{'':>58}  {row['status']}")
+            continue
+        p50, p95 = row["p50_ms"], row["p95_ms"]
+        print(
+            f"{row['stage']:<26}{p50['base']:>10.2f}{p50['new']:>10.2f}{p50['change']:>+9.1%}"
+            f"{p95['base']:>10.2f}{p95['new']:>10.2f}{p95['change']:>+9.1%}  {row['status']}"
+        )
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump({"base": args.base, "new": args.new, "stages": rows, "regressions": regressions}, f, indent=2)
+    if regressions:
+        print(f"\nRegressions (> {args.threshold:.0%} and > {args.min_delta_ms} ms): {', '.join(regressions)}")
+        return 1
+    print("\nNo regressions")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the DocVerify pipeline on synthetic documents")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Generate a corpus and time each stage")
+    run_parser.add_argument("--docs", type=int, default=12, help="Documents in the corpus")
+    run_parser.add_argument("--resolutions", default="800,1600,2400", help="Longest side in px, comma separated")
+    run_parser.add_argument("--noise", default="0,8,16", help="Gaussian noise sigma levels, comma separated")
+    run_parser.add_argument("--warmup", type=int, default=1, help="Untimed passes over the corpus per stage")
+    run_parser.add_argument("--repeat", type=int, default=3, help="Timed passes over the corpus per stage")
+    run_parser.add_argument("--stages", help="Only these stages (prefixes allowed, e.g. preprocess,ocr)")
+    run_parser.add_argument("--seed", type=int, default=0, help="Seed for skew and noise")
+    run_parser.add_argument("--with-llm", action="store_true", help="Allow Gemini fallbacks in classify/extract")
+    run_parser.add_argument("--corpus-dir", help="Keep the generated corpus here (default: temp dir)")
+    run_parser.add_argument("--json", dest="json_path", help="Write the report to this JSON file")
+
+    compare_parser = commands.add_parser("compare", help="Compare two run reports")
+    compare_parser.add_argument("base", help="Baseline report JSON")
+    compare_parser.add_argument("new", help="Candidate report JSON")
+    compare_parser.add_argument("--threshold", type=float, default=0.10, help="Relative slowdown counted as a regression")
+    compare_parser.add_argument("--min-delta-ms", type=float, default=2.0, help="Ignore absolute changes below this")
+    compare_parser.add_argument("--json", dest="json_path", help="Write the comparison to this JSON file")
+
+    args = parser.parse_args()
+    if args.command == "run":
+        run(args)
+        return 0
+    return compare(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
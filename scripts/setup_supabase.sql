@@ -43,6 +43,7 @@ CREATE TABLE IF NOT EXISTS documents (
     file_hash VARCHAR(64) NOT NULL,
     mime_type VARCHAR(100),
     file_size_bytes INTEGER,
+    perceptual_hash JSONB,  -- {"phash": hex, "dhash": hex} for near-duplicate search
 
     document_type document_type,
     detected_language VARCHAR(50),
@@ -122,6 +123,9 @@ CREATE TABLE IF NOT EXISTS document_templates (
     created_at TIMESTAMPTZ DEFAULT NOW()
 );
 
+-- Columns added after the initial release
+ALTER TABLE documents ADD COLUMN IF NOT EXISTS perceptual_hash JSONB;
+
 -- Indexes for performance
 CREATE INDEX IF NOT EXISTS idx_documents_type ON documents(document_type);
 CREATE INDEX IF NOT EXISTS idx_documents_hash ON documents(file_hash);
@@ -135,6 +139,7 @@ CREATE INDEX IF NOT EXISTS idx_documents_created ON documents(created_at DESC);
 CREATE INDEX IF NOT EXISTS idx_verifications_status ON verifications(status);
 CREATE INDEX IF NOT EXISTS idx_verifications_document ON verifications(document_id);
 CREATE INDEX IF NOT EXISTS idx_verifications_created ON verifications(created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_verifications_document_latest ON verifications(document_id, created_at DESC);
 
 CREATE INDEX IF NOT EXISTS idx_audit_document ON audit_logs(document_id);
 CREATE INDEX IF NOT EXISTS idx_audit_verification ON audit_logs(verification_id);
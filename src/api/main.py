@@ -4,45 +4,126 @@ DocVerify AI - FastAPI Application
 REST API endpoints for document verification.
 """
 
-from fastapi import FastAPI, UploadFile, File, HTTPException, Query
+from fastapi import FastAPI, UploadFile, File, HTTPException, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
-import shutil
+import asyncio
+import contextvars
+import functools
 import os
 import uuid
 import hashlib
+import json
 from datetime import datetime
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
+import numpy as np
 
 from pydantic import BaseModel, Field
 
 from src.core.config import get_settings
 from src.core.logger import logger
-from src.orchestration.processor import DocumentProcessor
+from src.core.metrics import record_cache, render_metrics
+from src.core.model_registry import get_model_registry
+from src.core.tracing import configure_tracing, current_trace_ids, server_span, set_attributes, shutdown_tracing
 from src.api import storage
+from src.api.startup import StartupState, load_processor
+from src.ingestion import PageLimitError
+from src.ocr.page import OCRPage
 
 settings = get_settings()
+configure_tracing()
 
 # Global Processor Instance
 processor = None
+startup_state = StartupState()
+# Pooled agents serving the processor's OCR (see _start_agent_pools)
+agent_manager = None
 
 
-@asynccontextmanager
-async def lifespan(app: FastAPI):
+def preload_processor():
     """
-    Lifecycle manager: Initialize processor on startup.
+    Load and warm up the processor in the current process (blocking).
+    Used by the single-worker server; forked workers load their own.
     """
     global processor
-    logger.info("Startup: Initializing Document Processor...")
+    processor = load_processor(startup_state)
+    return processor
+
+
+async def _load_processor_in_background():
+    global processor
+    loaded = await asyncio.to_thread(load_processor, startup_state)
+    if loaded:
+        # Published only once its OCR has moved to the agents, so no request
+        # is still using the engine that move releases
+        await _start_agent_pools(loaded)
+        processor = loaded
+        logger.info("Startup: Processor ready", timings_ms=startup_state.timings_ms)
+
+
+async def _start_agent_pools(processor):
+    """
+    Move the processor's OCR onto a pool of OCR agents and start reaping
+    idle ones. On failure the processor keeps its own engine.
+    """
+    global agent_manager
+    if settings.OCR_AGENT_POOL_SIZE <= 0:
+        return
+    from src.orchestration.agent_manager import AgentManager
+    from src.orchestration.agents import OCRAgent
+
+    manager = AgentManager()
+    manager.register_agent_type("ocr", OCRAgent)
     try:
-        processor = DocumentProcessor()
-        logger.info("Startup: Processor ready")
+        await manager.create_pool(
+            "ocr",
+            config={"engine": processor.ocr.engine_name, "routing": settings.OCR_LANGUAGE_ROUTING},
+            min_size=1,
+            max_size=settings.OCR_AGENT_POOL_SIZE
+        )
     except Exception as e:
-        logger.error("Startup Failed", error=str(e))
+        logger.warning("Startup: OCR agent pool unavailable, using the processor's engine", error=str(e))
+        await manager.shutdown_all()
+        return
+    processor.use_ocr_agents(manager, asyncio.get_running_loop())
+    manager.start_reaper()
+    agent_manager = manager
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Lifecycle manager: Load processor in the background on startup.
+    The API starts serving immediately; /health reports "warming" until ready.
+    """
+    warmup_task = None
+    if processor is None:
+        logger.info("Startup: Initializing Document Processor in background...")
+        warmup_task = asyncio.create_task(_load_processor_in_background())
+    else:
+        logger.info("Startup: Using preloaded Document Processor")
+        await _start_agent_pools(processor)
 
     yield
 
     logger.info("Shutdown: Cleanup...")
+    if warmup_task and not warmup_task.done():
+        warmup_task.cancel()
+    if agent_manager is not None:
+        await agent_manager.shutdown_all()
+    from src.fraud import save_face_index, save_vector_index
+    save_vector_index()
+    save_face_index()
+    shutdown_tracing()
+
+
+def _require_processor():
+    """Return the processor or raise 503 while it is still loading."""
+    if not processor:
+        if startup_state.status in ("starting", "warming"):
+            raise HTTPException(status_code=503, detail="Document Processor is warming up, retry shortly")
+        raise HTTPException(status_code=503, detail="Document Processor not initialized")
+    return processor
 
 
 app = FastAPI(
@@ -63,6 +144,26 @@ app.add_middleware(
 )
 
 
+@app.middleware("http")
+async def trace_requests(request: Request, call_next):
+    """One server span per request; handlers, pipeline stages, models and storage nest under it."""
+    with server_span(
+        f"{request.method} {request.url.path}",
+        request.headers,
+        {"http.method": request.method, "http.target": request.url.path}
+    ) as current:
+        response = await call_next(request)
+        route = request.scope.get("route")
+        if current is not None and route is not None:
+            current.update_name(f"{request.method} {route.path}")
+        set_attributes(current, {"http.route": getattr(route, "path", None), "http.status_code": response.status_code})
+        trace_id = current_trace_ids().get("trace_id")
+        if trace_id:
+            # Lets a client quote the trace of a slow request
+            response.headers["X-Trace-Id"] = trace_id
+        return response
+
+
 # --- Pydantic Models ---
 class DocumentUploadResponse(BaseModel):
     document_id: str
@@ -71,6 +172,7 @@ class DocumentUploadResponse(BaseModel):
     file_hash: str
     status: str
     message: str
+    latest_verification: Optional[Dict[str, Any]] = None
 
 
 class VerifyRequest(BaseModel):
@@ -78,6 +180,7 @@ class VerifyRequest(BaseModel):
     language_hint: Optional[str] = "en"
     document_type_hint: Optional[str] = None
     run_fraud_check: bool = True
+    fraud_time_budget_ms: Optional[int] = None
 
 
 class DocumentInfo(BaseModel):
@@ -101,13 +204,141 @@ class ClassifyRequest(BaseModel):
 
 
 # --- Helper Functions ---
-def compute_file_hash(file_path: str) -> str:
-    """Compute SHA256 hash of file."""
+async def save_upload(file: UploadFile, file_path: str) -> Tuple[str, int]:
+    """
+    Stream an upload to disk, hashing each chunk as it is written.
+
+    Single pass over the data (no re-read to hash) and the size limit is
+    enforced while streaming, so oversized uploads are never fully written.
+
+    Returns:
+        (sha256 hex digest, size in bytes)
+    """
+    max_bytes = settings.MAX_FILE_SIZE_MB * 1024 * 1024
     sha256_hash = hashlib.sha256()
-    with open(file_path, "rb") as f:
-        for byte_block in iter(lambda: f.read(4096), b""):
-            sha256_hash.update(byte_block)
-    return sha256_hash.hexdigest()
+    size = 0
+    os.makedirs(os.path.dirname(file_path) or ".", exist_ok=True)
+    try:
+        with open(file_path, "wb") as buffer:
+            while chunk := await file.read(settings.UPLOAD_CHUNK_SIZE):
+                size += len(chunk)
+                if size > max_bytes:
+                    raise HTTPException(
+                        status_code=413,
+                        detail=f"File exceeds maximum size of {settings.MAX_FILE_SIZE_MB} MB"
+                    )
+                sha256_hash.update(chunk)
+                buffer.write(chunk)
+    except BaseException:
+        if os.path.exists(file_path):
+            os.remove(file_path)
+        raise
+    return sha256_hash.hexdigest(), size
+
+
+def verification_reuse_key(file_hash: Optional[str], **options: Any) -> str:
+    """
+    Key under which a verification can be reused: the document's bytes plus
+    every option that changes the result. The password is hashed, and the
+    fraud budget is resolved to its default so None and the default match.
+    """
+    if options.get("pdf_password"):
+        options["pdf_password"] = hashlib.sha256(options["pdf_password"].encode("utf-8")).hexdigest()
+    if options.get("fraud_time_budget_ms") is None:
+        options["fraud_time_budget_ms"] = settings.FRAUD_TIME_BUDGET_MS
+    payload = json.dumps({"file_hash": file_hash, **options}, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+async def run_duplicate_checks(doc_id: str, result: Dict[str, Any], flag: bool = True) -> None:
+    """
+    Search the near-duplicate (pHash), content (embedding) and identity
+    number indexes for the processed document, then register it in each.
+
+    Sets duplicate_match_id and "near_duplicate" / "similar_content" /
+    "identity_reuse" fraud flags on the result when other documents match,
+    and a "face_reuse" flag when the portrait matches a document carrying a
+    different identity number. The portrait descriptor is taken from the
+    result when it was just computed, otherwise from the face index cache.
+    """
+    if result.get("status") != "success":
+        return
+    from src.fraud import PerceptualHash, document_embedding_text, get_embedder
+
+    hashes = None
+    if result.get("perceptual_hash"):
+        hashes = PerceptualHash.from_dict(result["perceptual_hash"])
+    vector = get_embedder().embed(
+        document_embedding_text(result.get("raw_text", ""), result.get("extracted_fields"))
+    )
+    face_descriptor = result.pop("face_descriptor", None)
+    if face_descriptor is not None:
+        face_descriptor = np.asarray(face_descriptor, dtype=np.float32)
+    else:
+        face_descriptor = await storage.get_face_descriptor(doc_id)
+
+    if flag:
+        flags = result.setdefault("fraud_flags", [])
+        match = await storage.find_near_duplicate(hashes, exclude_id=doc_id) if hashes else None
+        result["duplicate_match_id"] = match.document_id if match else None
+        if match:
+            logger.info("Near-duplicate document", document_id=doc_id, match=match.to_dict())
+            flags.append({
+                "type": "near_duplicate",
+                "severity": "high",
+                "description": f"Image matches previously submitted document {match.document_id}",
+                **match.to_dict()
+            })
+
+        similar = [
+            (other_id, score)
+            for other_id, score in await storage.find_similar_documents(vector, exclude_id=doc_id)
+            if score >= settings.EMBEDDING_DUPLICATE_THRESHOLD
+        ]
+        if similar:
+            result["duplicate_match_id"] = result["duplicate_match_id"] or similar[0][0]
+            flags.append({
+                "type": "similar_content",
+                "severity": "medium",
+                "description": f"Text and fields closely match {len(similar)} other document(s)",
+                "matches": [{"document_id": other_id, "similarity": round(score, 4)} for other_id, score in similar]
+            })
+
+        fields = result.get("extracted_fields") or {}
+        for reuse in await storage.find_identity_reuse(doc_id, fields):
+            count = reuse["other_document_count"]
+            names = reuse["different_names"]
+            description = f"This {reuse['label']} number was seen on {count} other document(s)"
+            if names:
+                description += f" with different names ({len(names)})"
+            flags.append({
+                "type": "identity_reuse",
+                "severity": "high" if names else "medium",
+                "description": description,
+                **reuse
+            })
+
+        if face_descriptor is not None:
+            for other_id, similarity in await storage.find_similar_faces(face_descriptor, exclude_id=doc_id):
+                conflicts = await storage.find_identity_conflicts(fields, other_id)
+                if not conflicts:
+                    continue
+                labels = ", ".join(conflict["label"] for conflict in conflicts)
+                flags.append({
+                    "type": "face_reuse",
+                    "severity": "high",
+                    "description": f"Portrait matches document {other_id}, which carries a different {labels} number",
+                    "document_id": other_id,
+                    "similarity": round(similarity, 4),
+                    "fields": [conflict["field"] for conflict in conflicts]
+                })
+
+    if hashes:
+        await storage.save_perceptual_hash(doc_id, hashes)
+    await storage.save_embedding(doc_id, vector)
+    await storage.index_identity(doc_id, result.get("extracted_fields") or {})
+    if face_descriptor is not None:
+        await storage.save_face_descriptor(doc_id, face_descriptor)
 
 
 # --- Root & Health Endpoints ---
@@ -141,14 +372,31 @@ async def root():
 @app.get("/health")
 async def health_check():
     """Health check endpoint."""
+    status = "online"
+    if startup_state.status in ("starting", "warming"):
+        status = "warming"
+    elif processor is None:
+        status = "degraded"
+
     return {
-        "status": "online",
+        "status": status,
         "processor_initialized": processor is not None,
+        "startup": startup_state.to_dict(),
+        "loaded_models": get_model_registry().stats(),
+        "model_load_failures": get_model_registry().load_failures(),
+        "agent_pools": agent_manager.pool_metrics() if agent_manager else {},
         "timestamp": datetime.utcnow().isoformat(),
         "database_enabled": settings.USE_DATABASE
     }
 
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus scrape endpoint (per-stage latency histograms, cache and fallback counters)."""
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
+
+
 # --- Document Endpoints ---
 @app.post("/api/v1/documents/upload", response_model=DocumentUploadResponse)
 async def upload_document(
@@ -173,17 +421,26 @@ async def upload_document(
         document_id = str(uuid.uuid4())
         logger.info("Uploading document", document_id=document_id, filename=file.filename)
 
-        # Create uploads directory
-        os.makedirs("uploads", exist_ok=True)
-        file_path = f"uploads/{document_id}_{file.filename}"
-
-        # Save file
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-
-        # Compute hash
-        file_hash = compute_file_hash(file_path)
-        file_size = os.path.getsize(file_path)
+        # Stream to a temporary name, hashing as we write
+        file_path = os.path.join(settings.UPLOAD_DIR, f"{document_id}_{file.filename}")
+        part_path = f"{file_path}.part"
+        file_hash, file_size = await save_upload(file, part_path)
+
+        # Identical bytes already uploaded: drop the copy and point at the original
+        existing = await storage.find_document_by_hash(file_hash)
+        if existing:
+            os.remove(part_path)
+            logger.info("Duplicate upload", document_id=existing["document_id"], file_hash=file_hash)
+            return DocumentUploadResponse(
+                document_id=existing["document_id"],
+                file_name=existing.get("file_name", file.filename),
+                file_size=file_size,
+                file_hash=file_hash,
+                status="duplicate",
+                message="Identical document already uploaded. Use /api/v1/verify with this document_id.",
+                latest_verification=await storage.get_latest_verification(existing["document_id"])
+            )
+        os.replace(part_path, file_path)
 
         # Store document
         doc_info = {
@@ -208,6 +465,8 @@ async def upload_document(
             message="Document uploaded successfully. Use /api/v1/verify to verify."
         )
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error("Upload failed", error=str(e))
         raise HTTPException(status_code=500, detail=str(e))
@@ -253,30 +512,58 @@ async def delete_document(document_id: str):
 @app.post("/api/v1/verify")
 async def verify_document(
     file: Optional[UploadFile] = File(None),
-    document_id: Optional[str] = Query(None, description="Document ID from previous upload")
+    document_id: Optional[str] = Query(None, description="Document ID from previous upload"),
+    angle_cls: Optional[bool] = Query(None, description="Force text-line angle classification on/off (default: auto)"),
+    language_hint: Optional[str] = Query(None, description="Language hint: en, hi, ta, te (default: auto-detect)"),
+    force_ocr: bool = Query(False, description="OCR every page even if the PDF has a usable text layer"),
+    pdf_password: Optional[str] = Query(None, description="Password for encrypted PDFs (e.g. e-Aadhaar)"),
+    reuse_existing: Optional[bool] = Query(None, description="Return an earlier successful verification of identical bytes with the same options instead of re-running (default: on for uploads, off for document_id)"),
+    run_fraud_check: bool = Query(True, description="Run fraud checks (tampering, duplicate images, similar content, reused identity numbers)"),
+    fraud_time_budget_ms: Optional[int] = Query(None, ge=0, description="Max time image fraud checks may run, from when the first page reaches them (default: FRAUD_TIME_BUDGET_MS)")
 ):
     """
     Run verification on a document.
 
     Either provide a file directly or reference a previously uploaded document_id.
+    An upload with the same bytes and options as an earlier successful,
+    valid verification returns that verification (flagged "cached") unless
+    reuse_existing is false. Verifying by document_id re-runs unless
+    reuse_existing is true.
     """
-    global processor
-    if not processor:
-        raise HTTPException(status_code=503, detail="Document Processor not initialized")
+    _require_processor()
 
     try:
         verification_id = str(uuid.uuid4())
         file_path = None
         doc_id = None
+        file_hash = None
+        resubmitted = False
 
         # Option 1: Direct file upload
         if file:
             doc_id = str(uuid.uuid4())
-            os.makedirs("uploads", exist_ok=True)
-            file_path = f"uploads/{doc_id}_{file.filename}"
-
-            with open(file_path, "wb") as buffer:
-                shutil.copyfileobj(file.file, buffer)
+            file_path = os.path.join(settings.UPLOAD_DIR, f"{doc_id}_{file.filename}")
+            file_hash, file_size = await save_upload(file, file_path)
+
+            existing = await storage.find_document_by_hash(file_hash)
+            if existing:
+                # Identical bytes: verify the stored document, not a second copy
+                os.remove(file_path)
+                doc_id = existing["document_id"]
+                file_path = existing["file_path"]
+                resubmitted = True
+            else:
+                # Register the upload so later resubmissions hit the hash index
+                doc_id = await storage.save_document({
+                    "document_id": doc_id,
+                    "file_name": file.filename,
+                    "file_path": file_path,
+                    "file_hash": file_hash,
+                    "file_size": file_size,
+                    "mime_type": file.content_type,
+                    "uploaded_at": datetime.utcnow().isoformat(),
+                    "status": "uploaded"
+                })
 
             logger.info("Received direct file for verification", verification_id=verification_id)
 
@@ -287,6 +574,8 @@ async def verify_document(
                 raise HTTPException(status_code=404, detail="Document not found")
             doc_id = document_id
             file_path = doc["file_path"]
+            file_hash = doc.get("file_hash")
+            resubmitted = bool(file_hash)
 
         else:
             raise HTTPException(
@@ -294,10 +583,46 @@ async def verify_document(
                 detail="Either provide a file or document_id"
             )
 
+        reuse_key = verification_reuse_key(
+            file_hash,
+            angle_cls=angle_cls,
+            language_hint=language_hint,
+            force_ocr=force_ocr,
+            pdf_password=pdf_password,
+            run_fraud_check=run_fraud_check,
+            fraud_time_budget_ms=fraud_time_budget_ms
+        )
+        if reuse_existing is None:
+            reuse_existing = file is not None
+        if reuse_existing and resubmitted:
+            previous = await storage.get_reusable_verification(reuse_key)
+            record_cache("verification", previous is not None)
+            if previous:
+                logger.info("Returning existing verification", document_id=doc_id)
+                return {**previous, "cached": True}
+
         logger.info("Starting verification", verification_id=verification_id, path=file_path)
 
+        face_cached = await storage.has_face_descriptor(doc_id)
+        record_cache("face_descriptor", face_cached)
+
         # Run Processing
-        result = await processor.process(file_path)
+        result = await processor.process(
+            file_path,
+            angle_cls=angle_cls,
+            language_hint=language_hint,
+            force_ocr=force_ocr,
+            password=pdf_password,
+            run_fraud_check=run_fraud_check,
+            fraud_time_budget_ms=fraud_time_budget_ms,
+            describe_face=not face_cached
+        )
+        if result.get("error_code") == "page_limit_exceeded":
+            await storage.update_document(doc_id, {"status": "rejected"})
+            raise HTTPException(status_code=413, detail=result["error"])
+
+        # Duplicate checks (image pHash + content embedding indexes)
+        await run_duplicate_checks(doc_id, result, flag=run_fraud_check)
 
         # Store verification
         verification = {
@@ -306,7 +631,9 @@ async def verify_document(
             "verified_at": datetime.utcnow().isoformat(),
             **result
         }
-        await storage.save_verification(verification)
+        saved_id = await storage.save_verification(verification)
+        if result.get("status") == "success" and (result.get("validation") or {}).get("is_valid"):
+            await storage.remember_reusable_verification(reuse_key, doc_id, saved_id)
 
         # Update document status
         status = "verified" if result.get("status") == "success" else "failed"
@@ -334,50 +661,72 @@ async def get_verification(verification_id: str):
 @app.post("/api/v1/ocr/extract")
 async def ocr_extract(
     file: UploadFile = File(...),
-    language_hint: str = Query("en", description="Language hint: en, hi, ta, te"),
-    preprocess: bool = Query(True, description="Apply image preprocessing")
+    language_hint: Optional[str] = Query(None, description="Language hint: en, hi, ta, te (default: auto-detect)"),
+    preprocess: bool = Query(True, description="Apply image preprocessing"),
+    angle_cls: Optional[bool] = Query(None, description="Force text-line angle classification on/off (default: auto)"),
+    psm: Optional[int] = Query(None, ge=0, le=13, description="Tesseract page segmentation mode"),
+    whitelist: Optional[str] = Query(None, description="Tesseract character whitelist"),
+    include_layout: bool = Query(False, description="Include token boxes, confidences and line indices"),
+    force_ocr: bool = Query(False, description="OCR every page even if the PDF has a usable text layer"),
+    pdf_password: Optional[str] = Query(None, description="Password for encrypted PDFs")
 ):
     """
     Standalone OCR extraction.
 
     Extract text from document without full verification pipeline.
     """
-    global processor
-    if not processor:
-        raise HTTPException(status_code=503, detail="Processor not initialized")
+    _require_processor()
 
     try:
         # Save temp file
         temp_id = str(uuid.uuid4())
-        os.makedirs("uploads", exist_ok=True)
-        temp_path = f"uploads/temp_{temp_id}_{file.filename}"
-
-        with open(temp_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-
-        # Preprocess if requested
-        if preprocess:
-            processed_image = processor.preprocessor.process_path(temp_path)
-        else:
-            import cv2
-            processed_image = cv2.imread(temp_path)
-
-        # Run OCR
-        text = processor.ocr.extract(processed_image)
+        temp_path = os.path.join(settings.UPLOAD_DIR, f"temp_{temp_id}_{file.filename}")
+        await save_upload(file, temp_path)
+
+        # Preprocess (if requested) and OCR every page on the OCR worker, off the event loop
+        ocr_pages = functools.partial(
+            processor.ocr_document,
+            temp_path,
+            preprocess=preprocess,
+            use_text_layer=False if force_ocr else None,
+            password=pdf_password,
+            **processor.build_ocr_options(
+                angle_cls=angle_cls, psm=psm, whitelist=whitelist, language_hint=language_hint
+            )
+        )
+        context = contextvars.copy_context()
+        pages = await asyncio.get_running_loop().run_in_executor(
+            processor.ocr_executor, lambda: context.run(lambda: list(ocr_pages()))
+        )
+        page = pages[0] if pages else OCRPage.empty()
 
         # Cleanup
         if os.path.exists(temp_path):
             os.remove(temp_path)
 
-        return {
+        text = "\n\n".join(p.text for p in pages if p.text)
+        response = {
             "status": "success",
             "text": text,
-            "language_hint": language_hint,
+            "language_hint": language_hint or "auto",
+            "detected_language": page.language,
             "preprocessed": preprocess,
             "word_count": len(text.split()),
-            "char_count": len(text)
+            "char_count": len(text),
+            "confidence": page.mean_confidence,
+            "ocr_engine_used": "+".join(sorted({p.engine for p in pages})),
+            "page_count": len(pages)
         }
+        if include_layout:
+            response["layout"] = [p.to_dict() for p in pages]
+        return response
 
+    except HTTPException:
+        raise
+    except PageLimitError as e:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise HTTPException(status_code=413, detail=str(e))
     except Exception as e:
         logger.error("OCR extraction failed", error=str(e))
         raise HTTPException(status_code=500, detail=str(e))
@@ -391,9 +740,7 @@ async def classify_document(request: ClassifyRequest):
 
     Classify document type from OCR text without full verification.
     """
-    global processor
-    if not processor:
-        raise HTTPException(status_code=503, detail="Processor not initialized")
+    _require_processor()
 
     try:
         result = await processor.classifier.classify(request.ocr_text)
@@ -0,0 +1,125 @@
+"""
+DocVerify AI - Pre-fork API Server
+
+Imports the application and its libraries once in the parent process,
+then forks API workers that share those pages copy-on-write. Each worker
+loads and warms up its own OCR models after the fork: PaddlePaddle,
+OpenMP/MKL and our executors start native thread pools on first use, and
+a forked child inherits their locks but not their threads, so inference
+in a child of a process that already ran a model can deadlock. Models
+are therefore never loaded before forking.
+
+With several workers the native libraries default to one thread each
+(OMP_NUM_THREADS, MKL_NUM_THREADS, OPENBLAS_NUM_THREADS, unless set), so
+N workers don't oversubscribe the CPUs.
+
+Workers share state only through storage: enable USE_DATABASE so every
+worker sees the same documents and verifications. The local embedding and
+face indexes are sharded per worker (DOCVERIFY_WORKER_ID) and merged
+across workers, so a duplicate indexed by one worker is found by the
+others once its shard is next saved (EMBEDDING_INDEX_SAVE_EVERY).
+
+Run: python -m src.api.serve --workers 4 --port 8000
+"""
+
+import argparse
+import gc
+import importlib
+import os
+import signal
+import socket
+import sys
+
+import uvicorn
+
+from src.core.config import get_settings
+from src.core.logger import logger
+
+settings = get_settings()
+
+# Native thread pools capped per worker when forking several
+FORK_THREAD_LIMITS = ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS")
+
+
+def _bind_socket(host: str, port: int) -> socket.socket:
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+def _run_worker(app, sock: socket.socket, host: str, port: int):
+    config = uvicorn.Config(app, host=host, port=port, log_config=None)
+    server = uvicorn.Server(config)
+    server.run(sockets=[sock])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="DocVerify AI pre-fork API server")
+    parser.add_argument("--host", default=settings.API_HOST)
+    parser.add_argument("--port", type=int, default=int(os.environ.get("PORT", settings.API_PORT)))
+    parser.add_argument("--workers", type=int, default=settings.API_WORKERS)
+    args = parser.parse_args()
+
+    if args.workers <= 1:
+        from src.api import main as api_main
+
+        # No fork: load and warm up the models before accepting requests
+        if api_main.preload_processor() is None:
+            logger.error("Processor failed to load, health will report degraded")
+        _run_worker(api_main.app, _bind_socket(args.host, args.port), args.host, args.port)
+        return
+
+    # 1. Must happen before numpy/OpenCV/Paddle are imported
+    for variable in FORK_THREAD_LIMITS:
+        os.environ.setdefault(variable, "1")
+
+    # 2. Import (but don't load models) once in the parent
+    from src.api import main as api_main
+    importlib.import_module("src.orchestration.processor")
+
+    sock = _bind_socket(args.host, args.port)
+
+    # 3. Move everything allocated so far out of GC tracking so the collector
+    #    doesn't touch (and copy) the shared pages in each child
+    gc.freeze()
+
+    children = []
+    for index in range(args.workers):
+        pid = os.fork()
+        if pid == 0:
+            # Names this worker's shard of the local vector indexes
+            os.environ["DOCVERIFY_WORKER_ID"] = str(index)
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            try:
+                # The app lifespan loads and warms this worker's models in the background
+                _run_worker(api_main.app, sock, args.host, args.port)
+            finally:
+                os._exit(0)
+        children.append(pid)
+        logger.info("Pre-fork: worker started", worker=index, pid=pid)
+
+    def _terminate(signum, frame):
+        for pid in children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGINT, _terminate)
+    signal.signal(signal.SIGTERM, _terminate)
+
+    for pid in children:
+        try:
+            os.waitpid(pid, 0)
+        except ChildProcessError:
+            pass
+    sock.close()
+    logger.info("Pre-fork: all workers exited")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
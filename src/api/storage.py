@@ -2,16 +2,23 @@
 Storage abstraction - uses Supabase if configured, else in-memory.
 """
 
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime
 from src.core.config import get_settings
 from src.core.logger import logger
+from src.core.metrics import record_fallback, timed
 
 settings = get_settings()
 
 # In-memory fallback
 _docs_memory: Dict[str, Dict] = {}
 _verifications_memory: Dict[str, Dict] = {}
+# Lookup indexes over the in-memory store
+_hash_index: Dict[str, str] = {}  # file_hash -> document_id
+_latest_verification_index: Dict[str, str] = {}  # document_id -> verification_id
+# Reusable verifications, in both backends: reuse key -> (document_id, verification_id).
+# Per process, so with several workers a resubmission may miss and re-run.
+_reuse_index: Dict[str, Tuple[str, str]] = {}
 
 # Database repos (lazy loaded)
 _doc_repo = None
@@ -34,6 +41,7 @@ def _get_repos():
 
 # --- Document Storage ---
 
+@timed("storage")
 async def save_document(doc: Dict) -> str:
     """Save document, returns doc_id."""
     doc_id = doc.get("document_id")
@@ -54,12 +62,16 @@ async def save_document(doc: Dict) -> str:
             return db_doc.id
         except Exception as e:
             logger.warning("DB save failed, using memory", error=str(e))
+            record_fallback("storage", "memory")
 
     # Fallback to memory
     _docs_memory[doc_id] = doc
+    if doc.get("file_hash"):
+        _hash_index.setdefault(doc["file_hash"], doc_id)
     return doc_id
 
 
+@timed("storage")
 async def get_document(doc_id: str) -> Optional[Dict]:
     """Get document by ID."""
     doc_repo, _, _ = _get_repos()
@@ -71,10 +83,31 @@ async def get_document(doc_id: str) -> Optional[Dict]:
                 return doc.model_dump()
         except Exception as e:
             logger.warning("DB get failed", error=str(e))
+            record_fallback("storage", "memory")
 
     return _docs_memory.get(doc_id)
 
 
+@timed("storage")
+async def find_document_by_hash(file_hash: str) -> Optional[Dict]:
+    """Get an existing document with identical content, if any."""
+    doc_repo, _, _ = _get_repos()
+
+    if doc_repo:
+        try:
+            doc = await doc_repo.get_by_hash(file_hash)
+            if doc:
+                return {**doc.model_dump(), "document_id": doc.id}
+            return None
+        except Exception as e:
+            logger.warning("DB hash lookup failed", error=str(e))
+            record_fallback("storage", "memory")
+
+    doc_id = _hash_index.get(file_hash)
+    return _docs_memory.get(doc_id) if doc_id else None
+
+
+@timed("storage")
 async def list_documents(limit: int = 10, offset: int = 0) -> List[Dict]:
     """List documents."""
     doc_repo, _, _ = _get_repos()
@@ -85,14 +118,30 @@ async def list_documents(limit: int = 10, offset: int = 0) -> List[Dict]:
             return [d.model_dump() for d in docs]
         except Exception as e:
             logger.warning("DB list failed", error=str(e))
+            record_fallback("storage", "memory")
 
     docs = list(_docs_memory.values())
     return docs[offset:offset + limit]
 
 
+def _forget_reusable(doc_id: str) -> None:
+    for key, (owner, _) in list(_reuse_index.items()):
+        if owner == doc_id:
+            del _reuse_index[key]
+
+
+@timed("storage")
 async def delete_document(doc_id: str) -> bool:
     """Delete document."""
     doc_repo, _, _ = _get_repos()
+    _forget_reusable(doc_id)
+    if _duplicate_index_loaded:
+        (await _get_duplicate_index()).remove(doc_id)
+    from src.fraud import get_face_index, get_vector_index
+    get_vector_index().remove(doc_id)
+    get_face_index().remove(doc_id)
+    if _identity_index_loaded:
+        (await _get_identity_index()).remove(doc_id)
 
     if doc_repo:
         try:
@@ -100,13 +149,18 @@ async def delete_document(doc_id: str) -> bool:
             return True
         except Exception as e:
             logger.warning("DB delete failed", error=str(e))
+            record_fallback("storage", "memory")
 
     if doc_id in _docs_memory:
-        del _docs_memory[doc_id]
+        doc = _docs_memory.pop(doc_id)
+        if _hash_index.get(doc.get("file_hash")) == doc_id:
+            del _hash_index[doc["file_hash"]]
+        _latest_verification_index.pop(doc_id, None)
         return True
     return False
 
 
+@timed("storage")
 async def update_document(doc_id: str, updates: Dict) -> None:
     """Update document fields."""
     doc_repo, _, _ = _get_repos()
@@ -117,13 +171,172 @@ async def update_document(doc_id: str, updates: Dict) -> None:
             return
         except Exception as e:
             logger.warning("DB update failed", error=str(e))
+            record_fallback("storage", "memory")
 
     if doc_id in _docs_memory:
         _docs_memory[doc_id].update(updates)
 
 
+# --- Near-Duplicate Index ---
+
+_duplicate_index_loaded = False
+
+
+async def _get_duplicate_index():
+    """Process-wide pHash index, rebuilt from the database on first use."""
+    global _duplicate_index_loaded
+    from src.fraud import PerceptualHash, get_duplicate_index
+
+    index = get_duplicate_index()
+    if not _duplicate_index_loaded:
+        _duplicate_index_loaded = True
+        doc_repo, _, _ = _get_repos()
+        if doc_repo:
+            pairs = await doc_repo.list_perceptual_hashes()
+            index.bulk_load((doc_id, PerceptualHash.from_dict(h)) for doc_id, h in pairs)
+    return index
+
+
+@timed("storage")
+async def save_perceptual_hash(doc_id: str, hashes) -> None:
+    """Store a document's perceptual hashes and add them to the index."""
+    index = await _get_duplicate_index()
+    index.add(doc_id, hashes)
+
+    doc_repo, _, _ = _get_repos()
+    if doc_repo:
+        try:
+            await doc_repo.update_perceptual_hash(doc_id, hashes.to_dict())
+            return
+        except Exception as e:
+            logger.warning("DB perceptual hash update failed", error=str(e))
+            record_fallback("storage", "memory")
+
+    if doc_id in _docs_memory:
+        _docs_memory[doc_id]["perceptual_hash"] = hashes.to_dict()
+
+
+@timed("storage")
+async def find_near_duplicate(hashes, exclude_id: Optional[str] = None):
+    """Closest stored document whose image is a near-duplicate, if any."""
+    index = await _get_duplicate_index()
+    return index.best_match(hashes, exclude=exclude_id)
+
+
+# --- Content Embedding Index ---
+
+@timed("storage")
+async def save_embedding(doc_id: str, vector) -> None:
+    """Add a document's content embedding to the local vector index (and DB column)."""
+    from src.fraud import get_vector_index
+
+    get_vector_index().add(doc_id, vector)
+
+    doc_repo, _, _ = _get_repos()
+    if doc_repo:
+        try:
+            await doc_repo.update(doc_id, {"embedding": vector.tolist()})
+        except Exception as e:
+            logger.warning("DB embedding update failed", error=str(e))
+            record_fallback("storage", "memory")
+
+
+@timed("storage")
+async def find_similar_documents(vector, exclude_id: Optional[str] = None, k: int = 5) -> List[Tuple[str, float]]:
+    """Most similar stored documents as (document_id, cosine similarity)."""
+    from src.fraud import get_vector_index
+
+    return get_vector_index().search(vector, k=k, exclude=exclude_id)
+
+
+# --- Identity Index ---
+
+_identity_index_loaded = False
+
+
+async def _get_identity_index():
+    """Process-wide identifier index, rebuilt from stored verifications on first use."""
+    global _identity_index_loaded
+    from src.fraud import get_identity_index
+
+    index = get_identity_index()
+    if not _identity_index_loaded:
+        _identity_index_loaded = True
+        _, ver_repo, _ = _get_repos()
+        if ver_repo:
+            index.bulk_load(await ver_repo.list_extracted_fields())
+        else:
+            index.bulk_load(
+                (ver["document_id"], ver.get("extracted_fields") or {})
+                for ver in _verifications_memory.values()
+                if ver.get("document_id")
+            )
+    return index
+
+
+@timed("storage")
+async def find_identity_reuse(doc_id: str, fields: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Identifiers on this document already seen on other documents."""
+    index = await _get_identity_index()
+    return index.find_reuse(doc_id, fields)
+
+
+@timed("storage")
+async def index_identity(doc_id: str, fields: Dict[str, Any]) -> None:
+    """Record a document's identifiers (replaces its previous entry)."""
+    index = await _get_identity_index()
+    index.add(doc_id, fields)
+
+
+# --- Face Index ---
+
+@timed("storage")
+async def has_face_descriptor(doc_id: str) -> bool:
+    """Whether the document's portrait descriptor is already indexed (cached)."""
+    from src.fraud import get_face_index
+
+    return doc_id in get_face_index()
+
+
+@timed("storage")
+async def get_face_descriptor(doc_id: str):
+    """Cached portrait descriptor of a document, or None."""
+    from src.fraud import get_face_index
+
+    return get_face_index().get(doc_id)
+
+
+@timed("storage")
+async def save_face_descriptor(doc_id: str, vector) -> None:
+    """Add a document's portrait descriptor to the local face index."""
+    from src.fraud import get_face_index
+
+    get_face_index().add(doc_id, vector)
+
+
+@timed("storage")
+async def find_similar_faces(vector, exclude_id: Optional[str] = None, k: int = 5) -> List[Tuple[str, float]]:
+    """Stored documents whose portrait matches, as (document_id, similarity) above the match threshold."""
+    from src.fraud import face_match_threshold, get_face_index
+
+    threshold = face_match_threshold()
+    return [
+        (other_id, score)
+        for other_id, score in get_face_index().search(vector, k=k, exclude=exclude_id)
+        if score >= threshold
+    ]
+
+
+@timed("storage")
+async def find_identity_conflicts(fields: Dict[str, Any], other_id: str) -> List[Dict[str, str]]:
+    """Identifier fields where another document carries a different number."""
+    index = await _get_identity_index()
+    return index.conflicting_identifiers(fields, other_id)
+
+
 # --- Verification Storage ---
 
+@timed("storage")
 async def save_verification(ver: Dict) -> str:
     """Save verification, returns ver_id."""
     ver_id = ver.get("verification_id")
@@ -136,26 +349,45 @@ async def save_verification(ver: Dict) -> str:
                 document_id=ver["document_id"]
             ))
             # Update with full results
-            await ver_repo.update(db_ver.id, {
-                "extracted_fields": ver.get("extracted_fields"),
-                "validation_results": ver.get("validation"),
-                "overall_confidence": ver.get("confidence"),
-                "status": "verified" if ver.get("validation", {}).get("is_valid") else "rejected"
-            })
+            await ver_repo.update_results(
+                db_ver.id,
+                extracted_fields=ver.get("extracted_fields"),
+                validation_results=ver.get("validation") or {},
+                overall_confidence=ver.get("confidence"),
+                processing_time_ms=ver.get("processing_time_ms", 0),
+                ocr_engine=ver.get("ocr_engine_used", "unknown")
+            )
+            if "fraud_flags" in ver:
+                await ver_repo.update_fraud_check(
+                    db_ver.id,
+                    fraud_flags=ver["fraud_flags"],
+                    tamper_score=ver.get("tamper_score", 0.0),
+                    duplicate_match_id=ver.get("duplicate_match_id")
+                )
+            if "stamps_detected" in ver or "signatures_detected" in ver:
+                await ver_repo.update_detections(
+                    db_ver.id,
+                    stamps_detected=ver.get("stamps_detected") or [],
+                    signatures_detected=ver.get("signatures_detected") or []
+                )
             if audit_repo:
                 await audit_repo.log_verification_completed(
                     ver["document_id"], db_ver.id,
                     ver.get("status", "unknown"),
-                    ver.get("confidence", 0), 0
+                    ver.get("confidence", 0), ver.get("processing_time_ms", 0)
                 )
             return db_ver.id
         except Exception as e:
             logger.warning("DB save verification failed", error=str(e))
+            record_fallback("storage", "memory")
 
     _verifications_memory[ver_id] = ver
+    if ver.get("document_id"):
+        _latest_verification_index[ver["document_id"]] = ver_id
     return ver_id
 
 
+@timed("storage")
 async def get_verification(ver_id: str) -> Optional[Dict]:
     """Get verification by ID."""
     _, ver_repo, _ = _get_repos()
@@ -167,10 +399,49 @@ async def get_verification(ver_id: str) -> Optional[Dict]:
                 return ver.model_dump()
         except Exception as e:
             logger.warning("DB get verification failed", error=str(e))
+            record_fallback("storage", "memory")
 
     return _verifications_memory.get(ver_id)
 
 
+@timed("storage")
+async def get_latest_verification(doc_id: str) -> Optional[Dict]:
+    """Get the most recent verification of a document."""
+    _, ver_repo, _ = _get_repos()
+
+    if ver_repo:
+        try:
+            ver = await ver_repo.get_latest_by_document_id(doc_id)
+            if ver:
+                return ver.model_dump()
+            return None
+        except Exception as e:
+            logger.warning("DB get latest verification failed", error=str(e))
+            record_fallback("storage", "memory")
+
+    ver_id = _latest_verification_index.get(doc_id)
+    return _verifications_memory.get(ver_id) if ver_id else None
+
+
+@timed("storage")
+async def remember_reusable_verification(reuse_key: str, doc_id: str, ver_id: str) -> None:
+    """Register a verification as the result to return for later requests with the same reuse key."""
+    _reuse_index[reuse_key] = (doc_id, ver_id)
+
+
+@timed("storage")
+async def get_reusable_verification(reuse_key: str) -> Optional[Dict]:
+    """The verification registered for a reuse key, if it is still stored."""
+    entry = _reuse_index.get(reuse_key)
+    if not entry:
+        return None
+    ver = await get_verification(entry[1])
+    if ver is None:
+        _reuse_index.pop(reuse_key, None)
+    return ver
+
+
+@timed("storage")
 async def get_stats() -> Dict[str, Any]:
     """Get verification stats."""
     _, ver_repo, _ = _get_repos()
@@ -180,6 +451,7 @@ async def get_stats() -> Dict[str, Any]:
             return await ver_repo.get_stats()
         except Exception as e:
             logger.warning("DB stats failed", error=str(e))
+            record_fallback("storage", "memory")
 
     # In-memory stats
     total = len(_verifications_memory)
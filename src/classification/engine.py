@@ -4,6 +4,9 @@ from structlog import get_logger
 
 from src.classification.rules import DOCUMENT_TEMPLATES
 from src.core.config import get_settings
+from src.core.metrics import record_fallback, timed
+from src.core.tracing import span
+from src.core.model_registry import acquire_gemini_chat, gemini_chat_key, get_model_registry
 
 # Optional LLM imports (graceful degradation if keys missing)
 try:
@@ -27,15 +30,18 @@ class DocumentClassifier:
         
         if HAS_LLM and settings.GOOGLE_API_KEY:
             try:
-                self.llm = ChatGoogleGenerativeAI(
-                    model=settings.GEMINI_MODEL,
-                    google_api_key=settings.GOOGLE_API_KEY,
-                    temperature=0.0
-                )
+                # One Gemini client per process, shared with the other engines and agents
+                self.llm = acquire_gemini_chat()
                 logger.info("Gemini Classifier initialized")
             except Exception as e:
                 logger.warning("Failed to init Gemini for classification", error=str(e))
 
+    def close(self):
+        """Release the shared LLM client."""
+        if self.llm is not None:
+            self.llm = None
+            get_model_registry().release(gemini_chat_key())
+
     async def classify(self, text: str) -> Dict[str, Any]:
         """
         Main entry point. Tries rules first, then LLM.
@@ -49,10 +55,12 @@ class DocumentClassifier:
         # 2. LLM Based (Fallback)
         if self.llm:
             logger.info("Rule-based confidence low, trying LLM...")
+            record_fallback("classification", "llm")
             return await self.classify_by_llm(text)
             
         return rule_result
 
+    @timed("classification", "rules")
     def classify_by_rules(self, text: str) -> Dict[str, Any]:
         text_lower = text.lower()
         best_match = None
@@ -82,6 +90,7 @@ class DocumentClassifier:
             
         return {"type": "unknown", "confidence": 0.0, "method": "rule_based"}
 
+    @timed("classification", "llm")
     async def classify_by_llm(self, text: str) -> Dict[str, Any]:
         try:
             prompt = f"""
@@ -95,10 +104,11 @@ class DocumentClassifier:
             {text[:2000]}
             """
             
-            response = await self.llm.ainvoke([
-                SystemMessage(content="You are a document classifier bot."),
-                HumanMessage(content=prompt)
-            ])
+            with span("llm.gemini.invoke", model=settings.GEMINI_MODEL, purpose="classification"):
+                response = await self.llm.ainvoke([
+                    SystemMessage(content="You are a document classifier bot."),
+                    HumanMessage(content=prompt)
+                ])
             
             doc_type = response.content.strip().lower()
             
@@ -16,6 +16,25 @@ class Settings(BaseSettings):
     # API
     API_HOST: str = "0.0.0.0"
     API_PORT: int = 8000
+    API_WORKERS: int = 1  # pre-fork workers for `python -m src.api.serve` (models load per worker)
+    WARMUP_ON_STARTUP: bool = True  # run a synthetic inference before reporting ready
+    WARMUP_SAMPLE: Optional[str] = None  # default: first image in synthetic_data/samples
+
+    # Agent pools
+    AGENT_POOL_MIN_SIZE: int = 1
+    AGENT_POOL_MAX_SIZE: int = 0  # 0 = CPU count
+    AGENT_IDLE_TIMEOUT_S: float = 300.0  # idle agents above the minimum are reaped after this
+    AGENT_REAP_INTERVAL_S: float = 60.0
+    OCR_AGENT_POOL_SIZE: int = 2  # API OCR agents, each with its own model (tesseract shares one); 0 = one OCR thread
+
+    # Metrics
+    METRICS_ENABLED: bool = True  # per-stage latency + cache/fallback counters at /metrics
+
+    # Tracing (OpenTelemetry)
+    TRACING_EXPORTER: str = "none"  # none | otlp | file | console
+    TRACING_OTLP_ENDPOINT: str = "http://localhost:4318/v1/traces"  # OTLP/HTTP collector
+    TRACING_FILE_PATH: str = "traces.jsonl"  # one JSON span per line (file exporter)
+    TRACING_SAMPLE_RATIO: float = 1.0  # fraction of new traces recorded
     
     # Supabase
     SUPABASE_URL: Optional[str] = None
@@ -39,6 +58,54 @@ class Settings(BaseSettings):
     # OCR
     DEFAULT_OCR_ENGINE: str = "paddleocr"
     OCR_LANGUAGES: str = "en,hi,ta,te"  # comma based
+    OCR_LANGUAGE_ROUTING: bool = True  # route pages to per-language models by detected script
+    OCR_MAX_LANGUAGE_MODELS: int = 2  # non-English models kept loaded (LRU)
+    OCR_ANGLE_CLS: str = "auto"  # auto | always | never (PaddleOCR per-line angle classifier)
+    EASYOCR_DEVICE: str = "auto"  # auto | cpu | cuda
+    EASYOCR_QUANTIZE: bool = True  # dynamic int8 quantization of the recognizer on CPU
+    TORCH_NUM_THREADS: int = 0  # 0 = CPU cores / API_WORKERS
+    TESSERACT_BACKEND: str = "auto"  # auto | tesserocr | subprocess
+    TESSERACT_PSM: int = 3  # default page segmentation mode
+
+    # Stamp / signature detection
+    DETECTION_MAX_SIDE: int = 1000  # pages are downscaled to this before detection
+
+    # Fraud checks
+    FRAUD_CHECK_WORKERS: int = 2  # threads running image checks beside OCR
+    FRAUD_TIME_BUDGET_MS: int = 1500  # from the first page reaching image checks; unfinished checks are dropped
+    PHASH_MAX_DISTANCE: int = 8  # pHash Hamming distance (of 64 bits) counted as a near-duplicate
+    DHASH_MAX_DISTANCE: int = 10  # dHash confirmation threshold
+    TAMPER_MAX_SIDE: int = 1280  # largest window re-saved at once; larger pages are covered window by window
+    TAMPER_TIME_BUDGET_MS: int = 500  # per page; windows past the budget are skipped
+    TAMPER_THRESHOLD: float = 0.5  # tamper_score flagged as suspicious
+    COPY_MOVE_MAX_SIDE: int = 1600  # page downscaled to this before ORB
+    COPY_MOVE_MAX_KEYPOINTS: int = 4000
+    COPY_MOVE_MIN_MATCHES: int = 10  # matches sharing a displacement to report a cloned region
+    COPY_MOVE_TIME_BUDGET_MS: int = 250  # per page
+    FACE_MAX_SIDE: int = 800  # page downscaled to this for face detection
+    FACE_DETECTOR_MODEL: Optional[str] = None  # YuNet ONNX path; None = bundled Haar cascade
+    FACE_RECOGNIZER_MODEL: Optional[str] = None  # SFace ONNX path (needs the YuNet detector); None = DCT
+    FACE_INDEX_DIR: Optional[str] = "data/face_index"  # None = memory only; one shard per worker
+    FACE_MATCH_THRESHOLD: Optional[float] = None  # None = descriptor default (dct 0.9, sface 0.363)
+    EMBEDDING_BACKEND: str = "hashing"  # hashing | ollama
+    EMBEDDING_DIM: int = 768  # hashing embedder size (matches documents.embedding)
+    EMBEDDING_INDEX_BACKEND: str = "auto"  # auto | hnswlib | numpy
+    EMBEDDING_INDEX_DIR: Optional[str] = "data/embedding_index"  # None = memory only; one shard per worker
+    EMBEDDING_INDEX_SAVE_EVERY: int = 100  # inserts between snapshots
+    EMBEDDING_DUPLICATE_THRESHOLD: float = 0.92  # cosine similarity flagged as duplicate content
+
+    # Uploads
+    MAX_FILE_SIZE_MB: int = 20
+    UPLOAD_CHUNK_SIZE: int = 1024 * 1024  # bytes read/hashed/written per chunk
+    UPLOAD_DIR: str = "uploads"
+
+    # Document ingestion (PDF / multi-page TIFF)
+    PDF_RENDER_DPI: int = 200
+    PDF_MAX_RENDERED_PAGES: int = 2  # rendered pages held in memory at once
+    PDF_MAX_PAGES: int = 20  # longer PDFs are rejected (413), not verified in part
+    PDF_MIN_TEXT_CHARS: int = 20  # embedded text needed to skip rendering a page
+    PDF_NATIVE_TEXT: bool = True  # use a usable embedded text layer instead of OCR
+    TIFF_MAX_PAGES: int = 50  # scanner batches can hold several documents; longer files are rejected
     
     model_config = SettingsConfigDict(
         env_file=".env",
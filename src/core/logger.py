@@ -2,6 +2,7 @@ import structlog
 import logging
 import sys
 from src.core.config import get_settings
+from src.core.tracing import add_trace_context
 
 settings = get_settings()
 
@@ -11,6 +12,7 @@ def configure_logger():
     """
     shared_processors = [
         structlog.contextvars.merge_contextvars,
+        add_trace_context,
         structlog.stdlib.add_logger_name,
         structlog.stdlib.add_log_level,
         structlog.stdlib.PositionalArgumentsFormatter(),
@@ -0,0 +1,201 @@
+"""
+DocVerify AI - Metrics
+
+Per-stage latency histograms and cache/fallback counters, exposed in the
+Prometheus text format at /metrics.
+
+- docverify_stage_duration_seconds{stage, method}: one histogram for every
+  timed step, e.g. (preprocessing, deskew), (ocr, paddleocr),
+  (classification, llm), (storage, save_verification).
+- docverify_cache_requests_total{cache, result}: hit / miss per cache.
+- docverify_fallbacks_total{component, fallback}: a degraded path taken
+  (rules -> LLM, PaddleOCR -> Tesseract, database -> memory, ...).
+
+prometheus_client is optional. Without it the same series are kept as
+in-process counts and sums and rendered as summaries. With pre-fork
+workers, set PROMETHEUS_MULTIPROC_DIR to aggregate across processes.
+"""
+
+import functools
+import inspect
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+from structlog import get_logger
+
+from src.core.config import get_settings
+from src.core.tracing import span
+
+try:
+    from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Histogram, generate_latest
+    HAS_PROMETHEUS = True
+except ImportError:
+    HAS_PROMETHEUS = False
+    CONTENT_TYPE_LATEST = "text/plain; version=0.0.4; charset=utf-8"
+
+logger = get_logger()
+settings = get_settings()
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+if HAS_PROMETHEUS:
+    STAGE_DURATION = Histogram(
+        "docverify_stage_duration_seconds",
+        "Time spent in one pipeline step",
+        ["stage", "method"],
+        buckets=LATENCY_BUCKETS
+    )
+    CACHE_REQUESTS = Counter(
+        "docverify_cache_requests_total",
+        "Cache lookups by outcome",
+        ["cache", "result"]
+    )
+    FALLBACKS = Counter(
+        "docverify_fallbacks_total",
+        "Degraded or secondary paths taken",
+        ["component", "fallback"]
+    )
+
+# In-process aggregates, kept with or without prometheus_client for summaries
+_stages: Dict[Tuple[str, str], Dict[str, float]] = {}
+_counters: Dict[Tuple[str, str, str], int] = {}
+_lock = threading.Lock()
+
+
+def observe_stage(stage: str, method: str, seconds: float):
+    """Record one timed step."""
+    if not settings.METRICS_ENABLED:
+        return
+    if HAS_PROMETHEUS:
+        STAGE_DURATION.labels(stage=stage, method=method).observe(seconds)
+    with _lock:
+        stats = _stages.setdefault((stage, method), {"count": 0, "sum": 0.0, "max": 0.0})
+        stats["count"] += 1
+        stats["sum"] += seconds
+        stats["max"] = max(stats["max"], seconds)
+
+
+@contextmanager
+def track_stage(stage: str, method: str) -> Iterator[None]:
+    """Time the enclosed block (recorded even when it raises) in a "<stage>.<method>" span."""
+    start = time.perf_counter()
+    try:
+        with span(f"{stage}.{method}"):
+            yield
+    finally:
+        observe_stage(stage, method, time.perf_counter() - start)
+
+
+def timed(stage: str, method: Optional[str] = None) -> Callable:
+    """Decorator timing a sync or async function; method defaults to its name."""
+
+    def decorator(func: Callable) -> Callable:
+        label = method or func.__name__
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with track_stage(stage, label):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with track_stage(stage, label):
+                return func(*args, **kwargs)
+        return wrapper
+
+    return decorator
+
+
+def _count(metric: str, first: str, second: str):
+    with _lock:
+        key = (metric, first, second)
+        _counters[key] = _counters.get(key, 0) + 1
+
+
+def record_cache(cache: str, hit: bool):
+    """Record a cache lookup."""
+    if not settings.METRICS_ENABLED:
+        return
+    result = "hit" if hit else "miss"
+    if HAS_PROMETHEUS:
+        CACHE_REQUESTS.labels(cache=cache, result=result).inc()
+    _count("cache", cache, result)
+
+
+def record_fallback(component: str, fallback: str):
+    """Record a fallback, e.g. record_fallback("classification", "llm")."""
+    if not settings.METRICS_ENABLED:
+        return
+    if HAS_PROMETHEUS:
+        FALLBACKS.labels(component=component, fallback=fallback).inc()
+    _count("fallback", component, fallback)
+
+
+def _render_plain() -> bytes:
+    """Prometheus text format from the in-process aggregates (no histograms)."""
+    lines = [
+        "# HELP docverify_stage_duration_seconds Time spent in one pipeline step",
+        "# TYPE docverify_stage_duration_seconds summary",
+    ]
+    with _lock:
+        stages = {key: dict(stats) for key, stats in _stages.items()}
+        counters = dict(_counters)
+    for (stage, method), stats in sorted(stages.items()):
+        labels = f'stage="{stage}",method="{method}"'
+        lines.append(f"docverify_stage_duration_seconds_count{{{labels}}} {stats['count']}")
+        lines.append(f"docverify_stage_duration_seconds_sum{{{labels}}} {stats['sum']:.6f}")
+    lines += [
+        "# HELP docverify_cache_requests_total Cache lookups by outcome",
+        "# TYPE docverify_cache_requests_total counter",
+    ]
+    lines += [
+        f'docverify_cache_requests_total{{cache="{cache}",result="{result}"}} {value}'
+        for (metric, cache, result), value in sorted(counters.items()) if metric == "cache"
+    ]
+    lines += [
+        "# HELP docverify_fallbacks_total Degraded or secondary paths taken",
+        "# TYPE docverify_fallbacks_total counter",
+    ]
+    lines += [
+        f'docverify_fallbacks_total{{component="{component}",fallback="{fallback}"}} {value}'
+        for (metric, component, fallback), value in sorted(counters.items()) if metric == "fallback"
+    ]
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    """Body and content type for the /metrics endpoint."""
+    if not HAS_PROMETHEUS:
+        return _render_plain(), CONTENT_TYPE_LATEST
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
+
+
+def metrics_summary() -> Dict[str, Any]:
+    """Human-readable snapshot of this process's metrics (status pages)."""
+    with _lock:
+        stages = {
+            f"{stage}.{method}": {
+                "count": int(stats["count"]),
+                "avg_ms": round(stats["sum"] / stats["count"] * 1000, 1),
+                "max_ms": round(stats["max"] * 1000, 1)
+            }
+            for (stage, method), stats in sorted(_stages.items())
+        }
+        caches: Dict[str, Dict[str, int]] = {}
+        fallbacks: Dict[str, int] = {}
+        for (metric, first, second), value in _counters.items():
+            if metric == "cache":
+                caches.setdefault(first, {"hit": 0, "miss": 0})[second] = value
+            else:
+                fallbacks[f"{first}->{second}"] = value
+    return {"stages": stages, "caches": caches, "fallbacks": fallbacks}
@@ -0,0 +1,186 @@
+"""
+DocVerify AI - Shared Model Registry
+
+Process-wide cache of heavy objects (OCR engines, LLM clients, engines
+wrapping them) keyed by their configuration, e.g.
+("ocr", "paddleocr", "hi"). The first acquire() loads the model; later
+ones share it and bump a reference count. When the last holder releases
+it the model is closed and dropped, so ten pooled agents cost one model
+load and memory stays flat as pools grow and shrink.
+
+Models that are not thread-safe are handed out behind a proxy that
+serializes method calls.
+"""
+
+import functools
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from structlog import get_logger
+
+from src.core.config import get_settings
+from src.core.metrics import record_cache
+from src.core.tracing import span
+
+logger = get_logger()
+settings = get_settings()
+
+
+class SerializedModel:
+    """Proxy serializing calls into a model that isn't thread-safe."""
+
+    def __init__(self, model: Any):
+        self._model = model
+        self._lock = threading.RLock()
+
+    @property
+    def wrapped(self) -> Any:
+        return self._model
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._model, name)
+        if not callable(attr):
+            return attr
+
+        @functools.wraps(attr)
+        def locked(*args, **kwargs):
+            with self._lock:
+                return attr(*args, **kwargs)
+
+        return locked
+
+
+@dataclass
+class _Entry:
+    model: Any
+    handle: Any
+    refcount: int
+    load_ms: float
+
+
+class ModelRegistry:
+    """Reference-counted, lazily loaded models keyed by configuration."""
+
+    def __init__(self):
+        self._entries: Dict[Hashable, _Entry] = {}
+        self._loading: Dict[Hashable, threading.Lock] = {}
+        self._lock = threading.Lock()
+        # Last load error per key, cleared by a successful load
+        self._failures: Dict[str, str] = {}
+
+    def _reuse(self, key: Hashable) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        entry.refcount += 1
+        return entry.handle
+
+    def _done_loading(self, key: Hashable, load_lock: threading.Lock):
+        if self._loading.get(key) is load_lock:
+            del self._loading[key]
+
+    def acquire(self, key: Hashable, factory: Callable[[], Any], thread_safe: bool = True) -> Any:
+        """
+        Get the model for `key`, loading it with `factory` on first use.
+        Every acquire() must be paired with a release() of the same key.
+        """
+        with self._lock:
+            handle = self._reuse(key)
+            record_cache("model", handle is not None)
+            if handle is not None:
+                return handle
+            load_lock = self._loading.setdefault(key, threading.Lock())
+
+        # One loader per key; concurrent callers wait and then share its result
+        with load_lock:
+            with self._lock:
+                handle = self._reuse(key)
+                if handle is not None:
+                    return handle
+            start = time.perf_counter()
+            try:
+                with span("model.load", key=str(key)):
+                    model = factory()
+            except Exception as e:
+                # Drop the loading lock so the next caller retries the load
+                with self._lock:
+                    self._done_loading(key, load_lock)
+                    self._failures[str(key)] = str(e)
+                logger.error("Model load failed", key=str(key), error=str(e))
+                raise
+            load_ms = round((time.perf_counter() - start) * 1000, 1)
+            handle = model if thread_safe else SerializedModel(model)
+            with self._lock:
+                self._entries[key] = _Entry(model, handle, 1, load_ms)
+                self._done_loading(key, load_lock)
+                self._failures.pop(str(key), None)
+        logger.info("Model loaded", key=str(key), load_ms=load_ms)
+        return handle
+
+    def release(self, key: Hashable):
+        """Drop one reference; the last one closes and unloads the model."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            entry.refcount -= 1
+            if entry.refcount > 0:
+                return
+            del self._entries[key]
+        close = getattr(entry.model, "close", None)
+        if callable(close):
+            try:
+                close()
+            except Exception as e:
+                logger.warning("Model close failed", key=str(key), error=str(e))
+        logger.info("Model unloaded", key=str(key))
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Loaded models with their reference counts and load times."""
+        with self._lock:
+            return {
+                str(key): {"refcount": entry.refcount, "load_ms": entry.load_ms}
+                for key, entry in self._entries.items()
+            }
+
+    def load_failures(self) -> Dict[str, str]:
+        """Keys whose last load attempt raised, with the error."""
+        with self._lock:
+            return dict(self._failures)
+
+
+_registry: Optional[ModelRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_model_registry() -> ModelRegistry:
+    """Process-wide model registry."""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = ModelRegistry()
+    return _registry
+
+
+# --- Shared clients ---
+
+def gemini_chat_key(temperature: float = 0.0) -> Hashable:
+    return ("llm", "gemini", settings.GEMINI_MODEL, temperature)
+
+
+def acquire_gemini_chat(temperature: float = 0.0) -> Any:
+    """Shared Gemini chat client (release with gemini_chat_key(temperature))."""
+
+    def create():
+        from langchain_google_genai import ChatGoogleGenerativeAI
+
+        return ChatGoogleGenerativeAI(
+            model=settings.GEMINI_MODEL,
+            google_api_key=settings.GOOGLE_API_KEY,
+            temperature=temperature
+        )
+
+    return get_model_registry().acquire(gemini_chat_key(temperature), create)
@@ -0,0 +1,195 @@
+"""
+DocVerify AI - Tracing
+
+OpenTelemetry spans for following one request through the API, the
+pipeline stages, agents, model calls and storage. Export with
+TRACING_EXPORTER:
+
+- none (default): spans are not recorded.
+- otlp: OTLP/HTTP to TRACING_OTLP_ENDPOINT (a local collector, Jaeger, Tempo).
+- file: one JSON span per line appended to TRACING_FILE_PATH, exported
+  synchronously so offline tests can read it right after a call.
+- console: the same JSON lines on stdout.
+
+The OpenTelemetry packages are optional; without them every helper here
+is a no-op. The active trace and span ids are added to every structlog
+event (see add_trace_context).
+"""
+
+import functools
+import inspect
+import os
+import sys
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Mapping, Optional
+
+from structlog import get_logger
+
+from src.core.config import get_settings
+
+try:
+    from opentelemetry import propagate, trace
+    from opentelemetry.trace import SpanKind
+    HAS_OTEL = True
+except ImportError:
+    HAS_OTEL = False
+
+logger = get_logger()
+settings = get_settings()
+
+# A proxy until configure_tracing() installs a provider
+_tracer = trace.get_tracer("docverify") if HAS_OTEL else None
+_provider = None
+_configured = False
+_configure_lock = threading.Lock()
+
+
+def configure_tracing() -> bool:
+    """Install the span exporter for TRACING_EXPORTER (idempotent). Returns whether spans are exported."""
+    global _provider, _configured
+    with _configure_lock:
+        if _configured:
+            return _provider is not None
+        _configured = True
+        exporter_name = settings.TRACING_EXPORTER.lower()
+        if exporter_name == "none":
+            return False
+        if not HAS_OTEL:
+            logger.warning("Tracing requested but opentelemetry is not installed", exporter=exporter_name)
+            return False
+
+        try:
+            from opentelemetry.sdk.resources import Resource
+            from opentelemetry.sdk.trace import TracerProvider
+            from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter, SimpleSpanProcessor
+            from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+
+            provider = TracerProvider(
+                resource=Resource.create({
+                    "service.name": settings.APP_NAME,
+                    "deployment.environment": settings.APP_ENV
+                }),
+                sampler=ParentBased(TraceIdRatioBased(settings.TRACING_SAMPLE_RATIO))
+            )
+            if exporter_name == "otlp":
+                from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+                provider.add_span_processor(
+                    BatchSpanProcessor(OTLPSpanExporter(endpoint=settings.TRACING_OTLP_ENDPOINT))
+                )
+            elif exporter_name in ("file", "console"):
+                out = open(settings.TRACING_FILE_PATH, "a", encoding="utf-8") if exporter_name == "file" else sys.stdout
+                exporter = ConsoleSpanExporter(
+                    out=out,
+                    formatter=lambda span: span.to_json(indent=None) + os.linesep
+                )
+                provider.add_span_processor(SimpleSpanProcessor(exporter))
+            else:
+                raise ValueError(f"Unknown TRACING_EXPORTER: {exporter_name}")
+        except Exception as e:
+            logger.warning("Tracing disabled", exporter=exporter_name, error=str(e))
+            return False
+
+        trace.set_tracer_provider(provider)
+        _provider = provider
+        logger.info("Tracing enabled", exporter=exporter_name)
+        return True
+
+
+def shutdown_tracing():
+    """Flush and stop the exporter (called on shutdown)."""
+    if _provider is not None:
+        _provider.shutdown()
+
+
+def _attributes(attributes: Mapping[str, Any]) -> Dict[str, Any]:
+    """Span attributes must be primitives; drop Nones and stringify the rest."""
+    return {
+        key: value if isinstance(value, (str, bool, int, float)) else str(value)
+        for key, value in attributes.items() if value is not None
+    }
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Any]:
+    """
+    Child span of the current one around the enclosed block (sync or async).
+    Exceptions are recorded on the span and mark it as an error.
+    """
+    if not HAS_OTEL:
+        yield None
+        return
+    with _tracer.start_as_current_span(name, attributes=_attributes(attributes)) as current:
+        yield current
+
+
+@contextmanager
+def server_span(name: str, headers: Mapping[str, str], attributes: Optional[Mapping[str, Any]] = None) -> Iterator[Any]:
+    """Root span for an incoming request, continuing a caller's `traceparent` if sent."""
+    if not HAS_OTEL:
+        yield None
+        return
+    with _tracer.start_as_current_span(
+        name,
+        context=propagate.extract(dict(headers)),
+        kind=SpanKind.SERVER,
+        attributes=_attributes(attributes or {})
+    ) as current:
+        yield current
+
+
+def set_attributes(current: Any, attributes: Mapping[str, Any]):
+    """Add attributes to a span yielded by span()/server_span() (None when tracing is off)."""
+    if current is not None:
+        current.set_attributes(_attributes(attributes))
+
+
+def traced(name: Optional[str] = None, **attributes: Any) -> Callable:
+    """Decorator wrapping a sync or async function in a span (default name: its qualified name)."""
+
+    def decorator(func: Callable) -> Callable:
+        span_name = name or func.__qualname__
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with span(span_name, **attributes):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(span_name, **attributes):
+                return func(*args, **kwargs)
+        return wrapper
+
+    return decorator
+
+
+def trace_methods(prefix: str, **attributes: Any) -> Callable[[type], type]:
+    """Class decorator tracing every public method as "<prefix>.<method>"."""
+
+    def decorate(cls: type) -> type:
+        for attr_name, value in list(vars(cls).items()):
+            if attr_name.startswith("_") or not inspect.isfunction(value):
+                continue
+            setattr(cls, attr_name, traced(f"{prefix}.{attr_name}", **attributes)(value))
+        return cls
+
+    return decorate
+
+
+def current_trace_ids() -> Dict[str, str]:
+    """Hex trace/span ids of the active span ({} outside a recorded trace)."""
+    if not HAS_OTEL:
+        return {}
+    context = trace.get_current_span().get_span_context()
+    if not context.is_valid:
+        return {}
+    return {"trace_id": format(context.trace_id, "032x"), "span_id": format(context.span_id, "016x")}
+
+
+def add_trace_context(logger, method_name: str, event_dict: Dict[str, Any]) -> Dict[str, Any]:
+    """structlog processor adding trace_id/span_id to events logged inside a span."""
+    for key, value in current_trace_ids().items():
+        event_dict.setdefault(key, value)
+    return event_dict
@@ -51,6 +51,7 @@ class Document(BaseModel):
     file_hash: str
     mime_type: Optional[str] = None
     file_size_bytes: Optional[int] = None
+    perceptual_hash: Optional[Dict[str, str]] = None
     document_type: Optional[DocumentType] = None
     detected_language: Optional[str] = None
     raw_ocr_text: Optional[str] = None
@@ -10,8 +10,10 @@ from datetime import datetime
 from src.database.client import get_supabase
 from src.database.models import AuditLog, AuditLogCreate
 from src.core.logger import logger
+from src.core.tracing import trace_methods
 
 
+@trace_methods("db.audit_logs")
 class AuditRepository:
     """Repository for audit log operations."""
 
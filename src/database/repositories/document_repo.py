@@ -4,14 +4,16 @@ DocVerify AI - Document Repository
 Handles CRUD operations for documents in Supabase.
 """
 
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 from datetime import datetime
 
 from src.database.client import get_supabase
 from src.database.models import Document, DocumentCreate, DocumentType
 from src.core.logger import logger
+from src.core.tracing import trace_methods
 
 
+@trace_methods("db.documents")
 class DocumentRepository:
     """Repository for document operations."""
 
@@ -175,3 +177,29 @@ class DocumentRepository:
         except Exception as e:
             logger.error("Failed to find duplicates", error=str(e))
             return []
+
+    async def update_perceptual_hash(self, document_id: str, perceptual_hash: Dict[str, str]) -> Optional[Document]:
+        """Store the document image's perceptual hashes (hex pHash/dHash)."""
+        return await self.update(document_id, {"perceptual_hash": perceptual_hash})
+
+    async def list_perceptual_hashes(self, page_size: int = 10000) -> List[Tuple[str, Dict[str, str]]]:
+        """All (document_id, perceptual_hash) pairs, for rebuilding the near-duplicate index."""
+        try:
+            pairs = []
+            offset = 0
+            while True:
+                result = (
+                    self.client.table(self.TABLE_NAME)
+                    .select("id, perceptual_hash")
+                    .not_.is_("perceptual_hash", "null")
+                    .range(offset, offset + page_size - 1)
+                    .execute()
+                )
+                pairs.extend((row["id"], row["perceptual_hash"]) for row in result.data)
+                if len(result.data) < page_size:
+                    return pairs
+                offset += page_size
+
+        except Exception as e:
+            logger.error("Failed to list perceptual hashes", error=str(e))
+            return []
@@ -4,14 +4,16 @@ DocVerify AI - Verification Repository
 Handles CRUD operations for verifications in Supabase.
 """
 
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 from datetime import datetime
 
 from src.database.client import get_supabase
 from src.database.models import Verification, VerificationCreate, VerificationStatus
 from src.core.logger import logger
+from src.core.tracing import trace_methods
 
 
+@trace_methods("db.verifications")
 class VerificationRepository:
     """Repository for verification operations."""
 
@@ -101,6 +103,29 @@ class VerificationRepository:
             logger.error("Failed to list verifications", error=str(e))
             raise
 
+    async def list_extracted_fields(self, page_size: int = 10000) -> List[Tuple[str, Dict[str, Any]]]:
+        """All (document_id, extracted_fields) pairs, oldest first, for rebuilding the identity index."""
+        try:
+            pairs = []
+            offset = 0
+            while True:
+                result = (
+                    self.client.table(self.TABLE_NAME)
+                    .select("document_id, extracted_fields")
+                    .not_.is_("extracted_fields", "null")
+                    .order("created_at")
+                    .range(offset, offset + page_size - 1)
+                    .execute()
+                )
+                pairs.extend((row["document_id"], row["extracted_fields"]) for row in result.data)
+                if len(result.data) < page_size:
+                    return pairs
+                offset += page_size
+
+        except Exception as e:
+            logger.error("Failed to list extracted fields", error=str(e))
+            return []
+
     async def update(self, verification_id: str, updates: Dict[str, Any]) -> Optional[Verification]:
         """Update verification fields."""
         try:
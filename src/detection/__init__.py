@@ -0,0 +1,13 @@
+"""
+DocVerify AI - Detection Module
+
+Locates visual elements on document images (official stamps/seals and
+handwritten signatures).
+"""
+
+from src.detection.stamps import DetectionResult, detect_stamps_and_signatures
+
+__all__ = [
+    "DetectionResult",
+    "detect_stamps_and_signatures"
+]
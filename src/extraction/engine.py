@@ -3,6 +3,10 @@ from typing import Dict, Any, Optional
 from structlog import get_logger
 from src.extraction.patterns import DocumentPatterns
 from src.core.config import get_settings
+from src.core.metrics import record_fallback, timed
+from src.core.tracing import span
+from src.core.model_registry import acquire_gemini_chat, gemini_chat_key, get_model_registry
+from src.ocr.page import OCRPage
 
 # Optional LLM imports
 try:
@@ -26,21 +30,35 @@ class ExtractionEngine:
         self.llm = None
         if HAS_LLM and settings.GOOGLE_API_KEY:
             try:
-                self.llm = ChatGoogleGenerativeAI(
-                    model=settings.GEMINI_MODEL,
-                    google_api_key=settings.GOOGLE_API_KEY,
-                    temperature=0.0
-                )
+                # One Gemini client per process, shared with the other engines and agents
+                self.llm = acquire_gemini_chat()
                 logger.info("Gemini Extractor initialized")
             except Exception as e:
                 logger.warning("Failed to init Gemini for extraction", error=str(e))
 
-    async def extract(self, text: str, doc_type: str) -> Dict[str, Any]:
+    def close(self):
+        """Release the shared LLM client."""
+        if self.llm is not None:
+            self.llm = None
+            get_model_registry().release(gemini_chat_key())
+
+    async def extract(self, text: str, doc_type: str, page: Optional[OCRPage] = None) -> Dict[str, Any]:
         """
         Main extraction method.
+
+        Args:
+            text: OCR text
+            doc_type: Classified document type
+            page: Structured OCR page, enables layout-aware extraction of labelled fields
         """
         # 1. Regex Extraction
         extracted_data = self.extract_by_regex(text, doc_type)
+
+        # 1b. Layout Extraction: a value read next to its printed label beats
+        # an unanchored regex hit (e.g. the PAN "name" pattern matches any caps run).
+        # Formatted fields only come back when they match their format.
+        if page is not None and len(page):
+            extracted_data.update(self.extract_by_layout(page, doc_type))
         
         # Check if critical fields are missing
         missing_critical_fields = self._check_missing_fields(extracted_data, doc_type)
@@ -48,11 +66,13 @@ class ExtractionEngine:
         # 2. LLM Fallback if needed
         if missing_critical_fields and self.llm:
             logger.info("Critical fields missing, attempting LLM extraction", missing=missing_critical_fields)
+            record_fallback("extraction", "llm")
             llm_data = await self.extract_by_llm(text, doc_type, missing_critical_fields)
             extracted_data.update(llm_data)
             
         return extracted_data
 
+    @timed("extraction", "regex")
     def extract_by_regex(self, text: str, doc_type: str) -> Dict[str, Any]:
         logger.info(f"Running Regex extraction for {doc_type}")
         patterns = DocumentPatterns.get_patterns(doc_type)
@@ -67,6 +87,28 @@ class ExtractionEngine:
                 
         return results
 
+    @timed("extraction", "layout")
+    def extract_by_layout(self, page: OCRPage, doc_type: str) -> Dict[str, Any]:
+        """
+        Read labelled values (e.g. "Father's Name") using token geometry.
+        Fields with a format in LAYOUT_FORMATS keep only the formatted part
+        and are dropped when it is missing.
+        """
+        results = {}
+        for field, label_pattern in DocumentPatterns.get_layout_labels(doc_type).items():
+            value = page.value_after_label(label_pattern)
+            if not value:
+                continue
+            value_format = DocumentPatterns.LAYOUT_FORMATS.get(field)
+            if value_format:
+                match = re.search(value_format, value)
+                if not match:
+                    continue
+                value = match.group(1) if match.groups() else match.group(0)
+            results[field] = value.strip()
+        return results
+
+    @timed("extraction", "llm")
     async def extract_by_llm(self, text: str, doc_type: str, missing_fields: list) -> Dict[str, Any]:
         try:
             prompt = f"""
@@ -80,10 +122,11 @@ class ExtractionEngine:
             {text[:3000]}
             """
             
-            response = await self.llm.ainvoke([
-                SystemMessage(content="You are a data extraction assistant. Output valid JSON only."),
-                HumanMessage(content=prompt)
-            ])
+            with span("llm.gemini.invoke", model=settings.GEMINI_MODEL, purpose="extraction"):
+                response = await self.llm.ainvoke([
+                    SystemMessage(content="You are a data extraction assistant. Output valid JSON only."),
+                    HumanMessage(content=prompt)
+                ])
             
             # Simple parsing
             import json
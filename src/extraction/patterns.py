@@ -49,6 +49,39 @@ class DocumentPatterns:
         "mother_name": r'(?:Mother\'s Name|Name of Mother)\s*[:=\-]?\s*([A-Za-z\s]+)'
     }
 
+    # Printed labels for layout-aware extraction (value right of or below the label)
+    LAYOUT_LABELS = {
+        "pan_card": {
+            "name": r"^name",
+            "father_name": r"father'?s\s+name",
+            "dob": r"date\s+of\s+birth",
+        },
+        "voter_id": {
+            "name": r"elector'?s\s+name|^name",
+            "father_name": r"father'?s\s+name",
+        },
+        "driving_license": {
+            "name": r"^name",
+            "father_name": r"s/?d/?w\s+of|son/daughter/wife\s+of",
+            "dob": r"^dob|date\s+of\s+birth",
+        },
+        "passport": {
+            "surname": r"^surname",
+            "given_name": r"given\s+name\(?s?\)?",
+        },
+    }
+
+    # Formats a layout value must contain to be used; the match replaces the
+    # raw text after the label (which can run into the next label on the line).
+    # Fields not listed here are free text.
+    LAYOUT_FORMATS = {
+        "dob": DATE_PATTERN,
+    }
+
+    @staticmethod
+    def get_layout_labels(doc_type: str):
+        return DocumentPatterns.LAYOUT_LABELS.get(doc_type, {})
+
     @staticmethod
     def get_patterns(doc_type: str):
         mapping = {
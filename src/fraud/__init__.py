@@ -0,0 +1,44 @@
+"""
+DocVerify AI - Fraud Detection Module
+
+Duplicate and fraud signals: perceptual hashing with near-duplicate
+search, document embeddings with a local vector index, an inverted index
+over identity numbers, image forensics (ELA, noise, JPEG ghosts,
+copy-move), and a portrait descriptor index.
+"""
+
+from src.fraud.perceptual_hash import PerceptualHash, compute_perceptual_hash, hamming_distance
+from src.fraud.duplicate_index import DuplicateMatch, NearDuplicateIndex, get_duplicate_index
+from src.fraud.embeddings import HashingEmbedder, document_embedding_text, get_embedder
+from src.fraud.vector_index import VectorIndex, get_vector_index, save_vector_index
+from src.fraud.identity_index import IDENTITY_FIELDS, IdentityIndex, get_identity_index
+from src.fraud.tamper import TamperResult, detect_tampering
+from src.fraud.copy_move import CopyMoveResult, detect_copy_move
+from src.fraud.faces import FaceRegion, extract_face, face_match_threshold, get_face_index, save_face_index
+
+__all__ = [
+    "PerceptualHash",
+    "compute_perceptual_hash",
+    "hamming_distance",
+    "DuplicateMatch",
+    "NearDuplicateIndex",
+    "get_duplicate_index",
+    "HashingEmbedder",
+    "document_embedding_text",
+    "get_embedder",
+    "VectorIndex",
+    "get_vector_index",
+    "save_vector_index",
+    "IDENTITY_FIELDS",
+    "IdentityIndex",
+    "get_identity_index",
+    "TamperResult",
+    "detect_tampering",
+    "CopyMoveResult",
+    "detect_copy_move",
+    "FaceRegion",
+    "extract_face",
+    "face_match_threshold",
+    "get_face_index",
+    "save_face_index"
+]
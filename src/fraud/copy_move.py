@@ -0,0 +1,283 @@
+"""
+DocVerify AI - Copy-Move Forgery Detection
+
+Finds regions duplicated within the same image (a digit or photo block
+cloned over another). ORB keypoints are matched against each other with
+bit-sampling LSH over the 256-bit binary descriptors, so candidate pairs
+come from hash-bucket collisions instead of an O(n^2) all-pairs
+comparison. A cloned region produces many matches sharing one
+displacement vector; those are clustered and reported as source/target
+box pairs. Documents repeat glyphs, words and line layouts everywhere, so
+clusters shaped like text (thin strips, tiny or sparse boxes, a
+displacement recurring all over the page) are discarded.
+
+The whole analysis is bounded by COPY_MOVE_TIME_BUDGET_MS per page: once
+the budget is spent the remaining LSH tables are skipped and the result
+is marked timed_out.
+"""
+
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+from structlog import get_logger
+
+from src.core.config import get_settings
+
+logger = get_logger()
+settings = get_settings()
+
+DESCRIPTOR_BITS = 256
+LSH_TABLES = 10
+LSH_KEY_BITS = 16
+BUCKET_PAIRS = 8  # pairs formed per key within a bucket (caps huge buckets of repeated texture)
+MAX_HAMMING = 40  # descriptor distance accepted as the same patch
+MIN_OFFSET = 24  # px at analysis scale; closer matches are the same feature seen twice
+DISPLACEMENT_BIN = 6  # px; clones share a displacement up to keypoint jitter
+MAX_REGION_FRACTION = 0.25  # clusters spread over more of the page are periodic backgrounds
+MIN_REGION_SIDE = 32  # px at analysis scale; thinner boxes are a single line of text
+MAX_REGION_ASPECT = 4.0  # longer strips are repeated words along a line
+MIN_REGION_AREA_FRACTION = 0.005  # smaller boxes are a repeated glyph or two
+MIN_REGION_COVERAGE = 0.5  # share of the source box's keypoints that must be cloned
+MAX_DISPLACEMENT_GROUPS = 2  # a displacement recurring in more places is periodic text
+
+# Fixed bit samples so results are reproducible across processes
+_LSH_BITS = np.random.default_rng(0).choice(DESCRIPTOR_BITS, size=(LSH_TABLES, LSH_KEY_BITS))
+_POPCOUNT = np.unpackbits(np.arange(256, dtype=np.uint8)[:, np.newaxis], axis=1).sum(axis=1)
+
+
+@dataclass
+class CopyMoveResult:
+    """Copy-move analysis of one page."""
+    score: float
+    region_pairs: List[Dict[str, Any]] = field(default_factory=list)
+    keypoints: int = 0
+    matches: int = 0
+    timed_out: bool = False
+    elapsed_ms: float = 0.0
+
+    @property
+    def is_suspicious(self) -> bool:
+        return bool(self.region_pairs)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "copy_move_score": round(self.score, 4),
+            "region_pairs": self.region_pairs,
+            "keypoints": self.keypoints,
+            "matches": self.matches,
+            "timed_out": self.timed_out,
+            "elapsed_ms": round(self.elapsed_ms, 1)
+        }
+
+
+# cv2.ORB keeps per-call state and isn't documented as thread-safe: one per worker thread
+_orb_local = threading.local()
+
+
+def _get_orb():
+    orb = getattr(_orb_local, "orb", None)
+    if orb is None:
+        orb = _orb_local.orb = cv2.ORB_create(nfeatures=settings.COPY_MOVE_MAX_KEYPOINTS, fastThreshold=10)
+    return orb
+
+
+def _lsh_candidates(
+    bits: np.ndarray,
+    deadline: float,
+    cancelled: Optional[threading.Event] = None
+) -> Tuple[np.ndarray, bool]:
+    """
+    Candidate (i, j) descriptor pairs, i < j, colliding in at least one LSH table.
+
+    Keys are sorted per table, so pairing each entry with its next
+    BUCKET_PAIRS neighbours that share the key enumerates bucket members
+    without Python loops over buckets.
+    """
+    weights = 1 << np.arange(LSH_KEY_BITS, dtype=np.int64)
+    pairs = []
+    timed_out = False
+    for table in range(LSH_TABLES):
+        if time.perf_counter() > deadline or (cancelled is not None and cancelled.is_set()):
+            timed_out = True
+            break
+        keys = bits[:, _LSH_BITS[table]].astype(np.int64) @ weights
+        order = np.argsort(keys, kind="stable")
+        sorted_keys = keys[order]
+        for step in range(1, BUCKET_PAIRS + 1):
+            same = sorted_keys[:-step] == sorted_keys[step:]
+            if not same.any():
+                break
+            pairs.append(np.stack([order[:-step][same], order[step:][same]], axis=1))
+    if not pairs:
+        return np.empty((0, 2), dtype=np.int64), timed_out
+    pairs = np.sort(np.concatenate(pairs), axis=1)
+    return np.unique(pairs, axis=0), timed_out
+
+
+def _box(points: np.ndarray, scale: float) -> Dict[str, int]:
+    low = np.percentile(points, 5, axis=0)
+    high = np.percentile(points, 95, axis=0)
+    return {
+        "x": int(low[0] / scale),
+        "y": int(low[1] / scale),
+        "width": int(max(high[0] - low[0], 1) / scale),
+        "height": int(max(high[1] - low[1], 1) / scale)
+    }
+
+
+def _spatial_groups(points: np.ndarray) -> List[np.ndarray]:
+    """Split points into spatially connected groups on a MIN_REGION_SIDE grid."""
+    cells = (points // MIN_REGION_SIDE).astype(np.int64)
+    cells -= cells.min(axis=0)
+    grid = np.zeros((cells[:, 1].max() + 1, cells[:, 0].max() + 1), dtype=np.uint8)
+    grid[cells[:, 1], cells[:, 0]] = 1
+    _, labels = cv2.connectedComponents(grid, connectivity=8)
+    point_labels = labels[cells[:, 1], cells[:, 0]]
+    return [point_labels == label for label in np.unique(point_labels)]
+
+
+def _is_plausible_region(src: np.ndarray, points: np.ndarray, image_area: float) -> bool:
+    """
+    Whether matched keypoints outline a cloned block rather than repeated text.
+
+    Rendered text repeats the same glyphs all over a document, so glyph
+    runs match each other along thin strips or sparsely across a wider
+    box; a cloned block is compact, reasonably sized and carries nearly
+    every feature inside it.
+    """
+    low = np.percentile(src, 5, axis=0)
+    high = np.percentile(src, 95, axis=0)
+    width, height = high - low
+    if min(width, height) < MIN_REGION_SIDE or max(width, height) > MAX_REGION_ASPECT * min(width, height):
+        return False
+    if width * height < MIN_REGION_AREA_FRACTION * image_area or width * height > MAX_REGION_FRACTION * image_area:
+        return False
+    inside = ((points >= low) & (points <= high)).all(axis=1).sum()
+    cloned = len(np.unique(src[((src >= low) & (src <= high)).all(axis=1)], axis=0))
+    return cloned >= MIN_REGION_COVERAGE * inside
+
+
+def _cluster_displacements(
+    source: np.ndarray,
+    target: np.ndarray,
+    points: np.ndarray,
+    min_matches: int,
+    image_area: float,
+    scale: float,
+    limit: int = 5
+) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    Group matches by (binned) displacement vector, largest group first.
+
+    A displacement whose matches fall into more than MAX_DISPLACEMENT_GROUPS
+    separate places is periodic (line spacing, repeated words) and is
+    dropped; otherwise each connected group of at least min_matches
+    matches that passes _is_plausible_region becomes a region pair.
+    Returns the region pairs and the size of the largest accepted group.
+    """
+    displacement = target - source
+    bins = np.round(displacement / DISPLACEMENT_BIN).astype(np.int64)
+    unique_bins, counts = np.unique(bins, axis=0, return_counts=True)
+    assigned = np.zeros(len(source), dtype=bool)
+    region_pairs, largest = [], 0
+    for index in np.argsort(-counts):
+        if counts[index] < min_matches // 2 or len(region_pairs) >= limit:
+            break
+        # Neighbouring bins absorb jitter across bin edges
+        members = (np.abs(bins - unique_bins[index]).max(axis=1) <= 1) & ~assigned
+        if members.sum() < min_matches:
+            continue
+        assigned |= members
+        member_index = np.flatnonzero(members)
+        groups = [group for group in _spatial_groups(source[members]) if group.sum() >= min_matches // 2]
+        if len(groups) > MAX_DISPLACEMENT_GROUPS:
+            continue
+        for group in groups:
+            selected = member_index[group]
+            src, dst = source[selected], target[selected]
+            if len(selected) < min_matches or not _is_plausible_region(src, points, image_area):
+                continue
+            largest = max(largest, len(selected))
+            dx, dy = np.median(displacement[selected], axis=0)
+            region_pairs.append({
+                "source": _box(src, scale),
+                "target": _box(dst, scale),
+                "displacement": {"dx": int(dx / scale), "dy": int(dy / scale)},
+                "matches": len(selected)
+            })
+    return region_pairs[:limit], largest
+
+
+def detect_copy_move(
+    image: np.ndarray,
+    max_side: Optional[int] = None,
+    time_budget_ms: Optional[float] = None,
+    cancelled: Optional[threading.Event] = None
+) -> CopyMoveResult:
+    """
+    Look for regions cloned within one page.
+
+    Args:
+        image: BGR or grayscale page (original upload)
+        max_side: Longest side analysed (default: COPY_MOVE_MAX_SIDE)
+        time_budget_ms: Wall-clock budget (default: COPY_MOVE_TIME_BUDGET_MS)
+        cancelled: Stop matching early (reported as timed out) once set
+    """
+    start = time.perf_counter()
+    deadline = start + (time_budget_ms or settings.COPY_MOVE_TIME_BUDGET_MS) / 1000
+    min_matches = settings.COPY_MOVE_MIN_MATCHES
+
+    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if image.ndim == 3 else image
+    # ORB keypoints survive resampling, unlike the JPEG traces tamper.py relies on
+    scale = min(1.0, (max_side or settings.COPY_MOVE_MAX_SIDE) / max(gray.shape[:2]))
+    if scale < 1.0:
+        gray = cv2.resize(gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+
+    keypoints, descriptors = _get_orb().detectAndCompute(gray, None)
+    if descriptors is None or len(keypoints) < min_matches * 2:
+        return CopyMoveResult(0.0, keypoints=len(keypoints), elapsed_ms=(time.perf_counter() - start) * 1000)
+
+    bits = np.unpackbits(descriptors, axis=1)
+    candidates, timed_out = _lsh_candidates(bits, deadline, cancelled)
+
+    points = np.array([kp.pt for kp in keypoints], dtype=np.float32)
+    region_pairs, largest, match_count = [], 0, 0
+    if len(candidates):
+        i, j = candidates[:, 0], candidates[:, 1]
+        distances = _POPCOUNT[descriptors[i] ^ descriptors[j]].sum(axis=1)
+        offsets = np.linalg.norm(points[i] - points[j], axis=1)
+        keep = (distances <= MAX_HAMMING) & (offsets >= MIN_OFFSET)
+        i, j = i[keep], j[keep]
+        match_count = int(keep.sum())
+
+        # Orient every pair the same way so a clone's matches share one vector
+        flip = (points[j, 0] < points[i, 0]) | ((points[j, 0] == points[i, 0]) & (points[j, 1] < points[i, 1]))
+        i, j = np.where(flip, j, i), np.where(flip, i, j)
+        if match_count >= min_matches:
+            region_pairs, largest = _cluster_displacements(
+                points[i], points[j], points, min_matches, float(gray.shape[0] * gray.shape[1]), scale
+            )
+
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    result = CopyMoveResult(
+        score=float(min(1.0, largest / (min_matches * 3))),
+        region_pairs=region_pairs,
+        keypoints=len(keypoints),
+        matches=match_count,
+        timed_out=timed_out or elapsed_ms > (time_budget_ms or settings.COPY_MOVE_TIME_BUDGET_MS),
+        elapsed_ms=elapsed_ms
+    )
+    logger.info(
+        "Copy-move analysis complete",
+        score=round(result.score, 4),
+        region_pairs=len(region_pairs),
+        keypoints=result.keypoints,
+        matches=match_count,
+        timed_out=result.timed_out,
+        elapsed_ms=round(elapsed_ms, 1)
+    )
+    return result
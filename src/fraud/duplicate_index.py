@@ -0,0 +1,151 @@
+"""
+DocVerify AI - Near-Duplicate Index
+
+Multi-index hashing over 64-bit pHashes. The hash is split into 3
+bands; by the pigeonhole principle two hashes within Hamming distance r
+agree to within floor(r / 3) bits on at least one band, so a
+query only probes the handful of band values near its own and verifies
+those candidates exactly. Lookups stay sub-millisecond with millions of
+documents, where a linear scan or BK-tree walk would not.
+"""
+
+import threading
+from collections import defaultdict
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import combinations
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from structlog import get_logger
+
+from src.core.config import get_settings
+from src.fraud.perceptual_hash import PerceptualHash, hamming_distance
+
+logger = get_logger()
+settings = get_settings()
+
+# Band widths: ~log2(N) bits per band keeps buckets near one entry at
+# N ~ millions, so the candidate set stays small
+BAND_WIDTHS = (22, 21, 21)
+BANDS = len(BAND_WIDTHS)
+BAND_OFFSETS = tuple(sum(BAND_WIDTHS[:i]) for i in range(BANDS))
+
+
+@dataclass
+class DuplicateMatch:
+    """A stored document whose image is a near-duplicate of the query."""
+    document_id: str
+    phash_distance: int
+    dhash_distance: int
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            "document_id": self.document_id,
+            "phash_distance": self.phash_distance,
+            "dhash_distance": self.dhash_distance
+        }
+
+
+def _bands(value: int) -> List[int]:
+    return [(value >> offset) & ((1 << width) - 1) for offset, width in zip(BAND_OFFSETS, BAND_WIDTHS)]
+
+
+@lru_cache(maxsize=None)
+def _flip_masks(width: int, radius: int) -> Tuple[int, ...]:
+    """XOR masks reaching every `width`-bit value within `radius` bit flips."""
+    masks = [0]
+    for flips in range(1, radius + 1):
+        for positions in combinations(range(width), flips):
+            masks.append(sum(1 << position for position in positions))
+    return tuple(masks)
+
+
+class NearDuplicateIndex:
+    """
+    Thread-safe in-memory pHash index with dHash confirmation.
+    """
+
+    def __init__(self, max_phash_distance: Optional[int] = None, max_dhash_distance: Optional[int] = None):
+        self.max_phash_distance = settings.PHASH_MAX_DISTANCE if max_phash_distance is None else max_phash_distance
+        self.max_dhash_distance = settings.DHASH_MAX_DISTANCE if max_dhash_distance is None else max_dhash_distance
+        self._hashes: Dict[str, PerceptualHash] = {}
+        self._tables: List[Dict[int, Set[str]]] = [defaultdict(set) for _ in range(BANDS)]
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._hashes)
+
+    def add(self, document_id: str, hashes: PerceptualHash):
+        with self._lock:
+            self.remove(document_id)
+            self._hashes[document_id] = hashes
+            for table, band in zip(self._tables, _bands(hashes.phash)):
+                table[band].add(document_id)
+
+    def remove(self, document_id: str):
+        with self._lock:
+            hashes = self._hashes.pop(document_id, None)
+            if hashes is None:
+                return
+            for table, band in zip(self._tables, _bands(hashes.phash)):
+                bucket = table.get(band)
+                if bucket is not None:
+                    bucket.discard(document_id)
+                    if not bucket:
+                        del table[band]
+
+    def search(
+        self,
+        hashes: PerceptualHash,
+        exclude: Optional[str] = None,
+        limit: int = 5
+    ) -> List[DuplicateMatch]:
+        """Stored documents within the distance thresholds, closest first."""
+        radius = self.max_phash_distance // BANDS
+        with self._lock:
+            candidates: Set[str] = set()
+            for table, band, width in zip(self._tables, _bands(hashes.phash), BAND_WIDTHS):
+                for mask in _flip_masks(width, radius):
+                    bucket = table.get(band ^ mask)
+                    if bucket:
+                        candidates |= bucket
+            candidates.discard(exclude)
+
+            matches = []
+            for document_id in candidates:
+                stored = self._hashes[document_id]
+                phash_distance = hamming_distance(hashes.phash, stored.phash)
+                if phash_distance > self.max_phash_distance:
+                    continue
+                dhash_distance = hamming_distance(hashes.dhash, stored.dhash)
+                if dhash_distance > self.max_dhash_distance:
+                    continue
+                matches.append(DuplicateMatch(document_id, phash_distance, dhash_distance))
+
+        matches.sort(key=lambda m: (m.phash_distance, m.dhash_distance))
+        return matches[:limit]
+
+    def best_match(self, hashes: PerceptualHash, exclude: Optional[str] = None) -> Optional[DuplicateMatch]:
+        matches = self.search(hashes, exclude=exclude, limit=1)
+        return matches[0] if matches else None
+
+    def bulk_load(self, items: Iterable[Tuple[str, PerceptualHash]]):
+        count = 0
+        for document_id, hashes in items:
+            self.add(document_id, hashes)
+            count += 1
+        logger.info("Near-duplicate index loaded", documents=count)
+
+
+_index: Optional[NearDuplicateIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_duplicate_index() -> NearDuplicateIndex:
+    """Process-wide near-duplicate index."""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = NearDuplicateIndex()
+    return _index
@@ -0,0 +1,115 @@
+"""
+DocVerify AI - Document Embeddings
+
+Turns OCR text + extracted fields into fixed-size vectors for
+content-level duplicate search.
+
+Backends:
+- hashing (default): signed feature hashing of word tokens and character
+  trigrams. Local, deterministic across processes, no model download.
+- ollama: OLLAMA_EMBED_MODEL via the Ollama HTTP API (semantic, but
+  network-bound).
+"""
+
+import re
+import zlib
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from structlog import get_logger
+
+from src.core.config import get_settings
+from src.core.tracing import span
+
+logger = get_logger()
+settings = get_settings()
+
+_TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+def document_embedding_text(text: str, fields: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Canonical text for embedding. Extracted fields go first (and are
+    repeated) so identity data outweighs boilerplate printed on every card.
+    """
+    parts = []
+    for key, value in sorted((fields or {}).items()):
+        if value is None or isinstance(value, (dict, list)):
+            continue
+        line = f"{key} {value}".lower()
+        parts.extend([line, line])
+    parts.append((text or "").lower())
+    return "\n".join(parts)
+
+
+class HashingEmbedder:
+    """Signed feature-hashing embedder (word unigrams + character trigrams)."""
+
+    name = "hashing"
+
+    def __init__(self, dim: Optional[int] = None):
+        self.dim = dim or settings.EMBEDDING_DIM
+
+    def _features(self, text: str) -> List[str]:
+        tokens = _TOKEN_PATTERN.findall(text)
+        features = [f"w:{token}" for token in tokens]
+        for token in tokens:
+            padded = f" {token} "
+            features.extend(f"c:{padded[i:i + 3]}" for i in range(len(padded) - 2))
+        return features
+
+    def embed(self, text: str) -> np.ndarray:
+        features = self._features(text)
+        vector = np.zeros(self.dim, dtype=np.float32)
+        if not features:
+            return vector
+        hashes = np.fromiter((zlib.crc32(f.encode("utf-8")) for f in features), dtype=np.uint64, count=len(features))
+        buckets = (hashes % self.dim).astype(np.intp)
+        signs = np.where((hashes >> np.uint64(31)) & np.uint64(1), -1.0, 1.0).astype(np.float32)
+        np.add.at(vector, buckets, signs)
+        # Sublinear term frequency, then unit length so dot product = cosine
+        vector = np.sign(vector) * np.log1p(np.abs(vector))
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
+
+
+class OllamaEmbedder:
+    """Embeddings from a local Ollama server."""
+
+    name = "ollama"
+
+    def __init__(self, model: Optional[str] = None, base_url: Optional[str] = None):
+        import httpx
+
+        self.model = model or settings.OLLAMA_EMBED_MODEL
+        self._client = httpx.Client(base_url=base_url or settings.OLLAMA_BASE_URL, timeout=30.0)
+        self.dim = len(self._request("dimension probe"))
+
+    def _request(self, text: str) -> List[float]:
+        with span("llm.ollama.embed", model=self.model):
+            response = self._client.post("/api/embeddings", json={"model": self.model, "prompt": text})
+            response.raise_for_status()
+        return response.json()["embedding"]
+
+    def embed(self, text: str) -> np.ndarray:
+        vector = np.asarray(self._request(text), dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
+
+
+_embedder = None
+
+
+def get_embedder():
+    """Process-wide embedder for EMBEDDING_BACKEND (falls back to hashing)."""
+    global _embedder
+    if _embedder is None:
+        if settings.EMBEDDING_BACKEND == "ollama":
+            try:
+                _embedder = OllamaEmbedder()
+                logger.info("Using Ollama embeddings", model=_embedder.model, dim=_embedder.dim)
+            except Exception as e:
+                logger.warning("Ollama embeddings unavailable, using hashing embedder", error=str(e))
+        if _embedder is None:
+            _embedder = HashingEmbedder()
+    return _embedder
@@ -0,0 +1,262 @@
+"""
+DocVerify AI - Portrait Extraction & Face Descriptors
+
+Finds the holder's portrait on an identity document and turns it into a
+compact unit-length descriptor, so the same face can be looked up across
+documents in a local vector index.
+
+Detectors (all offline):
+- haar (default): OpenCV's bundled frontal-face Haar cascade.
+- yunet: OpenCV FaceDetectorYN with the ONNX model at FACE_DETECTOR_MODEL.
+
+Descriptors:
+- dct (default): the 128 lowest-frequency DCT coefficients of the
+  equalized crop. Model-free and robust to rescanning, rescaling and JPEG;
+  catches the same portrait photo reused on several documents, not two
+  different photos of one person.
+- sface: OpenCV FaceRecognizerSF with the ONNX model at
+  FACE_RECOGNIZER_MODEL (identity-level matching; needs the yunet detector
+  for landmark alignment).
+
+Descriptors are computed once per document and kept in the face index
+(persisted under FACE_INDEX_DIR), which doubles as the cache.
+"""
+
+import os
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+import cv2
+import numpy as np
+from structlog import get_logger
+
+from src.core.config import get_settings
+from src.core.metrics import record_fallback
+from src.fraud.vector_index import VectorIndex
+
+logger = get_logger()
+settings = get_settings()
+
+MIN_FACE_FRACTION = 0.05  # of the page's shorter side; smaller hits are printed noise
+DCT_SIZE = 64
+DCT_BLOCK = 12
+DESCRIPTOR_DIM = 128
+
+
+@dataclass
+class FaceRegion:
+    """Detected portrait in original page coordinates."""
+    x: int
+    y: int
+    width: int
+    height: int
+    confidence: float
+    detector: str
+    # Raw YuNet detection row (box + landmarks), needed for SFace alignment
+    landmarks: Optional[np.ndarray] = None
+
+    @property
+    def area(self) -> int:
+        return self.width * self.height
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "bounding_box": {"x": self.x, "y": self.y, "width": self.width, "height": self.height},
+            "confidence": round(self.confidence, 4),
+            "detector": self.detector
+        }
+
+
+# --- Detection ---
+
+class _HaarDetector:
+    name = "haar"
+
+    def __init__(self):
+        self._cascade = cv2.CascadeClassifier(
+            os.path.join(cv2.data.haarcascades, "haarcascade_frontalface_default.xml")
+        )
+        self._lock = threading.Lock()
+
+    def detect(self, image: np.ndarray) -> Optional[FaceRegion]:
+        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if image.ndim == 3 else image
+        scale = min(1.0, settings.FACE_MAX_SIDE / max(gray.shape[:2]))
+        if scale < 1.0:
+            gray = cv2.resize(gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+        min_side = max(24, int(min(gray.shape[:2]) * MIN_FACE_FRACTION))
+        # CascadeClassifier is not safe to share across threads
+        with self._lock:
+            faces, _, weights = self._cascade.detectMultiScale3(
+                cv2.equalizeHist(gray), scaleFactor=1.1, minNeighbors=5,
+                minSize=(min_side, min_side), outputRejectLevels=True
+            )
+        if len(faces) == 0:
+            return None
+        best = int(np.argmax(faces[:, 2] * faces[:, 3]))
+        x, y, w, h = (int(v / scale) for v in faces[best])
+        # Haar level weights are unbounded; squash into (0, 1)
+        confidence = float(1.0 - np.exp(-max(float(np.ravel(weights)[best]), 0.0)))
+        return FaceRegion(x, y, w, h, confidence, self.name)
+
+
+class _YuNetDetector:
+    name = "yunet"
+
+    def __init__(self, model_path: str):
+        self._detector = cv2.FaceDetectorYN.create(model_path, "", (320, 320), score_threshold=0.7)
+        self._lock = threading.Lock()
+
+    def detect(self, image: np.ndarray) -> Optional[FaceRegion]:
+        if image.ndim == 2:
+            image = cv2.cvtColor(image, cv2.COLOR_GRAY2BGR)
+        scale = min(1.0, settings.FACE_MAX_SIDE / max(image.shape[:2]))
+        small = cv2.resize(image, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA) if scale < 1.0 else image
+        with self._lock:
+            self._detector.setInputSize((small.shape[1], small.shape[0]))
+            _, faces = self._detector.detect(small)
+        if faces is None or len(faces) == 0:
+            return None
+        best = faces[int(np.argmax(faces[:, 2] * faces[:, 3]))]
+        row = best.copy()
+        row[:14] /= scale  # box and 5 landmarks back to page coordinates
+        x, y, w, h = (int(v) for v in row[:4])
+        return FaceRegion(x, y, w, h, float(best[14]), self.name, landmarks=row)
+
+
+# --- Descriptors ---
+
+# Lowest-frequency DCT coefficients (by u + v), DC excluded
+_DCT_ORDER = sorted(
+    ((u, v) for u in range(DCT_BLOCK) for v in range(DCT_BLOCK) if (u, v) != (0, 0)),
+    key=lambda uv: (uv[0] + uv[1], uv[0])
+)[:DESCRIPTOR_DIM]
+_DCT_ROWS = np.array([u for u, _ in _DCT_ORDER])
+_DCT_COLS = np.array([v for _, v in _DCT_ORDER])
+
+
+def _crop(image: np.ndarray, face: FaceRegion) -> np.ndarray:
+    return image[max(0, face.y):face.y + face.height, max(0, face.x):face.x + face.width]
+
+
+class DCTFaceEmbedder:
+    """Low-frequency DCT coefficients of the equalized portrait crop."""
+
+    name = "dct"
+    dim = DESCRIPTOR_DIM
+    match_threshold = 0.9
+
+    def embed(self, image: np.ndarray, face: FaceRegion) -> np.ndarray:
+        crop = _crop(image, face)
+        gray = cv2.cvtColor(crop, cv2.COLOR_BGR2GRAY) if crop.ndim == 3 else crop
+        # Equalizing removes print/scan contrast; dropping DC removes brightness
+        gray = cv2.equalizeHist(cv2.resize(gray, (DCT_SIZE, DCT_SIZE), interpolation=cv2.INTER_AREA))
+        vector = cv2.dct(gray.astype(np.float32))[_DCT_ROWS, _DCT_COLS]
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
+
+
+class SFaceEmbedder:
+    """OpenCV SFace recognition features (128-d)."""
+
+    name = "sface"
+    dim = DESCRIPTOR_DIM
+    match_threshold = 0.363  # cosine threshold published with the model
+
+    def __init__(self, model_path: str):
+        self._recognizer = cv2.FaceRecognizerSF.create(model_path, "")
+        self._lock = threading.Lock()
+
+    def embed(self, image: np.ndarray, face: FaceRegion) -> np.ndarray:
+        if image.ndim == 2:
+            image = cv2.cvtColor(image, cv2.COLOR_GRAY2BGR)
+        with self._lock:
+            if face.landmarks is not None:
+                aligned = self._recognizer.alignCrop(image, face.landmarks)
+            else:
+                aligned = cv2.resize(_crop(image, face), (112, 112))
+            vector = self._recognizer.feature(aligned).ravel().astype(np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
+
+
+_detector = None
+_embedder = None
+_models_lock = threading.Lock()
+
+
+def _load_models():
+    global _detector, _embedder
+    with _models_lock:
+        if _detector is not None:
+            return
+        detector, embedder = None, None
+        if settings.FACE_DETECTOR_MODEL:
+            try:
+                detector = _YuNetDetector(settings.FACE_DETECTOR_MODEL)
+            except Exception as e:
+                logger.warning("YuNet face detector unavailable, using Haar cascade", error=str(e))
+                record_fallback("face_detector", "haar")
+        if settings.FACE_RECOGNIZER_MODEL and detector is not None:
+            try:
+                embedder = SFaceEmbedder(settings.FACE_RECOGNIZER_MODEL)
+            except Exception as e:
+                logger.warning("SFace recognizer unavailable, using DCT descriptors", error=str(e))
+                record_fallback("face_descriptor", "dct")
+        _embedder = embedder or DCTFaceEmbedder()
+        _detector = detector or _HaarDetector()
+        logger.info("Face models ready", detector=_detector.name, descriptor=_embedder.name)
+
+
+def get_face_embedder():
+    """Process-wide face descriptor backend (DCT unless SFace is configured)."""
+    if _embedder is None:
+        _load_models()
+    return _embedder
+
+
+def detect_face(image: np.ndarray) -> Optional[FaceRegion]:
+    """Largest face on the page, or None."""
+    if _detector is None:
+        _load_models()
+    return _detector.detect(image)
+
+
+def extract_face(image: np.ndarray) -> Optional[Tuple[FaceRegion, np.ndarray]]:
+    """Detect the portrait on a page and describe it (None when there is no face)."""
+    face = detect_face(image)
+    if face is None:
+        return None
+    return face, get_face_embedder().embed(image, face)
+
+
+# --- Face index ---
+
+_index: Optional[VectorIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_face_index() -> VectorIndex:
+    """
+    Process-wide face descriptor index (one directory per descriptor backend).
+    Like the embedding index it is sharded per pre-fork worker and merged
+    across workers (see VectorIndex).
+    """
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                embedder = get_face_embedder()
+                directory = os.path.join(settings.FACE_INDEX_DIR, embedder.name) if settings.FACE_INDEX_DIR else None
+                _index = VectorIndex(dim=embedder.dim, directory=directory)
+    return _index
+
+
+def save_face_index():
+    """Persist this worker's shard of the face index if it was ever loaded (called on shutdown)."""
+    if _index is not None:
+        _index.close()
+
+
+def face_match_threshold() -> float:
+    return settings.FACE_MATCH_THRESHOLD or get_face_embedder().match_threshold
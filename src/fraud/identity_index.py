@@ -0,0 +1,167 @@
+"""
+DocVerify AI - Identity Index
+
+Inverted index from normalized identifier fields (Aadhaar, PAN, Voter ID,
+DL, passport numbers) to the documents they appear on, so a verification
+can flag an identifier reused across documents (typically with different
+names) with O(1) lookups instead of a table scan. Only values passing the
+field's format validator are indexed, so OCR/regex fragments (a bare "DL"
+label, say) never collide across unrelated documents.
+"""
+
+import re
+import threading
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from structlog import get_logger
+
+from src.validation.validators import (
+    validate_aadhaar,
+    validate_driving_license,
+    validate_pan,
+    validate_passport,
+    validate_voter_id
+)
+
+logger = get_logger()
+
+IDENTITY_FIELDS = {
+    "aadhaar_number": "Aadhaar",
+    "pan_number": "PAN",
+    "voter_id_number": "Voter ID",
+    "dl_number": "Driving Licence",
+    "passport_number": "Passport",
+}
+
+IDENTITY_VALIDATORS = {
+    "aadhaar_number": validate_aadhaar,
+    "pan_number": validate_pan,
+    "voter_id_number": validate_voter_id,
+    "dl_number": validate_driving_license,
+    "passport_number": validate_passport,
+}
+
+_NON_ALNUM = re.compile(r"[^0-9A-Z]")
+_NON_ALPHA = re.compile(r"[^A-Z ]")
+
+
+def normalize_identifier(value: Any) -> str:
+    """Uppercase and drop spaces/dashes/slashes ("1234 5678 9012" -> "123456789012")."""
+    return _NON_ALNUM.sub("", str(value).upper())
+
+
+def normalize_name(value: Any) -> str:
+    """Uppercase letters with single spaces, for comparing names across documents."""
+    if not value:
+        return ""
+    return " ".join(_NON_ALPHA.sub(" ", str(value).upper()).split())
+
+
+class IdentityIndex:
+    """
+    Thread-safe inverted index: (field, normalized value) -> {document_id: normalized name}.
+    """
+
+    def __init__(self):
+        self._postings: Dict[Tuple[str, str], Dict[str, str]] = defaultdict(dict)
+        self._by_document: Dict[str, List[Tuple[str, str]]] = {}
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._by_document)
+
+    @staticmethod
+    def _keys(fields: Dict[str, Any]) -> List[Tuple[str, str]]:
+        keys = []
+        for field in IDENTITY_FIELDS:
+            value = normalize_identifier(fields.get(field) or "")
+            if value and IDENTITY_VALIDATORS[field](value):
+                keys.append((field, value))
+        return keys
+
+    def add(self, document_id: str, fields: Dict[str, Any]):
+        """Index a document's identifiers (replacing any previous entry)."""
+        keys = self._keys(fields or {})
+        name = normalize_name((fields or {}).get("name"))
+        with self._lock:
+            self.remove(document_id)
+            if not keys:
+                return
+            for key in keys:
+                self._postings[key][document_id] = name
+            self._by_document[document_id] = keys
+
+    def remove(self, document_id: str):
+        with self._lock:
+            for key in self._by_document.pop(document_id, []):
+                postings = self._postings.get(key)
+                if postings is not None:
+                    postings.pop(document_id, None)
+                    if not postings:
+                        del self._postings[key]
+
+    def lookup(self, field: str, value: Any) -> Dict[str, str]:
+        """Documents carrying this identifier, as {document_id: normalized name}."""
+        with self._lock:
+            return dict(self._postings.get((field, normalize_identifier(value)), {}))
+
+    def find_reuse(self, document_id: str, fields: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Identifiers on this document that also appear on other documents.
+
+        Returns one finding per reused identifier with the other document ids
+        and the distinct names they were issued to.
+        """
+        name = normalize_name((fields or {}).get("name"))
+        findings = []
+        with self._lock:
+            for field, value in self._keys(fields or {}):
+                others = {
+                    doc_id: other_name
+                    for doc_id, other_name in self._postings.get((field, value), {}).items()
+                    if doc_id != document_id
+                }
+                if not others:
+                    continue
+                different_names = sorted({n for n in others.values() if n and name and n != name})
+                findings.append({
+                    "field": field,
+                    "label": IDENTITY_FIELDS[field],
+                    "document_ids": sorted(others),
+                    "other_document_count": len(others),
+                    "different_names": different_names
+                })
+        return findings
+
+    def conflicting_identifiers(self, fields: Dict[str, Any], other_id: str) -> List[Dict[str, str]]:
+        """Identifier fields that both documents carry, with different values."""
+        own = dict(self._keys(fields or {}))
+        with self._lock:
+            theirs = dict(self._by_document.get(other_id, []))
+        return [
+            {"field": field, "label": IDENTITY_FIELDS[field]}
+            for field, value in own.items()
+            if field in theirs and theirs[field] != value
+        ]
+
+    def bulk_load(self, items: Iterable[Tuple[str, Dict[str, Any]]]):
+        count = 0
+        for document_id, fields in items:
+            self.add(document_id, fields)
+            count += 1
+        logger.info("Identity index loaded", documents=count)
+
+
+_index: Optional[IdentityIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_identity_index() -> IdentityIndex:
+    """Process-wide identity index."""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = IdentityIndex()
+    return _index
@@ -0,0 +1,78 @@
+"""
+DocVerify AI - Perceptual Hashing
+
+64-bit perceptual hashes that stay stable when the same card is
+re-photographed or re-scanned (scale, JPEG quality, lighting), unlike
+the SHA-256 file hash:
+
+- pHash: sign of the low-frequency 8x8 DCT block against its median
+- dHash: sign of horizontal gradients on a 9x8 thumbnail
+"""
+
+from dataclasses import dataclass
+from typing import Dict
+
+import cv2
+import numpy as np
+
+HASH_BITS = 64
+_BIT_WEIGHTS = 1 << np.arange(HASH_BITS - 1, -1, -1, dtype=np.uint64)
+
+
+def _to_gray(image: np.ndarray) -> np.ndarray:
+    if image.ndim == 3:
+        return cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    return image
+
+
+def _pack_bits(bits: np.ndarray) -> int:
+    """Pack a 64-element boolean array into an int (MSB first)."""
+    return int(np.sum(_BIT_WEIGHTS[bits.ravel()], dtype=np.uint64))
+
+
+def phash(image: np.ndarray) -> int:
+    """DCT-based perceptual hash."""
+    small = cv2.resize(_to_gray(image), (32, 32), interpolation=cv2.INTER_AREA)
+    dct = cv2.dct(small.astype(np.float32))
+    low = dct[:8, :8].ravel()
+    # DC term excluded from the median so overall brightness doesn't matter
+    return _pack_bits(low > np.median(low[1:]))
+
+
+def dhash(image: np.ndarray) -> int:
+    """Difference hash (horizontal gradient signs)."""
+    small = cv2.resize(_to_gray(image), (9, 8), interpolation=cv2.INTER_AREA)
+    return _pack_bits(small[:, 1:] > small[:, :-1])
+
+
+def hamming_distance(a: int, b: int) -> int:
+    return (a ^ b).bit_count()
+
+
+@dataclass(frozen=True)
+class PerceptualHash:
+    """pHash + dHash pair for one document image."""
+    phash: int
+    dhash: int
+
+    def distance(self, other: "PerceptualHash") -> int:
+        """pHash Hamming distance (the indexed hash)."""
+        return hamming_distance(self.phash, other.phash)
+
+    def to_dict(self) -> Dict[str, str]:
+        return {"phash": f"{self.phash:016x}", "dhash": f"{self.dhash:016x}"}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, str]) -> "PerceptualHash":
+        return cls(phash=int(data["phash"], 16), dhash=int(data["dhash"], 16))
+
+
+def compute_perceptual_hash(image: np.ndarray) -> PerceptualHash:
+    """Hash a document image (any size, BGR or grayscale)."""
+    gray = _to_gray(image)
+    # One shared downscale: both hashes only look at a tiny thumbnail
+    h, w = gray.shape[:2]
+    scale = 256 / max(h, w)
+    if scale < 1:
+        gray = cv2.resize(gray, (max(1, int(w * scale)), max(1, int(h * scale))), interpolation=cv2.INTER_AREA)
+    return PerceptualHash(phash=phash(gray), dhash=dhash(gray))
@@ -0,0 +1,282 @@
+"""
+DocVerify AI - Image Tamper Detection
+
+Three complementary, fully vectorized forensic maps computed per tile:
+
+- Error level analysis (ELA): re-save at a fixed JPEG quality; pasted or
+  re-edited regions re-compress differently from the rest of the page.
+- Noise inconsistency: variance of the high-pass residual in flat tiles;
+  content spliced from another photo carries a different sensor noise level.
+- JPEG ghosts: re-save at several qualities; a region previously saved at
+  a different quality reaches its minimum error at a different quality.
+
+Each map is reduced to tile statistics with reshape/mean (no Python loops
+over pixels) and scored by robust z-scores (median / MAD), so a clean page
+scores near 0 whatever its overall compression or noise level.
+Must run on the original upload, not the preprocessed image: resizing
+would erase the JPEG traces, so large pages are re-saved window by window
+at native resolution within TAMPER_TIME_BUDGET_MS.
+"""
+
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+from structlog import get_logger
+
+from src.core.config import get_settings
+
+logger = get_logger()
+settings = get_settings()
+
+TILE = 16
+GHOST_QUALITIES = (60, 75, 90)  # the last one doubles as the ELA re-save quality
+OUTLIER_Z = 4.0
+MIN_GHOST_SPREAD = 4.0  # tiles whose re-save error barely changes carry no ghost evidence
+NOISE_FLOOR = 0.05  # residual variance this small is JPEG rounding on flat colour, not sensor noise
+
+
+@dataclass
+class TamperResult:
+    """Tamper analysis of one page."""
+    tamper_score: float
+    ela_score: float
+    noise_score: float
+    ghost_score: float
+    regions: List[Dict[str, int]] = field(default_factory=list)
+    timed_out: bool = False
+    elapsed_ms: float = 0.0
+
+    @property
+    def is_suspicious(self) -> bool:
+        return self.tamper_score >= settings.TAMPER_THRESHOLD
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "tamper_score": round(self.tamper_score, 4),
+            "ela_score": round(self.ela_score, 4),
+            "noise_score": round(self.noise_score, 4),
+            "ghost_score": round(self.ghost_score, 4),
+            "regions": self.regions,
+            "timed_out": self.timed_out,
+            "elapsed_ms": round(self.elapsed_ms, 1)
+        }
+
+
+def _prepare(image: np.ndarray) -> np.ndarray:
+    """Grayscale page trimmed to whole tiles from the top-left, keeping the 8x8 JPEG grid."""
+    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if image.ndim == 3 else image
+    h, w = gray.shape[:2]
+    return gray[:h // TILE * TILE, :w // TILE * TILE]
+
+
+def _windows(height: int, width: int, max_side: int) -> List[Tuple[slice, slice]]:
+    """Tile-aligned windows of at most max_side px, of near-equal size, covering the page."""
+    def spans(length: int) -> List[slice]:
+        count = -(-length // max_side)
+        step = -(-length // count // TILE) * TILE
+        return [slice(start, min(start + step, length)) for start in range(0, length, step)]
+
+    return [(rows, cols) for rows in spans(height) for cols in spans(width)]
+
+
+def _tile_means(values: np.ndarray) -> np.ndarray:
+    """Mean of each TILE x TILE block of a 2-D array (dimensions are tile multiples)."""
+    h, w = values.shape
+    return values.reshape(h // TILE, TILE, w // TILE, TILE).mean(axis=(1, 3))
+
+
+def _recompress(image: np.ndarray, quality: int) -> np.ndarray:
+    ok, encoded = cv2.imencode(".jpg", image, [cv2.IMWRITE_JPEG_QUALITY, quality])
+    return cv2.imdecode(encoded, cv2.IMREAD_UNCHANGED)
+
+
+def _robust_z(values: np.ndarray, mask: Optional[np.ndarray] = None, min_spread: float = 0.1) -> np.ndarray:
+    """
+    Per-element robust z-score against the (masked) population. The spread
+    is floored so near-constant maps (flat synthetic scans) don't explode.
+    """
+    population = values[mask] if mask is not None else values.ravel()
+    if population.size < 8:
+        return np.zeros_like(values)
+    median = np.median(population)
+    mad = np.median(np.abs(population - median)) * 1.4826
+    return (values - median) / max(mad, min_spread)
+
+
+_CLUSTER_KERNEL = np.ones((2, 2), np.uint8)
+
+
+def _cluster_score(outliers: np.ndarray, considered: int) -> Tuple[float, np.ndarray]:
+    """
+    Keep only outlier tiles that form 2x2 clusters (edits are contiguous;
+    isolated outliers are text edges and sensor noise). The score saturates
+    once clusters cover ~1% of the analysed tiles.
+    """
+    clustered = cv2.morphologyEx(outliers.astype(np.uint8), cv2.MORPH_OPEN, _CLUSTER_KERNEL).astype(bool)
+    if considered == 0:
+        return 0.0, clustered
+    return float(min(1.0, clustered.sum() / considered / 0.01)), clustered
+
+
+def _resave_errors(gray: np.ndarray) -> np.ndarray:
+    """Tile-mean squared error of the page re-saved at each GHOST_QUALITIES level."""
+    gray32 = gray.astype(np.float32)
+    return np.stack([
+        _tile_means((gray32 - _recompress(gray, q).astype(np.float32)) ** 2)
+        for q in GHOST_QUALITIES
+    ])
+
+
+def _windowed_resave_errors(gray: np.ndarray, max_side: int, deadline: float) -> Tuple[np.ndarray, np.ndarray, bool]:
+    """
+    _resave_errors over the whole page, one window at a time (windows start
+    on tile boundaries, so each keeps the page's JPEG grid). Windows not
+    reached by the deadline are left out of the returned analysed-tile mask.
+    """
+    errors = np.zeros((len(GHOST_QUALITIES), gray.shape[0] // TILE, gray.shape[1] // TILE), dtype=np.float32)
+    analysed = np.zeros(errors.shape[1:], dtype=bool)
+    for index, (rows, cols) in enumerate(_windows(gray.shape[0], gray.shape[1], max_side)):
+        # The first window always runs so every page gets some verdict
+        if index and time.perf_counter() > deadline:
+            return errors, analysed, True
+        tile_rows = slice(rows.start // TILE, rows.stop // TILE)
+        tile_cols = slice(cols.start // TILE, cols.stop // TILE)
+        errors[:, tile_rows, tile_cols] = _resave_errors(gray[rows, cols])
+        analysed[tile_rows, tile_cols] = True
+    return errors, analysed, False
+
+
+def _content_energy(gray: np.ndarray) -> np.ndarray:
+    """Tile-mean gradient magnitude (edges/text drive every forensic residual)."""
+    # Smoothed first so added noise doesn't register as content
+    smooth = cv2.GaussianBlur(gray, (5, 5), 0).astype(np.float32)
+    gradient = np.abs(cv2.Sobel(smooth, cv2.CV_32F, 1, 0)) + np.abs(cv2.Sobel(smooth, cv2.CV_32F, 0, 1))
+    return _tile_means(gradient)
+
+
+def error_level_residual(
+    errors: np.ndarray,
+    energy: np.ndarray,
+    analysed: Optional[np.ndarray] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    ELA map with the content explained away: log re-save error regressed on
+    log edge energy across textured tiles, returning each tile's residual
+    and the mask of textured tiles (perfectly flat tiles carry no evidence).
+    Tiles outside `analysed` have no re-save error and are left out.
+    """
+    ela = np.log1p(errors[-1])
+    x = np.log1p(energy)
+    textured = energy > 1.0
+    if analysed is not None:
+        textured &= analysed
+    if textured.sum() < 8 or np.var(x[textured]) < 1e-6:
+        return np.zeros_like(ela), textured
+    xs, ys = x[textured], ela[textured]
+    slope = np.cov(xs, ys, bias=True)[0, 1] / np.var(xs)
+    intercept = ys.mean() - slope * xs.mean()
+    return ela - (slope * x + intercept), textured
+
+
+def noise_level_map(gray: np.ndarray, energy: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Tile log-variance of the high-pass residual, plus a mask of the flattest
+    half of the (unclipped) tiles, where the residual is sensor noise rather
+    than content. The variance is floored at NOISE_FLOOR so flat synthetic
+    backgrounds, whose residual is a few stray JPEG rounding errors, don't
+    read as noise inconsistencies.
+    """
+    gray32 = gray.astype(np.float32)
+    residual = gray32 - cv2.blur(gray32, (3, 3))
+    variance = _tile_means(residual * residual) - _tile_means(residual) ** 2
+    # Clipped highlights/shadows are noiseless on any camera
+    brightness = _tile_means(gray32)
+    unclipped = (brightness > 8) & (brightness < 247)
+    flat_mask = (energy <= np.percentile(energy, 50)) & unclipped
+    return np.log(np.maximum(variance, 0.0) + NOISE_FLOOR), flat_mask
+
+
+def jpeg_ghost_tiles(errors: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Tiles whose re-save error is minimised at a clearly different quality
+    than the page's dominant one, and the mask of tiles with enough signal.
+    """
+    best = errors.argmin(axis=0)
+    informative = (errors.max(axis=0) - errors.min(axis=0)) > MIN_GHOST_SPREAD
+    if not informative.any():
+        return np.zeros_like(informative), informative
+    dominant = np.bincount(best[informative], minlength=len(GHOST_QUALITIES)).argmax()
+    return informative & (np.abs(best - dominant) >= 2), informative
+
+
+def _regions(mask: np.ndarray, limit: int = 5) -> List[Dict[str, int]]:
+    """Bounding boxes (page pixel coordinates) of outlier tile clusters."""
+    if not mask.any():
+        return []
+    count, _, stats, _ = cv2.connectedComponentsWithStats(mask.astype(np.uint8), connectivity=8)
+    order = np.argsort(-stats[1:, cv2.CC_STAT_AREA])[:limit] + 1
+    return [
+        {
+            "x": int(stats[i, cv2.CC_STAT_LEFT] * TILE),
+            "y": int(stats[i, cv2.CC_STAT_TOP] * TILE),
+            "width": int(stats[i, cv2.CC_STAT_WIDTH] * TILE),
+            "height": int(stats[i, cv2.CC_STAT_HEIGHT] * TILE)
+        }
+        for i in order
+    ]
+
+
+def detect_tampering(
+    image: np.ndarray,
+    max_side: Optional[int] = None,
+    time_budget_ms: Optional[float] = None
+) -> TamperResult:
+    """
+    Score a page image for local manipulation.
+
+    Args:
+        image: Original (not preprocessed) BGR or grayscale page
+        max_side: Largest window re-saved at once (default: TAMPER_MAX_SIDE)
+        time_budget_ms: Wall-clock budget for the re-saves (default: TAMPER_TIME_BUDGET_MS)
+    """
+    start = time.perf_counter()
+    deadline = start + (time_budget_ms or settings.TAMPER_TIME_BUDGET_MS) / 1000
+    gray = _prepare(image)
+    if gray.shape[0] < TILE * 8 or gray.shape[1] < TILE * 8:
+        return TamperResult(0.0, 0.0, 0.0, 0.0)
+    errors, analysed, timed_out = _windowed_resave_errors(gray, max_side or settings.TAMPER_MAX_SIDE, deadline)
+    energy = _content_energy(gray)
+
+    # 1. ELA: tiles whose re-save error is unexplained by their content
+    ela_residual, textured = error_level_residual(errors, energy, analysed)
+    ela_outliers = (np.abs(_robust_z(ela_residual, textured, min_spread=0.25)) > OUTLIER_Z) & textured
+    ela_score, ela_clusters = _cluster_score(ela_outliers, int(textured.sum()))
+
+    # 2. Noise inconsistency, judged on flat tiles only
+    log_variance, flat_mask = noise_level_map(gray, energy)
+    noise_outliers = (np.abs(_robust_z(log_variance, flat_mask, min_spread=0.5)) > OUTLIER_Z) & flat_mask
+    noise_score, noise_clusters = _cluster_score(noise_outliers, int(flat_mask.sum()))
+
+    # 3. JPEG ghosts
+    ghost_tiles, informative = jpeg_ghost_tiles(errors)
+    ghost_score, ghost_clusters = _cluster_score(ghost_tiles, int(informative.sum()))
+
+    # Noisy-OR: one saturated map alone reaches 0.6, agreement pushes towards 1
+    tamper_score = 1.0 - float(np.prod([1.0 - 0.6 * score for score in (ela_score, noise_score, ghost_score)]))
+
+    suspicious = (ela_clusters.astype(np.uint8) + noise_clusters + ghost_clusters) >= 1
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    result = TamperResult(
+        tamper_score=min(1.0, tamper_score),
+        ela_score=ela_score,
+        noise_score=noise_score,
+        ghost_score=ghost_score,
+        regions=_regions(suspicious),
+        timed_out=timed_out,
+        elapsed_ms=elapsed_ms
+    )
+    logger.info("Tamper analysis complete", **{k: v for k, v in result.to_dict().items() if k != "regions"})
+    return result
@@ -0,0 +1,417 @@
+"""
+DocVerify AI - Local Vector Index
+
+Approximate nearest-neighbour search over document embeddings without a
+live vector database. Uses hnswlib (HNSW graph, ~log N queries) when
+installed, otherwise an exact NumPy brute-force matrix product, which is
+fine up to a few hundred thousand documents.
+
+Vectors are unit length, so similarity is the dot product. The index is
+persisted under EMBEDDING_INDEX_DIR every EMBEDDING_INDEX_SAVE_EVERY
+inserts and on shutdown.
+
+Each pre-fork worker (DOCVERIFY_WORKER_ID, set by src.api.serve) writes
+its own shard of the directory and never overwrites another's. On load a
+worker merges every shard, and while serving it re-merges shards other
+workers have saved since (checked every SHARD_REFRESH_SECONDS), so a
+document indexed by one worker becomes visible to the others after that
+worker's next snapshot. Deletions are kept as tombstones in the shard
+metadata so a merge doesn't bring them back.
+
+Snapshots and merges run on a background maintenance thread, never in
+add() or search(): disk I/O happens outside the index lock, which is
+held only to copy the in-memory state or apply a merged delta.
+"""
+
+import copy
+import glob
+import json
+import os
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from structlog import get_logger
+
+from src.core.config import get_settings
+
+try:
+    import hnswlib
+    HAS_HNSWLIB = True
+except ImportError:
+    HAS_HNSWLIB = False
+
+logger = get_logger()
+settings = get_settings()
+
+# Interval between checks for shards saved by other workers
+SHARD_REFRESH_SECONDS = 5.0
+
+
+def worker_id() -> str:
+    """This process's shard name (pre-fork worker index; "0" when not forked)."""
+    return os.environ.get("DOCVERIFY_WORKER_ID", "0")
+
+
+class _NumpyBackend:
+    """Exact search over a growable float32 matrix."""
+
+    name = "numpy"
+    suffix = ".npz"
+
+    def __init__(self, dim: int, capacity: int = 1024):
+        self.dim = dim
+        self._vectors = np.zeros((capacity, dim), dtype=np.float32)
+        self._active = np.zeros(capacity, dtype=bool)
+
+    def _ensure_capacity(self, label: int):
+        if label < len(self._vectors):
+            return
+        capacity = max(label + 1, len(self._vectors) * 2)
+        vectors = np.zeros((capacity, self.dim), dtype=np.float32)
+        active = np.zeros(capacity, dtype=bool)
+        vectors[:len(self._vectors)] = self._vectors
+        active[:len(self._active)] = self._active
+        self._vectors, self._active = vectors, active
+
+    def add(self, label: int, vector: np.ndarray):
+        self._ensure_capacity(label)
+        self._vectors[label] = vector
+        self._active[label] = True
+
+    def remove(self, label: int):
+        if label < len(self._active):
+            self._active[label] = False
+
+    def get(self, label: int) -> np.ndarray:
+        return self._vectors[label].copy()
+
+    def snapshot(self) -> "_NumpyBackend":
+        """Copy detached from further updates, to be written out without the index lock."""
+        snapshot = _NumpyBackend.__new__(_NumpyBackend)
+        snapshot.dim, snapshot._vectors, snapshot._active = self.dim, self._vectors.copy(), self._active.copy()
+        return snapshot
+
+    def search(self, vector: np.ndarray, k: int) -> List[Tuple[int, float]]:
+        scores = self._vectors @ vector
+        scores[~self._active] = -np.inf
+        k = min(k, int(self._active.sum()))
+        if k == 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(int(label), float(scores[label])) for label in top]
+
+    def save(self, path: str):
+        np.savez(path + ".npz", vectors=self._vectors, active=self._active)
+
+    def load(self, path: str):
+        data = np.load(path + ".npz")
+        self._vectors, self._active = data["vectors"], data["active"]
+
+    @staticmethod
+    def read(path: str, dim: int, labels: List[int]) -> np.ndarray:
+        """Vectors for `labels` from a saved shard, without loading it as the live index."""
+        return np.load(path + ".npz")["vectors"][labels]
+
+
+class _HnswBackend:
+    """hnswlib HNSW graph (approximate, sub-millisecond at millions of vectors)."""
+
+    name = "hnswlib"
+    suffix = ".hnsw"
+
+    def __init__(self, dim: int, capacity: int = 1024):
+        self.dim = dim
+        self._index = hnswlib.Index(space="ip", dim=dim)
+        self._index.init_index(max_elements=capacity, ef_construction=200, M=16)
+        self._index.set_ef(64)
+        self._deleted = set()
+
+    def add(self, label: int, vector: np.ndarray):
+        if label in self._deleted:
+            self._index.unmark_deleted(label)
+            self._deleted.discard(label)
+        if self._index.get_current_count() >= self._index.get_max_elements():
+            self._index.resize_index(self._index.get_max_elements() * 2)
+        # Re-adding an existing label updates its vector in place
+        self._index.add_items(vector[np.newaxis, :], np.array([label]))
+
+    def remove(self, label: int):
+        if label not in self._deleted:
+            self._index.mark_deleted(label)
+            self._deleted.add(label)
+
+    def get(self, label: int) -> np.ndarray:
+        return np.asarray(self._index.get_items([label]), dtype=np.float32)[0]
+
+    def snapshot(self) -> "_HnswBackend":
+        """Copy detached from further updates, to be written out without the index lock."""
+        snapshot = _HnswBackend.__new__(_HnswBackend)
+        snapshot.dim, snapshot._index, snapshot._deleted = self.dim, copy.copy(self._index), set(self._deleted)
+        return snapshot
+
+    def search(self, vector: np.ndarray, k: int) -> List[Tuple[int, float]]:
+        k = min(k, self._index.get_current_count() - len(self._deleted))
+        if k <= 0:
+            return []
+        labels, distances = self._index.knn_query(vector[np.newaxis, :], k=k)
+        # "ip" space reports 1 - dot product
+        return [(int(label), 1.0 - float(distance)) for label, distance in zip(labels[0], distances[0])]
+
+    def save(self, path: str):
+        self._index.save_index(path + ".hnsw")
+
+    def load(self, path: str, active_labels: set):
+        self._index = hnswlib.Index(space="ip", dim=self.dim)
+        self._index.load_index(path + ".hnsw")
+        self._index.set_ef(64)
+        self._deleted = set(self._index.get_ids_list()) - active_labels
+
+    @staticmethod
+    def read(path: str, dim: int, labels: List[int]) -> np.ndarray:
+        """Vectors for `labels` from a saved shard, without loading it as the live index."""
+        index = hnswlib.Index(space="ip", dim=dim)
+        index.load_index(path + ".hnsw")
+        return np.asarray(index.get_items(labels), dtype=np.float32)
+
+
+class VectorIndex:
+    """
+    Document-id keyed vector index with incremental insert and disk persistence.
+    """
+
+    def __init__(self, dim: int, directory: Optional[str] = None, backend: Optional[str] = None):
+        self.dim = dim
+        self.directory = directory
+        backend = backend or settings.EMBEDDING_INDEX_BACKEND
+        use_hnsw = backend == "hnswlib" or (backend == "auto" and HAS_HNSWLIB)
+        self._backend = _HnswBackend(dim) if use_hnsw else _NumpyBackend(dim)
+        self._labels: Dict[str, int] = {}
+        self._ids: Dict[int, str] = {}
+        self._next_label = 0
+        self._unsaved = 0
+        # Deleted document ids, persisted so merging other shards can't resurrect them
+        self._removed: set = set()
+        # Other workers' shard -> metadata mtime at its last merge
+        self._merged: Dict[str, float] = {}
+        self._lock = threading.RLock()
+        # Serialises snapshot writes (maintenance thread vs. shutdown)
+        self._save_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closed = False
+        self._maintenance: Optional[threading.Thread] = None
+        if directory:
+            self._load()
+            self._merge_shards()
+            self._maintenance = threading.Thread(target=self._maintain, name="vector-index-maintenance", daemon=True)
+            self._maintenance.start()
+
+    @property
+    def backend_name(self) -> str:
+        return self._backend.name
+
+    def __len__(self) -> int:
+        return len(self._labels)
+
+    def __contains__(self, document_id: str) -> bool:
+        return document_id in self._labels
+
+    def get(self, document_id: str) -> Optional[np.ndarray]:
+        """Stored vector of a document, or None."""
+        with self._lock:
+            label = self._labels.get(document_id)
+            return None if label is None else self._backend.get(label)
+
+    def _put(self, document_id: str, vector: np.ndarray):
+        label = self._labels.get(document_id)
+        if label is None:
+            label = self._next_label
+            self._next_label += 1
+            self._labels[document_id] = label
+            self._ids[label] = document_id
+        self._backend.add(label, vector)
+
+    def add(self, document_id: str, vector: np.ndarray):
+        """Insert or replace a document's vector."""
+        vector = np.asarray(vector, dtype=np.float32)
+        if vector.shape != (self.dim,):
+            raise ValueError(f"Expected a vector of dimension {self.dim}, got {vector.shape}")
+        with self._lock:
+            self._removed.discard(document_id)
+            self._put(document_id, vector)
+            self._unsaved += 1
+            if self.directory and self._unsaved >= settings.EMBEDDING_INDEX_SAVE_EVERY:
+                # The maintenance thread writes the snapshot; inserts never wait on disk
+                self._wake.set()
+
+    def _drop(self, document_id: str):
+        label = self._labels.pop(document_id, None)
+        if label is not None:
+            del self._ids[label]
+            self._backend.remove(label)
+
+    def remove(self, document_id: str):
+        with self._lock:
+            self._drop(document_id)
+            self._removed.add(document_id)
+            self._unsaved += 1
+
+    def search(self, vector: np.ndarray, k: int = 5, exclude: Optional[str] = None) -> List[Tuple[str, float]]:
+        """Nearest documents as (document_id, cosine similarity), most similar first."""
+        vector = np.asarray(vector, dtype=np.float32)
+        with self._lock:
+            hits = self._backend.search(vector, k + (1 if exclude else 0))
+            results = [(self._ids[label], score) for label, score in hits if label in self._ids]
+        return [(doc_id, score) for doc_id, score in results if doc_id != exclude][:k]
+
+    # --- Persistence ---
+
+    def _base_path(self) -> str:
+        return os.path.join(self.directory, f"index.{self._backend.name}.{worker_id()}")
+
+    def save(self):
+        """Write this worker's shard. Only copying the in-memory state holds the index lock."""
+        if not self.directory:
+            return
+        with self._save_lock:
+            with self._lock:
+                snapshot = self._backend.snapshot()
+                meta = {
+                    "dim": self.dim,
+                    "backend": self._backend.name,
+                    "next_label": self._next_label,
+                    "labels": dict(self._labels),
+                    "removed": sorted(self._removed)
+                }
+                saved = self._unsaved
+            os.makedirs(self.directory, exist_ok=True)
+            base = self._base_path()
+            # Write-then-rename, so other workers merging this shard never read a partial file
+            snapshot.save(base + ".tmp")
+            os.replace(base + ".tmp" + snapshot.suffix, base + snapshot.suffix)
+            tmp_path = base + ".json.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(meta, f)
+            os.replace(tmp_path, base + ".json")
+            with self._lock:
+                # Changes made while writing count towards the next snapshot
+                self._unsaved -= saved
+        logger.info("Vector index saved", documents=len(meta["labels"]), backend=snapshot.name)
+
+    def _maintain(self):
+        """Maintenance thread: snapshot once enough changes pile up, pick up other workers' shards."""
+        while True:
+            self._wake.wait(SHARD_REFRESH_SECONDS)
+            self._wake.clear()
+            if self._closed:
+                return
+            try:
+                if self._unsaved >= settings.EMBEDDING_INDEX_SAVE_EVERY:
+                    self.save()
+                self._merge_shards()
+            except Exception as e:
+                logger.warning("Vector index maintenance failed", error=str(e))
+
+    def close(self):
+        """Stop the maintenance thread and write a final snapshot."""
+        self._closed = True
+        self._wake.set()
+        if self._maintenance is not None:
+            self._maintenance.join()
+            self._maintenance = None
+        self.save()
+
+    def _load(self):
+        base = self._base_path()
+        if not os.path.exists(base + ".json"):
+            return
+        try:
+            with open(base + ".json") as f:
+                meta = json.load(f)
+            if meta["dim"] != self.dim:
+                logger.warning("Vector index dimension changed, starting empty", stored=meta["dim"], dim=self.dim)
+                return
+            labels = {doc_id: int(label) for doc_id, label in meta["labels"].items()}
+            if isinstance(self._backend, _HnswBackend):
+                self._backend.load(base, set(labels.values()))
+            else:
+                self._backend.load(base)
+            self._labels = labels
+            self._ids = {label: doc_id for doc_id, label in labels.items()}
+            self._next_label = meta["next_label"]
+            self._removed = set(meta.get("removed", []))
+            logger.info("Vector index loaded", documents=len(labels), backend=self._backend.name)
+        except Exception as e:
+            logger.warning("Failed to load vector index, starting empty", error=str(e))
+
+    def _other_shards(self) -> Dict[str, float]:
+        """Other workers' shard base paths with their metadata mtimes."""
+        own = self._base_path()
+        shards = {}
+        for meta_path in glob.glob(os.path.join(self.directory, f"index.{self._backend.name}*.json")):
+            base = meta_path[:-len(".json")]
+            if base != own:
+                try:
+                    shards[base] = os.path.getmtime(meta_path)
+                except OSError:
+                    continue
+        return shards
+
+    def _merge_shards(self):
+        """
+        Merge documents and deletions from shards saved by other workers since
+        the last merge. Shard files are read without the index lock; it is
+        held only while the delta is applied.
+        """
+        for base, mtime in self._other_shards().items():
+            if self._merged.get(base) == mtime:
+                continue
+            try:
+                with open(base + ".json") as f:
+                    meta = json.load(f)
+                if meta["dim"] != self.dim:
+                    continue
+                removed = meta.get("removed", [])
+                with self._lock:
+                    new = [
+                        (document_id, int(label)) for document_id, label in meta["labels"].items()
+                        if document_id not in self._labels and document_id not in self._removed
+                    ]
+                vectors = type(self._backend).read(base, self.dim, [label for _, label in new]) if new else []
+                added = 0
+                with self._lock:
+                    for document_id in removed:
+                        self._drop(document_id)
+                        self._removed.add(document_id)
+                    for (document_id, _), vector in zip(new, vectors):
+                        # Added or deleted here while the shard was being read
+                        if document_id in self._labels or document_id in self._removed:
+                            continue
+                        self._put(document_id, vector)
+                        added += 1
+                self._merged[base] = mtime
+                logger.info("Merged vector index shard", shard=os.path.basename(base), documents=added)
+            except Exception as e:
+                logger.warning("Failed to merge vector index shard", shard=os.path.basename(base), error=str(e))
+
+
+_index: Optional[VectorIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_vector_index() -> VectorIndex:
+    """Process-wide document embedding index (loaded from EMBEDDING_INDEX_DIR)."""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                from src.fraud.embeddings import get_embedder
+                _index = VectorIndex(dim=get_embedder().dim, directory=settings.EMBEDDING_INDEX_DIR)
+    return _index
+
+
+def save_vector_index():
+    """Persist the process-wide index if it was ever loaded (called on shutdown)."""
+    if _index is not None:
+        _index.close()
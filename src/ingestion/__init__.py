@@ -0,0 +1,24 @@
+"""
+DocVerify AI - Ingestion Module
+
+Turns uploaded files (images, PDFs, multi-page TIFFs) into a lazy stream of pages.
+"""
+
+from src.ingestion.page import DocumentPage, PageLimitError
+from src.ingestion.pdf import PDFDocument, is_pdf
+from src.ingestion.tiff import TIFFDocument, is_tiff
+from src.ingestion.text_layer import TextLayerQuality, assess_text_layer, is_usable_text_layer
+from src.ingestion.loader import iter_document_pages
+
+__all__ = [
+    "DocumentPage",
+    "PageLimitError",
+    "PDFDocument",
+    "is_pdf",
+    "TIFFDocument",
+    "is_tiff",
+    "TextLayerQuality",
+    "assess_text_layer",
+    "is_usable_text_layer",
+    "iter_document_pages"
+]
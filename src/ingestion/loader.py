@@ -0,0 +1,47 @@
+"""
+DocVerify AI - Document Loader
+
+Single entry point that turns an uploaded file into a stream of pages,
+whatever its format.
+"""
+
+from typing import Iterator, Optional
+
+import cv2
+from structlog import get_logger
+
+from src.ingestion.page import DocumentPage
+from src.ingestion.pdf import PDFDocument, is_pdf
+from src.ingestion.tiff import TIFFDocument, is_tiff
+
+logger = get_logger()
+
+
+def iter_document_pages(
+    path: str,
+    use_text_layer: bool = True,
+    password: Optional[str] = None
+) -> Iterator[DocumentPage]:
+    """
+    Stream the pages of a document file.
+
+    Args:
+        path: Path to an image, PDF or (multi-page) TIFF
+        use_text_layer: Yield embedded PDF text instead of rendering when present
+        password: Password for encrypted PDFs
+    """
+    if is_pdf(path):
+        with PDFDocument(path, password=password) as pdf:
+            yield from pdf.iter_pages(use_text_layer=use_text_layer)
+        return
+
+    if is_tiff(path):
+        with TIFFDocument(path) as tiff:
+            yield from tiff.iter_pages()
+        return
+
+    logger.info("Loading image", path=path)
+    image = cv2.imread(path)
+    if image is None:
+        raise ValueError(f"Could not load image at {path}")
+    yield DocumentPage(index=0, image=image, source="image")
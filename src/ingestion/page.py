@@ -0,0 +1,35 @@
+"""
+DocVerify AI - Ingested Page Model
+"""
+
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+
+class PageLimitError(ValueError):
+    """A document has more pages than the configured limit."""
+
+    def __init__(self, path: str, page_count: int, max_pages: int):
+        super().__init__(f"Document has {page_count} pages; at most {max_pages} are accepted")
+        self.path = path
+        self.page_count = page_count
+        self.max_pages = max_pages
+
+
+@dataclass
+class DocumentPage:
+    """
+    One page of an uploaded document, as streamed into the pipeline.
+
+    Exactly one of `image` (needs OCR) or `text` (embedded text layer) is set.
+    """
+    index: int
+    image: Optional[np.ndarray] = None
+    text: Optional[str] = None
+    source: str = "image"  # image | pdf_raster | pdf_text | tiff_frame
+
+    @property
+    def has_text_layer(self) -> bool:
+        return self.text is not None
@@ -0,0 +1,203 @@
+"""
+DocVerify AI - PDF Ingestion
+
+Lazily rasterizes PDF pages one at a time and exposes the embedded text
+layer, so pages with real text never need to be rendered or OCR'd.
+
+Backends (first available wins): pypdfium2, PyMuPDF.
+"""
+
+from collections import OrderedDict
+from typing import Iterator, Optional
+
+import cv2
+import numpy as np
+from structlog import get_logger
+
+from src.core.config import get_settings
+from src.core.metrics import record_cache
+from src.ingestion.page import DocumentPage, PageLimitError
+from src.ingestion.text_layer import assess_text_layer
+
+logger = get_logger()
+settings = get_settings()
+
+PDF_MAGIC = b"%PDF"
+
+
+def is_pdf(path: str) -> bool:
+    """Check the file signature rather than trusting the extension."""
+    try:
+        with open(path, "rb") as f:
+            return f.read(len(PDF_MAGIC)) == PDF_MAGIC
+    except OSError:
+        return False
+
+
+class _PdfiumBackend:
+    """pypdfium2 backend (Apache-2.0/BSD, no system dependencies)."""
+
+    name = "pypdfium2"
+
+    def __init__(self, path: str, password: Optional[str] = None):
+        import pypdfium2 as pdfium
+        self._pdf = pdfium.PdfDocument(path, password=password)
+
+    @property
+    def page_count(self) -> int:
+        return len(self._pdf)
+
+    def get_text(self, index: int) -> str:
+        page = self._pdf[index]
+        textpage = page.get_textpage()
+        try:
+            return textpage.get_text_range()
+        finally:
+            textpage.close()
+            page.close()
+
+    def render(self, index: int, dpi: int) -> np.ndarray:
+        page = self._pdf[index]
+        bitmap = page.render(scale=dpi / 72.0)
+        try:
+            # pdfium renders BGR(x) by default, which is OpenCV's native order.
+            # Copy so the array owns its memory once the bitmap is closed.
+            image = bitmap.to_numpy().copy()
+        finally:
+            bitmap.close()
+            page.close()
+        if image.ndim == 3 and image.shape[2] == 4:
+            image = cv2.cvtColor(image, cv2.COLOR_BGRA2BGR)
+        return image
+
+    def close(self):
+        self._pdf.close()
+
+
+class _PyMuPDFBackend:
+    """PyMuPDF backend (already installed alongside PaddleOCR)."""
+
+    name = "pymupdf"
+
+    def __init__(self, path: str, password: Optional[str] = None):
+        import fitz
+        self._doc = fitz.open(path)
+        if self._doc.needs_pass and not self._doc.authenticate(password or ""):
+            self._doc.close()
+            raise ValueError("PDF is password protected")
+
+    @property
+    def page_count(self) -> int:
+        return self._doc.page_count
+
+    def get_text(self, index: int) -> str:
+        return self._doc.load_page(index).get_text("text")
+
+    def render(self, index: int, dpi: int) -> np.ndarray:
+        pixmap = self._doc.load_page(index).get_pixmap(dpi=dpi, alpha=False)
+        image = np.frombuffer(pixmap.samples, dtype=np.uint8).reshape(pixmap.height, pixmap.width, pixmap.n)
+        if pixmap.n == 1:
+            return cv2.cvtColor(image, cv2.COLOR_GRAY2BGR)
+        return cv2.cvtColor(image, cv2.COLOR_RGB2BGR)
+
+    def close(self):
+        self._doc.close()
+
+
+def _open_backend(path: str, password: Optional[str] = None):
+    errors = []
+    for backend_class in (_PdfiumBackend, _PyMuPDFBackend):
+        try:
+            return backend_class(path, password=password)
+        except ImportError as e:
+            errors.append(str(e))
+    raise RuntimeError(f"No PDF backend available (install pypdfium2): {'; '.join(errors)}")
+
+
+class PDFDocument:
+    """
+    Lazily rendered PDF.
+
+    Pages are rasterized on demand at `dpi`; at most `max_rendered_pages`
+    rendered pages are kept (LRU), so memory stays flat for long PDFs.
+    PDFs longer than `max_pages` are rejected with PageLimitError rather
+    than verified from their first pages only.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        dpi: Optional[int] = None,
+        max_rendered_pages: Optional[int] = None,
+        max_pages: Optional[int] = None,
+        password: Optional[str] = None
+    ):
+        self.path = path
+        self.dpi = dpi or settings.PDF_RENDER_DPI
+        self.max_rendered_pages = max(1, max_rendered_pages or settings.PDF_MAX_RENDERED_PAGES)
+        self.max_pages = max_pages or settings.PDF_MAX_PAGES
+        self._backend = _open_backend(path, password=password)
+        self._rendered: "OrderedDict[int, np.ndarray]" = OrderedDict()
+        total_pages = self._backend.page_count
+        if total_pages > self.max_pages:
+            self._backend.close()
+            raise PageLimitError(path, total_pages, self.max_pages)
+        logger.info(
+            "Opened PDF",
+            path=path,
+            backend=self._backend.name,
+            pages=self._backend.page_count,
+            dpi=self.dpi
+        )
+
+    @property
+    def page_count(self) -> int:
+        return self._backend.page_count
+
+    def extract_text(self, index: int) -> str:
+        """Embedded text layer of a page ("" for scanned pages)."""
+        try:
+            return self._backend.get_text(index) or ""
+        except Exception as e:
+            logger.warning("PDF text extraction failed", page=index, error=str(e))
+            return ""
+
+    def render(self, index: int) -> np.ndarray:
+        """Rasterize a page to a BGR array (cached, LRU-bounded)."""
+        image = self._rendered.get(index)
+        record_cache("pdf_render", image is not None)
+        if image is not None:
+            self._rendered.move_to_end(index)
+            return image
+
+        image = self._backend.render(index, self.dpi)
+        self._rendered[index] = image
+        while len(self._rendered) > self.max_rendered_pages:
+            self._rendered.popitem(last=False)
+        return image
+
+    def iter_pages(self, use_text_layer: bool = True) -> Iterator[DocumentPage]:
+        """
+        Stream pages. A page with a usable embedded text layer is yielded as
+        text and never rendered; other pages are rendered just before being yielded.
+        """
+        for index in range(self.page_count):
+            if use_text_layer:
+                text = self.extract_text(index)
+                quality = assess_text_layer(text)
+                if quality.usable:
+                    yield DocumentPage(index=index, text=text, source="pdf_text")
+                    continue
+                if quality.char_count:
+                    logger.info("Ignoring unusable PDF text layer", page=index, reason=quality.reason)
+            yield DocumentPage(index=index, image=self.render(index), source="pdf_raster")
+
+    def close(self):
+        self._rendered.clear()
+        self._backend.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
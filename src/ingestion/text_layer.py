@@ -0,0 +1,70 @@
+"""
+DocVerify AI - PDF Text Layer Quality
+
+Decides whether a PDF page's embedded text can be trusted in place of OCR.
+Scanned PDFs often carry an empty layer, an invisible OCR layer full of
+junk, or glyphs without a Unicode mapping (pdfminer/pdfium emit "(cid:NN)"
+or U+FFFD for those); such pages must still be rendered and OCR'd.
+"""
+
+import re
+import unicodedata
+from dataclasses import dataclass
+from typing import Optional
+
+from src.core.config import get_settings
+
+settings = get_settings()
+
+_CID_PATTERN = re.compile(r"\(cid:\d+\)")
+_REPLACEMENT_CHARS = {"�", "\x00"}
+
+
+def _is_word_char(c: str) -> bool:
+    # Letters, digits and combining marks (Devanagari/Tamil/Telugu vowel signs)
+    return unicodedata.category(c)[0] in ("L", "N", "M")
+
+
+@dataclass
+class TextLayerQuality:
+    """Result of a text-layer usability check."""
+    usable: bool
+    char_count: int
+    alnum_ratio: float
+    junk_ratio: float
+    reason: str = ""
+
+
+def assess_text_layer(text: str, min_chars: Optional[int] = None, min_alnum_ratio: float = 0.5) -> TextLayerQuality:
+    """
+    Score an embedded text layer.
+
+    Args:
+        text: Text extracted from the PDF page
+        min_chars: Minimum non-whitespace characters (default: PDF_MIN_TEXT_CHARS)
+        min_alnum_ratio: Minimum share of letters/digits/marks among non-whitespace chars
+    """
+    min_chars = settings.PDF_MIN_TEXT_CHARS if min_chars is None else min_chars
+    cid_count = len(_CID_PATTERN.findall(text))
+    cleaned = _CID_PATTERN.sub("", text)
+    chars = [c for c in cleaned if not c.isspace()]
+    char_count = len(chars)
+
+    if char_count < min_chars:
+        return TextLayerQuality(False, char_count, 0.0, 0.0, reason="too_short")
+
+    alnum = sum(1 for c in chars if _is_word_char(c))
+    junk = cid_count + sum(1 for c in chars if c in _REPLACEMENT_CHARS or not c.isprintable())
+    alnum_ratio = alnum / char_count
+    junk_ratio = junk / (char_count + cid_count)
+
+    if junk_ratio > 0.1:
+        return TextLayerQuality(False, char_count, alnum_ratio, junk_ratio, reason="unmapped_glyphs")
+    if alnum_ratio < min_alnum_ratio:
+        return TextLayerQuality(False, char_count, alnum_ratio, junk_ratio, reason="low_alnum_ratio")
+    return TextLayerQuality(True, char_count, alnum_ratio, junk_ratio)
+
+
+def is_usable_text_layer(text: str, min_chars: Optional[int] = None) -> bool:
+    """Whether the embedded text is good enough to skip OCR."""
+    return assess_text_layer(text, min_chars=min_chars).usable
@@ -0,0 +1,82 @@
+"""
+DocVerify AI - Multi-page TIFF Ingestion
+
+Scanner batches arrive as multi-page TIFFs, which cv2.imread reads as a
+single frame. Frames are decoded one at a time with Pillow (seek-based,
+so only the current frame is held in memory).
+"""
+
+from typing import Iterator, Optional
+
+import cv2
+import numpy as np
+from structlog import get_logger
+
+from src.core.config import get_settings
+from src.ingestion.page import DocumentPage, PageLimitError
+
+logger = get_logger()
+settings = get_settings()
+
+TIFF_MAGIC = (b"II*\x00", b"MM\x00*", b"II+\x00", b"MM\x00+")  # classic + BigTIFF
+
+
+def is_tiff(path: str) -> bool:
+    """Check the file signature rather than trusting the extension."""
+    try:
+        with open(path, "rb") as f:
+            return f.read(4) in TIFF_MAGIC
+    except OSError:
+        return False
+
+
+def _frame_to_bgr(frame) -> np.ndarray:
+    """Convert a Pillow frame (any mode: 1, L, RGB, CMYK, I;16...) to BGR uint8."""
+    if frame.mode not in ("L", "RGB"):
+        frame = frame.convert("RGB")
+    image = np.asarray(frame)
+    if image.ndim == 2:
+        return cv2.cvtColor(image, cv2.COLOR_GRAY2BGR)
+    return cv2.cvtColor(image, cv2.COLOR_RGB2BGR)
+
+
+class TIFFDocument:
+    """
+    Frame-by-frame reader for (multi-page) TIFF files.
+    Files with more than `max_pages` frames are rejected with PageLimitError.
+    """
+
+    def __init__(self, path: str, max_pages: Optional[int] = None):
+        from PIL import Image
+
+        self.path = path
+        self.max_pages = max_pages or settings.TIFF_MAX_PAGES
+        self._image = Image.open(path)
+        frames = getattr(self._image, "n_frames", 1)
+        if frames > self.max_pages:
+            self._image.close()
+            raise PageLimitError(path, frames, self.max_pages)
+        logger.info("Opened TIFF", path=path, frames=frames)
+
+    @property
+    def page_count(self) -> int:
+        return getattr(self._image, "n_frames", 1)
+
+    def render(self, index: int) -> np.ndarray:
+        """Decode a single frame to a BGR array."""
+        self._image.seek(index)
+        return _frame_to_bgr(self._image)
+
+    def iter_pages(self) -> Iterator[DocumentPage]:
+        """Stream frames; each is decoded just before being yielded."""
+        for index in range(self.page_count):
+            yield DocumentPage(index=index, image=self.render(index), source="tiff_frame")
+
+    def close(self):
+        self._image.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -26,6 +26,7 @@ mcp = FastMCP(
 )
 
 # --- Lazy Loading of Heavy Modules ---
+# Models come from the shared registry, so an in-process API/agents reuse the same loads
 _processor = None
 _ocr_engine = None
 _classifier = None
@@ -45,8 +46,8 @@ def get_preprocessor():
 def get_ocr_engine():
     global _ocr_engine
     if _ocr_engine is None:
-        from src.ocr.paddle_engine import PaddleOCREngine
-        _ocr_engine = PaddleOCREngine()
+        from src.ocr.router import acquire_engine
+        _ocr_engine = acquire_engine("paddleocr", "en")
     return _ocr_engine
 
 
@@ -54,7 +55,8 @@ def get_classifier():
     global _classifier
     if _classifier is None:
         from src.classification.engine import DocumentClassifier
-        _classifier = DocumentClassifier()
+        from src.core.model_registry import get_model_registry
+        _classifier = get_model_registry().acquire(("classifier",), DocumentClassifier)
     return _classifier
 
 
@@ -62,7 +64,8 @@ def get_extractor():
     global _extractor
     if _extractor is None:
         from src.extraction.engine import ExtractionEngine
-        _extractor = ExtractionEngine()
+        from src.core.model_registry import get_model_registry
+        _extractor = get_model_registry().acquire(("extractor",), ExtractionEngine)
     return _extractor
 
 
@@ -70,7 +73,8 @@ def get_validator():
     global _validator
     if _validator is None:
         from src.validation.engine import ValidationEngine
-        _validator = ValidationEngine()
+        from src.core.model_registry import get_model_registry
+        _validator = get_model_registry().acquire(("validator",), ValidationEngine)
     return _validator
 
 
@@ -155,7 +159,8 @@ async def docverify_ocr_extract(
 
         # Run OCR
         ocr = get_ocr_engine()
-        text = ocr.extract(image)
+        page = ocr.extract_page(image)
+        text = page.text
 
         result = {
             "status": "success",
@@ -163,7 +168,9 @@ async def docverify_ocr_extract(
             "language_hint": language_hint.value if language_hint else "auto",
             "preprocessed": preprocess,
             "char_count": len(text),
-            "word_count": len(text.split())
+            "word_count": len(text.split()),
+            "confidence": page.mean_confidence,
+            "layout": page.to_dict()
         }
 
         if response_format == ResponseFormat.markdown:
@@ -331,8 +338,9 @@ async def docverify_check_fraud(
     """
     Perform fraud detection checks on a document.
 
-    Checks for duplicate documents using embedding similarity,
-    layout consistency, and basic tamper detection indicators.
+    Checks for near-duplicate images via perceptual hashing, similar
+    content via a local embedding index, image tampering (error level, noise
+    and JPEG ghost analysis), cloned regions, and suspicious text patterns.
 
     Args:
         document_id: Optional document ID for database lookup
@@ -366,21 +374,80 @@ async def docverify_check_fraud(
                     })
                     risk_score += 0.15
 
-        # Image-based checks (placeholder for future CV models)
-        if image_base64 and check_tampering:
-            findings.append({
-                "type": "visual_analysis",
-                "severity": "info",
-                "description": "Visual tamper detection not yet implemented"
-            })
-
-        # Duplicate check (placeholder for embedding similarity)
-        if check_duplicates:
-            findings.append({
-                "type": "duplicate_check",
-                "severity": "info",
-                "description": "Embedding-based duplicate detection requires database integration"
-            })
+        image = None
+        if image_base64:
+            import cv2
+
+            image = decode_base64_image(image_base64)
+            if image.ndim == 3:
+                image = cv2.cvtColor(image[:, :, :3], cv2.COLOR_RGB2BGR)
+
+        # Image forensics (ELA, noise inconsistency, JPEG ghosts, copy-move)
+        tamper_score = None
+        if image is not None and check_tampering:
+            from src.fraud import detect_copy_move, detect_tampering
+
+            tamper = detect_tampering(image)
+            tamper_score = tamper.tamper_score
+            if tamper.is_suspicious:
+                findings.append({
+                    "type": "tampering",
+                    "severity": "high",
+                    "description": "Image shows signs of local manipulation",
+                    **tamper.to_dict()
+                })
+                risk_score += 0.5 * tamper.tamper_score
+
+            copy_move = detect_copy_move(image)
+            if copy_move.is_suspicious:
+                findings.append({
+                    "type": "copy_move",
+                    "severity": "high",
+                    "description": f"{len(copy_move.region_pairs)} region(s) duplicated within the image",
+                    **copy_move.to_dict()
+                })
+                risk_score += 0.5 * copy_move.score
+
+        # Near-duplicate check (perceptual hash index)
+        duplicate_match_id = None
+        if check_duplicates and image is not None:
+            from src.api import storage
+            from src.fraud import compute_perceptual_hash
+
+            hashes = compute_perceptual_hash(get_preprocessor().process(image))
+            match = await storage.find_near_duplicate(hashes, exclude_id=document_id)
+            if match:
+                duplicate_match_id = match.document_id
+                findings.append({
+                    "type": "near_duplicate",
+                    "severity": "high",
+                    "description": f"Image matches previously submitted document {match.document_id}",
+                    **match.to_dict()
+                })
+                risk_score += 0.5
+
+        # Similar-content check (local embedding index)
+        if check_duplicates and ocr_text:
+            from src.api import storage
+            from src.core.config import get_settings
+            from src.fraud import document_embedding_text, get_embedder
+
+            threshold = get_settings().EMBEDDING_DUPLICATE_THRESHOLD
+            vector = get_embedder().embed(document_embedding_text(ocr_text))
+            similar = [
+                (other_id, score)
+                for other_id, score in await storage.find_similar_documents(vector, exclude_id=document_id)
+                if score >= threshold
+            ]
+            if similar:
+                duplicate_match_id = duplicate_match_id or similar[0][0]
+                findings.append({
+                    "type": "similar_content",
+                    "severity": "medium",
+                    "description": f"Text closely matches {len(similar)} other document(s)",
+                    "matches": [{"document_id": other_id, "similarity": round(score, 4)} for other_id, score in similar]
+                })
+                risk_score += 0.3
 
         # Determine risk level
         risk_level = "low"
@@ -394,6 +461,8 @@ async def docverify_check_fraud(
             "risk_level": risk_level,
             "risk_score": min(risk_score, 1.0),
             "findings": findings,
+            "duplicate_match_id": duplicate_match_id,
+            "tamper_score": tamper_score,
             "checks_performed": {
                 "duplicates": check_duplicates,
                 "tampering": check_tampering
@@ -427,74 +496,19 @@ async def docverify_detect_stamps(
     """
     try:
         import cv2
+        from src.detection import detect_stamps_and_signatures
 
-        # Decode image
         image = decode_base64_image(image_base64)
+        if image.ndim == 3:
+            image = cv2.cvtColor(image[:, :, :3], cv2.COLOR_RGB2BGR)
 
-        # Convert to appropriate color space
-        if len(image.shape) == 3:
-            gray = cv2.cvtColor(image, cv2.COLOR_RGB2GRAY)
-            hsv = cv2.cvtColor(image, cv2.COLOR_RGB2HSV)
-        else:
-            gray = image
-            hsv = None
-
-        stamps_found = []
-        signatures_found = []
-
-        # Basic stamp detection (looking for circular/oval colored regions)
-        if detect_stamps and hsv is not None:
-            # Look for red/blue regions (common stamp colors)
-            # Red stamps
-            lower_red = np.array([0, 100, 100])
-            upper_red = np.array([10, 255, 255])
-            red_mask = cv2.inRange(hsv, lower_red, upper_red)
-
-            # Blue stamps
-            lower_blue = np.array([100, 100, 100])
-            upper_blue = np.array([130, 255, 255])
-            blue_mask = cv2.inRange(hsv, lower_blue, upper_blue)
-
-            combined_mask = cv2.bitwise_or(red_mask, blue_mask)
-
-            # Find contours
-            contours, _ = cv2.findContours(combined_mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-
-            for contour in contours:
-                area = cv2.contourArea(contour)
-                if area > 500:  # Minimum area threshold
-                    x, y, w, h = cv2.boundingRect(contour)
-                    # Check if roughly circular (aspect ratio close to 1)
-                    aspect_ratio = float(w) / h if h > 0 else 0
-                    if 0.5 < aspect_ratio < 2.0:
-                        stamps_found.append({
-                            "type": "stamp",
-                            "bounding_box": {"x": int(x), "y": int(y), "width": int(w), "height": int(h)},
-                            "confidence": 0.7,
-                            "color": "red/blue"
-                        })
-
-        # Basic signature detection (looking for dark strokes)
-        if detect_signatures:
-            # Apply threshold to find dark regions
-            _, binary = cv2.threshold(gray, 100, 255, cv2.THRESH_BINARY_INV)
-
-            # Find contours
-            contours, _ = cv2.findContours(binary, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-
-            for contour in contours:
-                area = cv2.contourArea(contour)
-                # Signatures are typically elongated and of medium size
-                if 200 < area < 10000:
-                    x, y, w, h = cv2.boundingRect(contour)
-                    aspect_ratio = float(w) / h if h > 0 else 0
-                    # Signatures tend to be wider than tall
-                    if aspect_ratio > 1.5 and w > 50:
-                        signatures_found.append({
-                            "type": "signature",
-                            "bounding_box": {"x": int(x), "y": int(y), "width": int(w), "height": int(h)},
-                            "confidence": 0.5
-                        })
+        detections = detect_stamps_and_signatures(
+            image,
+            detect_stamps=detect_stamps,
+            detect_signatures=detect_signatures
+        )
+        stamps_found = detections.stamps
+        signatures_found = detections.signatures
 
         return {
             "status": "success",
@@ -553,7 +567,8 @@ async def docverify_full_verification(
 
             # Step 3: OCR
             ocr = get_ocr_engine()
-            text = ocr.extract(processed_image)
+            page = ocr.extract_page(processed_image)
+            text = page.text
             result["raw_text"] = text
             result["pipeline_steps"].append("ocr_complete")
 
@@ -574,7 +589,7 @@ async def docverify_full_verification(
             extracted_fields = {}
             if doc_type != "unknown":
                 extractor = get_extractor()
-                extracted_fields = await extractor.extract(text, doc_type)
+                extracted_fields = await extractor.extract(text, doc_type, page=page)
 
             result["extracted_fields"] = extracted_fields
             result["pipeline_steps"].append("extraction_complete")
@@ -649,21 +664,49 @@ async def get_supported_documents() -> str:
 
 @mcp.resource("docverify://api-status")
 async def get_api_status() -> str:
-    """Current status of the DocVerify API."""
-    return """
-# DocVerify API Status
-
-- **MCP Server**: Online
-- **OCR Engine**: PaddleOCR (primary)
-- **LLM**: Gemini 2.0 Flash
-- **Supported Languages**: en, hi, ta, te
-"""
+    """Current status of the DocVerify API, with this server's stage latencies and counters."""
+    from src.core.metrics import metrics_summary
+    from src.core.model_registry import get_model_registry
+
+    summary = metrics_summary()
+    lines = [
+        "# DocVerify API Status",
+        "",
+        "- **MCP Server**: Online",
+        "- **OCR Engine**: PaddleOCR (primary)",
+        "- **LLM**: Gemini 2.0 Flash",
+        "- **Supported Languages**: en, hi, ta, te",
+        f"- **Loaded Models**: {', '.join(get_model_registry().stats()) or 'none'}",
+        "",
+        "## Stage Latency",
+    ]
+    if summary["stages"]:
+        lines += ["| Stage | Count | Avg (ms) | Max (ms) |", "|---|---|---|---|"]
+        lines += [
+            f"| {name} | {stats['count']} | {stats['avg_ms']} | {stats['max_ms']} |"
+            for name, stats in summary["stages"].items()
+        ]
+    else:
+        lines.append("No requests processed yet.")
+    lines += ["", "## Caches"]
+    lines += [
+        f"- **{cache}**: {counts['hit']} hits / {counts['miss']} misses"
+        for cache, counts in sorted(summary["caches"].items())
+    ] or ["- none recorded"]
+    lines += ["", "## Fallbacks"]
+    lines += [
+        f"- **{name}**: {count}" for name, count in sorted(summary["fallbacks"].items())
+    ] or ["- none recorded"]
+    return "\n".join(lines) + "\n"
 
 
 # --- Entry Point ---
 if __name__ == "__main__":
     import sys
 
+    from src.core.tracing import configure_tracing
+    configure_tracing()
+
     # Default to stdio transport for CLI usage
     # Use --http flag for HTTP transport
     if "--http" in sys.argv:
@@ -22,3 +22,15 @@ def get_tesseract_engine():
     """Get Tesseract engine (lazy loaded)."""
     from src.ocr.tesseract_engine import TesseractOCREngine
     return TesseractOCREngine
+
+
+def get_language_router():
+    """Get multi-language routing engine (lazy loaded)."""
+    from src.ocr.router import MultiLanguageOCREngine
+    return MultiLanguageOCREngine
+
+
+def get_ocr_page():
+    """Get structured OCR page model (lazy loaded)."""
+    from src.ocr.page import OCRPage
+    return OCRPage
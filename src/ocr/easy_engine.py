@@ -4,31 +4,142 @@ DocVerify AI - EasyOCR Engine
 Fallback OCR engine using EasyOCR for multi-language support.
 """
 
+import os
 import numpy as np
 from typing import Optional, List, Tuple
 from structlog import get_logger
 
+from src.core.config import get_settings
+from src.core.metrics import timed
+from src.core.model_registry import get_model_registry
+from src.ocr.page import OCRPage
+
 logger = get_logger()
+settings = get_settings()
+
+# Default detector canvas caps: CPU inference time grows with canvas area
+CPU_MAX_CANVAS_SIZE = 1600
+GPU_MAX_CANVAS_SIZE = 2560
+
+# Images whose longest side is below this are magnified before detection
+MIN_DETECTION_SIDE = 1280
+MAX_MAG_RATIO = 2.0
 
 # Lazy import to avoid loading heavy models at startup
-_reader = None
+_torch_threads_configured = False
 
 
-def get_reader(languages: List[str] = None):
-    """Get or create EasyOCR reader instance."""
-    global _reader
-    if _reader is None:
-        try:
-            import easyocr
-            # Default languages: English + Hindi
-            langs = languages or ['en', 'hi']
-            logger.info("Initializing EasyOCR", languages=langs)
-            _reader = easyocr.Reader(langs, gpu=True)
-            logger.info("EasyOCR initialized successfully")
-        except Exception as e:
-            logger.error("Failed to initialize EasyOCR", error=str(e))
-            raise
-    return _reader
+def resolve_device(device: Optional[str] = None) -> str:
+    """
+    Resolve the execution device ("cpu" or "cuda").
+    "auto" picks CUDA only when torch actually sees a GPU.
+    """
+    device = (device or settings.EASYOCR_DEVICE).lower()
+    if device != "auto":
+        return device
+    try:
+        import torch
+        return "cuda" if torch.cuda.is_available() else "cpu"
+    except ImportError:
+        return "cpu"
+
+
+def configure_torch_threads(num_threads: Optional[int] = None) -> int:
+    """
+    Set the torch intra-op thread count for this worker process.
+    0 (default) splits the CPU cores evenly across API workers.
+    """
+    global _torch_threads_configured
+    num_threads = num_threads if num_threads is not None else settings.TORCH_NUM_THREADS
+    if num_threads <= 0:
+        num_threads = max(1, (os.cpu_count() or 1) // max(settings.API_WORKERS, 1))
+    try:
+        import torch
+        torch.set_num_threads(num_threads)
+        _torch_threads_configured = True
+        logger.info("Configured torch threads", num_threads=num_threads)
+    except ImportError:
+        pass
+    return num_threads
+
+
+def resolve_detection_scale(height: int, width: int, device: str = "cpu") -> Tuple[int, float]:
+    """
+    Pick EasyOCR canvas_size/mag_ratio for an image.
+
+    Large scans are capped to a canvas the device can process quickly; small
+    phone crops are magnified so text reaches the detector's working size.
+
+    Returns:
+        (canvas_size, mag_ratio)
+    """
+    max_canvas = CPU_MAX_CANVAS_SIZE if device == "cpu" else GPU_MAX_CANVAS_SIZE
+    longest = max(height, width)
+
+    mag_ratio = 1.0
+    if 0 < longest < MIN_DETECTION_SIDE:
+        mag_ratio = min(MAX_MAG_RATIO, MIN_DETECTION_SIDE / float(longest))
+
+    canvas_size = int(min(max_canvas, max(longest * mag_ratio, 1)))
+    return canvas_size, mag_ratio
+
+
+def reader_key(
+    languages: List[str] = None,
+    device: Optional[str] = None,
+    quantize: Optional[bool] = None,
+    instance: Optional[str] = None
+) -> Tuple:
+    """
+    Model registry key of the reader for a language set. One reader per
+    (language set, device, quantize), so per-language engines can be
+    loaded/released independently; an `instance` gets a private reader.
+    """
+    langs = tuple(languages or ['en', 'hi'])
+    quantize = settings.EASYOCR_QUANTIZE if quantize is None else quantize
+    return ("easyocr_reader", langs, resolve_device(device), quantize, instance)
+
+
+def _create_reader(langs: Tuple[str, ...], device: str, quantize: bool):
+    try:
+        import easyocr
+        if device == "cpu" and not _torch_threads_configured:
+            configure_torch_threads()
+        logger.info("Initializing EasyOCR", languages=list(langs), device=device, quantize=quantize)
+        # quantize applies dynamic int8 quantization to the recognizer on CPU
+        reader = easyocr.Reader(list(langs), gpu=(device == "cuda"), quantize=quantize)
+        logger.info("EasyOCR initialized successfully")
+        return reader
+    except Exception as e:
+        logger.error("Failed to initialize EasyOCR", error=str(e))
+        raise
+
+
+def get_reader(
+    languages: List[str] = None,
+    device: Optional[str] = None,
+    quantize: Optional[bool] = None,
+    instance: Optional[str] = None
+):
+    """
+    Get or create the EasyOCR reader for a language set.
+    Readers are shared through the model registry and reference counted:
+    pair every call with release_reader() using the same arguments.
+    """
+    key = reader_key(languages, device, quantize, instance)
+    _, langs, device, quantize, _ = key
+    # Readers aren't thread-safe; holders sharing one are serialized
+    return get_model_registry().acquire(key, lambda: _create_reader(langs, device, quantize), thread_safe=False)
+
+
+def release_reader(
+    languages: List[str] = None,
+    device: Optional[str] = None,
+    quantize: Optional[bool] = None,
+    instance: Optional[str] = None
+):
+    """Drop one reference to a reader; the last one frees its models."""
+    get_model_registry().release(reader_key(languages, device, quantize, instance))
 
 
 class EasyOCREngine:
@@ -37,34 +148,63 @@ class EasyOCREngine:
     Used as fallback when PaddleOCR fails or for ensemble voting.
     """
 
-    def __init__(self, languages: List[str] = None):
+    engine_name = "easyocr"
+
+    def __init__(
+        self,
+        languages: List[str] = None,
+        device: Optional[str] = None,
+        quantize: Optional[bool] = None,
+        adaptive_scale: bool = True,
+        instance: Optional[str] = None
+    ):
         """
         Initialize EasyOCR engine.
 
         Args:
             languages: List of language codes. Default: ['en', 'hi']
+            device: "cpu", "cuda" or "auto" (default: EASYOCR_DEVICE)
+            quantize: Dynamic int8 quantization on CPU (default: EASYOCR_QUANTIZE)
+            adaptive_scale: Pick canvas_size/mag_ratio from image size
+            instance: Use a private reader instead of the shared one
         """
         self.languages = languages or ['en', 'hi']
+        self.device = resolve_device(device)
+        self.quantize = quantize
+        self.adaptive_scale = adaptive_scale
+        self.instance = instance
         self._reader = None
 
     def _get_reader(self):
         """Lazy load the reader."""
         if self._reader is None:
-            self._reader = get_reader(self.languages)
+            self._reader = get_reader(self.languages, self.device, self.quantize, self.instance)
         return self._reader
 
-    def extract(self, image: np.ndarray) -> str:
+    def _readtext(self, reader, image: np.ndarray):
+        """Run detection + recognition with the size-dependent scale policy."""
+        if not self.adaptive_scale:
+            return reader.readtext(image)
+        canvas_size, mag_ratio = resolve_detection_scale(image.shape[0], image.shape[1], self.device)
+        return reader.readtext(image, canvas_size=canvas_size, mag_ratio=mag_ratio)
+
+    def close(self):
+        """Release the reader (called when evicted from an engine pool)."""
+        if self._reader is not None:
+            self._reader = None
+            release_reader(self.languages, self.device, self.quantize, self.instance)
+
+    @timed("ocr", "easyocr")
+    def extract_page(self, image: np.ndarray) -> OCRPage:
         """
-        Extract text from image.
+        Extract text with boxes and confidences as a structured page.
 
         Args:
             image: NumPy array of the image (BGR or RGB format)
-
-        Returns:
-            Extracted text as string
         """
         try:
             reader = self._get_reader()
+            height, width = image.shape[:2]
 
             # EasyOCR expects RGB
             if len(image.shape) == 3 and image.shape[2] == 3:
@@ -73,19 +213,28 @@ class EasyOCREngine:
                 image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
 
             # Run OCR
-            results = reader.readtext(image)
-
-            # Extract text from results
             # Results format: [(bbox, text, confidence), ...]
-            text_parts = [result[1] for result in results]
-            full_text = ' '.join(text_parts)
+            results = self._readtext(reader, image)
+            page = OCRPage.from_polygons(results, engine=self.engine_name, width=width, height=height)
 
-            logger.info("EasyOCR extraction complete", char_count=len(full_text))
-            return full_text
+            logger.info("EasyOCR extraction complete", char_count=len(page.text), tokens=len(page))
+            return page
 
         except Exception as e:
             logger.error("EasyOCR extraction failed", error=str(e))
-            return ""
+            return OCRPage.empty(self.engine_name)
+
+    def extract(self, image: np.ndarray) -> str:
+        """
+        Extract text from image.
+
+        Args:
+            image: NumPy array of the image (BGR or RGB format)
+
+        Returns:
+            Extracted text as string
+        """
+        return self.extract_page(image).text
 
     def extract_with_confidence(self, image: np.ndarray) -> Tuple[str, float, List[dict]]:
         """
@@ -106,7 +255,7 @@ class EasyOCREngine:
                 image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
 
             # Run OCR
-            results = reader.readtext(image)
+            results = self._readtext(reader, image)
 
             if not results:
                 return "", 0.0, []
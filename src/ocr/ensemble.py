@@ -9,6 +9,7 @@ from typing import Optional, List, Dict, Any, Tuple
 from dataclasses import dataclass
 from structlog import get_logger
 
+from src.core.metrics import record_fallback
 from src.ocr.paddle_engine import PaddleOCREngine
 
 logger = get_logger()
@@ -108,6 +109,7 @@ class OCREnsemble:
 
         # Try EasyOCR as fallback
         if self.use_easyocr:
+            record_fallback("ocr_ensemble", "easyocr")
             easy_result = self._run_easyocr(image)
 
             if easy_result:
@@ -133,11 +135,11 @@ class OCREnsemble:
     def _run_paddle(self, image: np.ndarray) -> OCRResult:
         """Run PaddleOCR engine."""
         try:
-            text = self.paddle_engine.extract(image)
+            page = self.paddle_engine.extract_page(image)
+            text = page.text
 
-            # Estimate confidence based on text quality
-            # (PaddleOCR confidence extraction would need engine modification)
-            confidence = self._estimate_confidence(text)
+            # Use recognizer confidence; fall back to the text heuristic if empty
+            confidence = page.mean_confidence if len(page) else self._estimate_confidence(text)
 
             return OCRResult(
                 text=text,
@@ -1,16 +1,26 @@
 from paddleocr import PaddleOCR
 import numpy as np
+from typing import Optional, Tuple
 from structlog import get_logger
 
+from src.core.config import get_settings
+from src.core.metrics import timed
+from src.preprocessing.orientation import detect_orientation, correct_orientation
+from src.ocr.page import OCRPage
+
 logger = get_logger()
+settings = get_settings()
 
 class PaddleOCREngine:
     """
     Wrapper around PaddleOCR for text extraction.
     """
-    
+
+    engine_name = "paddleocr"
+
     def __init__(self, use_angle_cls: bool = True, lang: str = 'en'):
         logger.info("Initializing PaddleOCR Engine...", lang=lang)
+        self.use_angle_cls = use_angle_cls
         try:
             # Initialize the OCR model
             # use_gpu=False for broad compatibility unless configured otherwise
@@ -20,30 +30,67 @@ class PaddleOCREngine:
             logger.error("Failed to initialize PaddleOCR", error=str(e))
             raise e
 
-    def extract(self, image: np.ndarray) -> str:
+    def _resolve_angle_cls(self, image: np.ndarray, use_angle_cls: Optional[bool]) -> Tuple[np.ndarray, bool]:
         """
-        Extract text from an image array.
+        Decide whether the per-line angle classifier should run for this page.
+
+        An explicit per-request value wins; otherwise OCR_ANGLE_CLS decides
+        ("always", "never" or "auto"). In auto mode the page orientation is
+        detected once on a thumbnail and quarter-turns are corrected up front.
+        """
+        if not self.use_angle_cls:
+            return image, False
+
+        if use_angle_cls is not None:
+            return image, use_angle_cls
+
+        mode = settings.OCR_ANGLE_CLS.lower()
+        if mode == "always":
+            return image, True
+        if mode == "never":
+            return image, False
+
+        orientation = detect_orientation(image)
+        if orientation.rotation:
+            image = correct_orientation(image, orientation.rotation)
+        return image, orientation.needs_angle_cls
+
+    @timed("ocr", "paddleocr")
+    def extract_page(self, image: np.ndarray, use_angle_cls: Optional[bool] = None) -> OCRPage:
+        """
+        Extract text lines with boxes and confidences.
+
+        Args:
+            image: NumPy array of the image
+            use_angle_cls: Force the angle classifier on/off; None = decide per page
         """
         try:
-            logger.info("Running PaddleOCR extraction...")
+            image, cls = self._resolve_angle_cls(image, use_angle_cls)
+            height, width = image.shape[:2]
+            logger.info("Running PaddleOCR extraction...", angle_cls=cls)
             # PaddleOCR expects image path or numpy array
-            result = self.ocr.ocr(image, cls=True)
-            
+            result = self.ocr.ocr(image, cls=cls)
+
             if not result or result[0] is None:
                 logger.warning("No text detected")
-                return ""
-            
+                return OCRPage.empty(self.engine_name, width, height)
+
             # Result format: [[[[x1,y1],[x2,y2]...], ("text", confidence)], ...]
-            # We want to combine all text
-            extracted_text = []
-            for line in result[0]:
-                text = line[1][0]
-                extracted_text.append(text)
-                
-            full_text = "\n".join(extracted_text)
-            logger.info("OCR Extraction complete", length=len(full_text))
-            return full_text
-            
+            page = OCRPage.from_polygons(
+                [(line[0], line[1][0], line[1][1]) for line in result[0]],
+                engine=self.engine_name,
+                width=width,
+                height=height
+            )
+            logger.info("OCR Extraction complete", length=len(page.text), tokens=len(page))
+            return page
+
         except Exception as e:
             logger.error("OCR extraction failed", error=str(e))
-            return ""
+            return OCRPage.empty(self.engine_name)
+
+    def extract(self, image: np.ndarray, use_angle_cls: Optional[bool] = None) -> str:
+        """
+        Extract text from an image array.
+        """
+        return self.extract_page(image, use_angle_cls=use_angle_cls).text
@@ -0,0 +1,259 @@
+"""
+DocVerify AI - Structured OCR Output
+
+Compact, array-backed page representation produced by every OCR engine:
+a string table of tokens plus NumPy arrays of boxes, confidences and line
+indices. Tokens are stored in reading order (line by line, left to right),
+so `text` is identical in shape whichever engine produced the page.
+"""
+
+import re
+import numpy as np
+from typing import Any, Dict, List, Optional
+
+# Two boxes belong to the same line when their vertical centers differ by
+# less than this fraction of the taller box's height
+LINE_CENTER_TOLERANCE = 0.5
+
+
+def _box_from_points(points) -> List[float]:
+    """Convert a quadrilateral [[x, y], ...] into [x, y, width, height]."""
+    xs = [float(p[0]) for p in points]
+    ys = [float(p[1]) for p in points]
+    return [min(xs), min(ys), max(xs) - min(xs), max(ys) - min(ys)]
+
+
+def _assign_lines(boxes: np.ndarray) -> np.ndarray:
+    """Group boxes into text lines by vertical center proximity."""
+    count = len(boxes)
+    line_ids = np.zeros(count, dtype=np.int32)
+    if count == 0:
+        return line_ids
+
+    centers = boxes[:, 1] + boxes[:, 3] / 2.0
+    order = np.argsort(centers, kind="stable")
+
+    current = 0
+    line_center = centers[order[0]]
+    line_height = boxes[order[0], 3]
+    for idx in order:
+        tolerance = max(line_height, boxes[idx, 3]) * LINE_CENTER_TOLERANCE
+        if abs(centers[idx] - line_center) > tolerance:
+            current += 1
+            line_center = centers[idx]
+            line_height = boxes[idx, 3]
+        line_ids[idx] = current
+    return line_ids
+
+
+class OCRPage:
+    """
+    OCR result for one page.
+
+    Attributes:
+        tokens: Recognized text units in reading order (words or line fragments)
+        boxes: float32 array (N, 4) of [x, y, width, height]
+        confidences: float32 array (N,) in 0-1
+        line_ids: int32 array (N,) line index of each token, non-decreasing
+    """
+
+    def __init__(
+        self,
+        tokens: List[str],
+        boxes: np.ndarray,
+        confidences: np.ndarray,
+        line_ids: np.ndarray,
+        width: int = 0,
+        height: int = 0,
+        engine: str = "unknown",
+        language: Optional[str] = None
+    ):
+        self.tokens = list(tokens)
+        self.boxes = np.asarray(boxes, dtype=np.float32).reshape(-1, 4)
+        self.confidences = np.asarray(confidences, dtype=np.float32).reshape(-1)
+        self.line_ids = np.asarray(line_ids, dtype=np.int32).reshape(-1)
+        self.width = int(width)
+        self.height = int(height)
+        self.engine = engine
+        self.language = language
+        self._lines: Optional[List[str]] = None
+
+    # --- Construction ---
+
+    @classmethod
+    def empty(cls, engine: str = "unknown", width: int = 0, height: int = 0) -> "OCRPage":
+        return cls([], np.zeros((0, 4)), np.zeros(0), np.zeros(0), width, height, engine)
+
+    @classmethod
+    def from_detections(
+        cls,
+        detections: List[Dict[str, Any]],
+        engine: str,
+        width: int = 0,
+        height: int = 0,
+        language: Optional[str] = None
+    ) -> "OCRPage":
+        """
+        Build a page from engine detections and sort into reading order.
+
+        Args:
+            detections: [{"text", "confidence", "bbox": {"x", "y", "width", "height"}}, ...]
+        """
+        detections = [d for d in detections if d.get("text", "").strip()]
+        if not detections:
+            return cls.empty(engine, width, height)
+
+        tokens = [d["text"].strip() for d in detections]
+        boxes = np.array(
+            [[d["bbox"]["x"], d["bbox"]["y"], d["bbox"]["width"], d["bbox"]["height"]] for d in detections],
+            dtype=np.float32
+        )
+        confidences = np.array([d.get("confidence", 0.0) for d in detections], dtype=np.float32)
+        line_ids = _assign_lines(boxes)
+
+        # Reading order: by line, then left to right
+        order = np.lexsort((boxes[:, 0], line_ids))
+        return cls(
+            [tokens[i] for i in order],
+            boxes[order],
+            confidences[order],
+            line_ids[order],
+            width,
+            height,
+            engine,
+            language
+        )
+
+    @classmethod
+    def from_polygons(
+        cls,
+        results: List[Any],
+        engine: str,
+        width: int = 0,
+        height: int = 0,
+        language: Optional[str] = None
+    ) -> "OCRPage":
+        """
+        Build a page from (polygon, text, confidence) triples
+        as returned by PaddleOCR and EasyOCR.
+        """
+        detections = []
+        for points, text, confidence in results:
+            x, y, w, h = _box_from_points(points)
+            detections.append({
+                "text": text,
+                "confidence": float(confidence),
+                "bbox": {"x": x, "y": y, "width": w, "height": h}
+            })
+        return cls.from_detections(detections, engine, width, height, language)
+
+    @classmethod
+    def from_text(cls, text: str, engine: str, language: Optional[str] = None) -> "OCRPage":
+        """Build a geometry-less page (one token per line) from plain text."""
+        lines = [line.strip() for line in text.splitlines() if line.strip()]
+        count = len(lines)
+        return cls(
+            lines,
+            np.zeros((count, 4)),
+            np.ones(count),
+            np.arange(count),
+            engine=engine,
+            language=language
+        )
+
+    # --- Text views ---
+
+    def __len__(self) -> int:
+        return len(self.tokens)
+
+    @property
+    def line_count(self) -> int:
+        return int(self.line_ids[-1]) + 1 if len(self.line_ids) else 0
+
+    def lines(self) -> List[str]:
+        """Text of each line, tokens joined by single spaces."""
+        if self._lines is None:
+            starts = np.flatnonzero(np.diff(self.line_ids)) + 1
+            bounds = np.concatenate(([0], starts, [len(self.tokens)])) if len(self.tokens) else []
+            self._lines = [
+                " ".join(self.tokens[bounds[i]:bounds[i + 1]])
+                for i in range(len(bounds) - 1)
+            ]
+        return self._lines
+
+    @property
+    def text(self) -> str:
+        """Canonical page text: one line per text line."""
+        return "\n".join(self.lines())
+
+    @property
+    def mean_confidence(self) -> float:
+        return float(self.confidences.mean()) if len(self.confidences) else 0.0
+
+    # --- Layout queries ---
+
+    def line_box(self, line_id: int) -> Optional[np.ndarray]:
+        """Union [x0, y0, x1, y1] of all tokens on a line."""
+        mask = self.line_ids == line_id
+        if not mask.any():
+            return None
+        boxes = self.boxes[mask]
+        return np.array([
+            boxes[:, 0].min(),
+            boxes[:, 1].min(),
+            (boxes[:, 0] + boxes[:, 2]).max(),
+            (boxes[:, 1] + boxes[:, 3]).max()
+        ])
+
+    def tokens_in_region(self, x0: float, y0: float, x1: float, y1: float) -> np.ndarray:
+        """Indices of tokens whose box center lies inside the region."""
+        cx = self.boxes[:, 0] + self.boxes[:, 2] / 2.0
+        cy = self.boxes[:, 1] + self.boxes[:, 3] / 2.0
+        return np.flatnonzero((cx >= x0) & (cx <= x1) & (cy >= y0) & (cy <= y1))
+
+    def value_after_label(self, label_pattern: str) -> Optional[str]:
+        """
+        Find a labelled value such as "Name: RAHUL KUMAR".
+
+        Looks for the value after the label on the same line first, then for
+        the tokens on the next line that start at or right of the label's left
+        edge (values printed below their label).
+        """
+        regex = re.compile(rf"(?:{label_pattern})\s*[:\-/]?\s*(.*)$", re.IGNORECASE)
+        lines = self.lines()
+        for line_id, line in enumerate(lines):
+            match = regex.search(line)
+            if not match:
+                continue
+
+            value = match.group(1).strip(" :-")
+            if value:
+                return value
+
+            next_line = line_id + 1
+            if next_line >= len(lines):
+                return None
+            label_box = self.line_box(line_id)
+            indices = np.flatnonzero(self.line_ids == next_line)
+            if label_box is not None and self.boxes[indices].any():
+                tolerance = (label_box[3] - label_box[1])
+                indices = indices[self.boxes[indices, 0] >= label_box[0] - tolerance]
+            value = " ".join(self.tokens[i] for i in indices).strip(" :-")
+            return value or None
+        return None
+
+    # --- Serialization ---
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Compact JSON-serializable form (parallel arrays)."""
+        return {
+            "engine": self.engine,
+            "language": self.language,
+            "width": self.width,
+            "height": self.height,
+            "tokens": self.tokens,
+            "boxes": np.round(self.boxes, 1).tolist(),
+            "confidences": np.round(self.confidences, 4).tolist(),
+            "line_ids": self.line_ids.tolist(),
+            "mean_confidence": round(self.mean_confidence, 4)
+        }
@@ -0,0 +1,256 @@
+"""
+DocVerify AI - Multi-Language OCR Routing
+
+Routes each page to a per-language OCR engine. Engines are loaded lazily
+and kept in a small LRU pool, so English-only documents never load the
+Devanagari/Tamil/Telugu models. Engines come from the shared model
+registry, so routers asking for the same backend and language share one
+loaded model; pooled OCR agents ask for their own instance instead, so
+they run side by side rather than queueing on one serialized model.
+"""
+
+import threading
+import numpy as np
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional
+from structlog import get_logger
+
+from src.core.config import get_settings
+from src.core.model_registry import get_model_registry
+from src.ocr.page import OCRPage
+from src.ocr.script_detection import detect_language_from_image
+
+logger = get_logger()
+settings = get_settings()
+
+# Language code -> engine-specific language configuration
+PADDLE_LANGS = {"en": "en", "hi": "hi", "ta": "ta", "te": "te"}
+TESSERACT_LANGS = {"en": "eng", "hi": "hin+eng", "ta": "tam+eng", "te": "tel+eng"}
+EASYOCR_LANGS = {"en": ["en"], "hi": ["hi", "en"], "ta": ["ta", "en"], "te": ["te", "en"]}
+
+
+def create_engine(backend: str, language: str, instance: Optional[str] = None):
+    """Create an OCR engine of the given backend for one language."""
+    if backend == "paddleocr":
+        from src.ocr.paddle_engine import PaddleOCREngine
+        return PaddleOCREngine(lang=PADDLE_LANGS[language])
+    if backend == "tesseract":
+        from src.ocr.tesseract_engine import TesseractOCREngine
+        return TesseractOCREngine(lang=TESSERACT_LANGS[language])
+    if backend == "easyocr":
+        from src.ocr.easy_engine import EasyOCREngine
+        # EasyOCR readers are cached separately; private engines need private readers
+        return EasyOCREngine(languages=EASYOCR_LANGS[language], instance=instance)
+    raise ValueError(f"Unknown OCR backend: {backend}")
+
+
+def engine_key(backend: str, language: str, instance: Optional[str] = None):
+    """
+    Registry key for an OCR engine. Holders passing an `instance` get their
+    own model, except for Tesseract, which is shared since it is thread-safe.
+    """
+    if instance is None or backend == "tesseract":
+        return ("ocr", backend, language)
+    return ("ocr", backend, language, instance)
+
+
+def acquire_engine(backend: str, language: str, instance: Optional[str] = None):
+    """
+    Shared OCR engine for a backend and language, loaded on first use.
+    Pair with release_engine() once the caller is done with it.
+    """
+    return get_model_registry().acquire(
+        engine_key(backend, language, instance),
+        lambda: create_engine(backend, language, instance),
+        # Tesseract keeps one API handle per thread; the others need serializing
+        thread_safe=backend == "tesseract"
+    )
+
+
+def release_engine(backend: str, language: str, instance: Optional[str] = None):
+    get_model_registry().release(engine_key(backend, language, instance))
+
+
+def _close_engine(language: str, engine: Any):
+    close = getattr(engine, "close", None)
+    if callable(close):
+        close()
+
+
+class EnginePool:
+    """
+    Lazily loaded, LRU-evicted pool of per-language engines.
+    Pinned languages are never evicted and do not count towards capacity.
+    Engines leaving the pool are handed to `release` (default: closed).
+    Models load outside the pool lock, one loader per language, so a slow
+    load never blocks lookups of languages that are already loaded.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[str], Any],
+        capacity: int = 2,
+        pinned: Optional[List[str]] = None,
+        release: Optional[Callable[[str, Any], None]] = None
+    ):
+        self.factory = factory
+        self.capacity = max(capacity, 1)
+        self.pinned = set(pinned or [])
+        self.release = release or _close_engine
+        self._engines: "OrderedDict[str, Any]" = OrderedDict()
+        self._added: set = set()
+        self._loading: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def add(self, language: str, engine: Any):
+        """Register an already-loaded engine (owned by the caller, never released)."""
+        with self._lock:
+            self._added.add(language)
+            self._engines[language] = engine
+            self._engines.move_to_end(language)
+
+    def _cached(self, language: str) -> Any:
+        engine = self._engines.get(language)
+        if engine is not None:
+            self._engines.move_to_end(language)
+        return engine
+
+    def get(self, language: str) -> Any:
+        """Get the engine for a language, loading it on first use."""
+        with self._lock:
+            engine = self._cached(language)
+            if engine is not None:
+                return engine
+            load_lock = self._loading.setdefault(language, threading.Lock())
+
+        with load_lock:
+            with self._lock:
+                engine = self._cached(language)
+                if engine is not None:
+                    return engine
+
+            logger.info("Loading OCR engine for language", language=language)
+            engine = self.factory(language)
+            with self._lock:
+                self._engines[language] = engine
+                self._loading.pop(language, None)
+                evicted = self._evict()
+        self._release_all(evicted)
+        return engine
+
+    def _evict(self) -> List[tuple]:
+        evicted = []
+        evictable = [lang for lang in self._engines if lang not in self.pinned]
+        while len(evictable) > self.capacity:
+            language = evictable.pop(0)
+            evicted.append(self._pop(language))
+            logger.info("Evicted OCR engine", language=language)
+        return evicted
+
+    def _pop(self, language: str) -> tuple:
+        engine = self._engines.pop(language)
+        if language in self._added:
+            self._added.discard(language)
+            return language, None
+        return language, engine
+
+    def _release_all(self, dropped: List[tuple]):
+        for language, engine in dropped:
+            if engine is not None:
+                self.release(language, engine)
+
+    def clear(self):
+        """Release every engine the pool loaded."""
+        with self._lock:
+            dropped = [self._pop(language) for language in list(self._engines)]
+        self._release_all(dropped)
+
+    def loaded_languages(self) -> List[str]:
+        with self._lock:
+            return list(self._engines.keys())
+
+
+class MultiLanguageOCREngine:
+    """
+    OCR engine that detects the page script and dispatches to a per-language engine.
+
+    Strategy:
+    1. Use the request language hint when given
+    2. Otherwise detect the script from pixels before any OCR: the Devanagari
+       headline heuristic, then Tesseract OSD (shared with orientation
+       detection) when Tamil/Telugu are configured
+    3. Run OCR once, on the engine for that script (English when none is found)
+    """
+
+    def __init__(
+        self,
+        backend: str,
+        primary: Any = None,
+        languages: Optional[List[str]] = None,
+        capacity: Optional[int] = None,
+        instance: Optional[str] = None
+    ):
+        """
+        Args:
+            backend: "paddleocr", "tesseract" or "easyocr"
+            primary: Already-loaded English engine (loaded lazily if None)
+            languages: Routable languages (default: OCR_LANGUAGES)
+            capacity: Max non-English engines kept loaded (default: OCR_MAX_LANGUAGE_MODELS)
+            instance: Load private engines instead of the shared ones (see engine_key)
+        """
+        self.backend = backend
+        self.engine_name = backend
+        configured = languages or [lang.strip() for lang in settings.OCR_LANGUAGES.split(",") if lang.strip()]
+        self.languages = [lang for lang in configured if lang in PADDLE_LANGS]
+        self.pool = EnginePool(
+            factory=lambda language: acquire_engine(backend, language, instance),
+            capacity=capacity or settings.OCR_MAX_LANGUAGE_MODELS,
+            pinned=["en"],
+            release=lambda language, engine: release_engine(backend, language, instance)
+        )
+        if primary is not None:
+            self.pool.add("en", primary)
+
+    def detect_language(self, image: np.ndarray) -> str:
+        """Pick the language engine for a page from its pixels."""
+        if not any(lang != "en" for lang in self.languages):
+            return "en"
+        language = detect_language_from_image(image, self.languages)
+        if language is None or language not in self.languages:
+            return "en"
+        return language
+
+    def extract_page(self, image: np.ndarray, language_hint: Optional[str] = None, **options) -> OCRPage:
+        """
+        Extract a structured page, routing to the engine for the page's script.
+
+        Args:
+            image: NumPy array of the image
+            language_hint: Skip detection and use this language ("en", "hi", "ta", "te")
+            **options: Engine-specific per-request options
+        """
+        if language_hint and language_hint in self.languages:
+            page = self.pool.get(language_hint).extract_page(image, **options)
+            page.language = language_hint
+            return page
+
+        language = self.detect_language(image)
+        if language != "en":
+            logger.info("Routing page to language engine", language=language)
+        page = self.pool.get(language).extract_page(image, **options)
+        page.language = language
+        return page
+
+    def extract(self, image: np.ndarray, language_hint: Optional[str] = None, **options) -> str:
+        """Extract text, routing to the engine for the page's script."""
+        return self.extract_page(image, language_hint=language_hint, **options).text
+
+    def close(self):
+        self.pool.clear()
+
+    def get_status(self) -> Dict[str, Any]:
+        return {
+            "backend": self.backend,
+            "languages": self.languages,
+            "loaded_languages": self.pool.loaded_languages()
+        }
@@ -0,0 +1,141 @@
+"""
+DocVerify AI - Script Detection
+
+Cheap script identification used to route pages to per-language OCR models:
+- Unicode block histogram over embedded PDF text
+- Devanagari headline (shirorekha) heuristic on connected components
+- Tesseract OSD script detection (when available) for Tamil/Telugu
+"""
+
+import cv2
+import numpy as np
+from typing import Dict, Optional, List
+from structlog import get_logger
+
+from src.preprocessing.orientation import make_thumbnail, read_osd
+
+logger = get_logger()
+
+# Unicode blocks -> language code used throughout the OCR module
+SCRIPT_BLOCKS = {
+    "hi": (0x0900, 0x097F),  # Devanagari
+    "ta": (0x0B80, 0x0BFF),  # Tamil
+    "te": (0x0C00, 0x0C7F),  # Telugu
+}
+
+# Tesseract OSD script names -> language code
+OSD_SCRIPTS = {
+    "Latin": "en",
+    "Devanagari": "hi",
+    "Tamil": "ta",
+    "Telugu": "te",
+}
+
+# Minimum share of letters in a script before the page is routed to it
+MIN_SCRIPT_FRACTION = 0.05
+
+# Headline strokes per text component above which a page is taken as Devanagari
+DEVANAGARI_HEADLINE_RATIO = 0.15
+
+OSD_MIN_SCRIPT_CONFIDENCE = 1.0
+
+
+def script_histogram(text: str) -> Dict[str, float]:
+    """
+    Fraction of letters per script ("en" for Latin, plus SCRIPT_BLOCKS codes).
+    """
+    counts = {"en": 0, **{lang: 0 for lang in SCRIPT_BLOCKS}}
+    total = 0
+
+    for char in text:
+        if not char.isalpha() and not (0x0900 <= ord(char) <= 0x0C7F):
+            continue
+        code = ord(char)
+        total += 1
+        if code < 0x0250:
+            counts["en"] += 1
+            continue
+        for lang, (start, end) in SCRIPT_BLOCKS.items():
+            if start <= code <= end:
+                counts[lang] += 1
+                break
+
+    if total == 0:
+        return {lang: 0.0 for lang in counts}
+    return {lang: count / total for lang, count in counts.items()}
+
+
+def dominant_indic_language(histogram: Dict[str, float]) -> Optional[str]:
+    """Return the most frequent non-Latin script above MIN_SCRIPT_FRACTION."""
+    indic = {lang: frac for lang, frac in histogram.items() if lang != "en"}
+    if not indic:
+        return None
+    lang, fraction = max(indic.items(), key=lambda item: item[1])
+    return lang if fraction >= MIN_SCRIPT_FRACTION else None
+
+
+def has_devanagari_headlines(image: np.ndarray) -> bool:
+    """
+    Detect the continuous headline that joins Devanagari characters into words.
+
+    Latin glyph bars are shorter than a character height, so a horizontal
+    opening longer than ~1.5x the median glyph height leaves almost nothing on
+    Latin text but keeps one stroke per Devanagari word.
+    """
+    thumbnail = make_thumbnail(image)
+    _, binary = cv2.threshold(thumbnail, 0, 255, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU)
+    height, width = binary.shape[:2]
+
+    _, _, stats, _ = cv2.connectedComponentsWithStats(binary, connectivity=8)
+    heights = stats[1:, cv2.CC_STAT_HEIGHT]
+    text_heights = heights[(heights >= 5) & (heights <= height * 0.1)]
+    if len(text_heights) < 10:
+        return False
+
+    median_height = float(np.median(text_heights))
+    kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (max(3, int(median_height * 1.5)), 1))
+    strokes = cv2.morphologyEx(binary, cv2.MORPH_OPEN, kernel)
+
+    _, _, stroke_stats, _ = cv2.connectedComponentsWithStats(strokes, connectivity=8)
+    stroke_widths = stroke_stats[1:, cv2.CC_STAT_WIDTH]
+    # Ignore table rules and card borders
+    headline_count = int(np.count_nonzero(stroke_widths < width * 0.25))
+
+    ratio = headline_count / float(len(text_heights))
+    return ratio >= DEVANAGARI_HEADLINE_RATIO
+
+
+def detect_script_with_osd(image: np.ndarray) -> Optional[str]:
+    """Use Tesseract OSD script detection when available (shares the page's OSD run)."""
+    osd = read_osd(image)
+    if osd is None or float(osd.get("script_conf", 0.0)) < OSD_MIN_SCRIPT_CONFIDENCE:
+        return None
+    return OSD_SCRIPTS.get(osd.get("script"))
+
+
+def detect_language_from_image(image: np.ndarray, candidates: List[str]) -> Optional[str]:
+    """
+    Detect a non-English script directly from pixels.
+
+    Args:
+        image: Page image
+        candidates: Configured languages that routing may choose from
+
+    Returns:
+        Language code or None when the page looks Latin-only
+    """
+    try:
+        if "hi" in candidates and has_devanagari_headlines(image):
+            return "hi"
+
+        # Tamil/Telugu have no cheap structural signature; ask OSD only if configured
+        if any(lang in candidates for lang in ("ta", "te")):
+            lang = detect_script_with_osd(image)
+            if lang in candidates and lang != "en":
+                return lang
+
+        return None
+
+    except Exception as e:
+        logger.error("Script detection failed", error=str(e))
+        return None
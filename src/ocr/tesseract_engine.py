@@ -1,12 +1,31 @@
 """
 Lightweight Tesseract OCR Engine for deployment environments.
 No PyTorch/PaddlePaddle dependency - uses system Tesseract binary.
+
+When tesserocr is installed, each worker thread keeps a persistent in-process
+TessBaseAPI handle, avoiding the subprocess spawn + temp image write that
+pytesseract pays on every call. Otherwise falls back to pytesseract.
 """
+import shlex
+import threading
 import numpy as np
+from typing import Optional, List, Dict, Any
 from structlog import get_logger
 from PIL import Image
 
+from src.core.config import get_settings
+from src.core.metrics import record_fallback, timed
+from src.ocr.page import OCRPage
+
 logger = get_logger()
+settings = get_settings()
+
+# Optional in-process backend (graceful degradation to pytesseract)
+try:
+    from tesserocr import PyTessBaseAPI, PSM, RIL, iterate_level
+    HAS_TESSEROCR = True
+except ImportError:
+    HAS_TESSEROCR = False
 
 
 class TesseractOCREngine:
@@ -15,28 +34,189 @@ class TesseractOCREngine:
     Used in deployment/free-tier environments where PaddleOCR is too heavy.
     """
 
-    def __init__(self, lang: str = "eng"):
+    engine_name = "tesseract"
+
+    def __init__(self, lang: str = "eng", backend: Optional[str] = None, psm: Optional[int] = None):
+        """
+        Initialize Tesseract engine.
+
+        Args:
+            lang: Tesseract language string (e.g. "eng", "eng+hin")
+            backend: "tesserocr", "subprocess" or "auto" (default: TESSERACT_BACKEND)
+            psm: Default page segmentation mode (default: TESSERACT_PSM)
+        """
         logger.info("Initializing Tesseract OCR Engine...", lang=lang)
+        self.lang = lang
+        self.psm = psm if psm is not None else settings.TESSERACT_PSM
+        self._local = threading.local()
+        # Every thread's handle, so close() and dead-thread cleanup can End() them
+        self._apis: Dict[threading.Thread, Any] = {}
+        self._apis_lock = threading.Lock()
+
+        backend = (backend or settings.TESSERACT_BACKEND).lower()
+        self.backend = None
+        self.pytesseract = None
         try:
-            import pytesseract
-            self.pytesseract = pytesseract
-            self.lang = lang
-            # Test that tesseract binary is available
-            pytesseract.get_tesseract_version()
-            logger.info("Tesseract OCR initialized successfully")
+            if backend != "subprocess" and HAS_TESSEROCR:
+                try:
+                    # Create the handle for this thread now so init errors surface early
+                    self._get_api()
+                    self.backend = "tesserocr"
+                except Exception as e:
+                    if backend == "tesserocr":
+                        raise
+                    logger.warning("tesserocr unavailable, falling back to subprocess", error=str(e))
+                    record_fallback("tesseract", "subprocess")
+
+            if self.backend is None:
+                if backend == "tesserocr":
+                    raise RuntimeError("tesserocr backend requested but tesserocr is not installed")
+                import pytesseract
+                self.pytesseract = pytesseract
+                # Test that tesseract binary is available
+                pytesseract.get_tesseract_version()
+                self.backend = "subprocess"
+
+            logger.info("Tesseract OCR initialized successfully", backend=self.backend)
         except Exception as e:
             logger.error("Failed to initialize Tesseract", error=str(e))
             raise e
 
-    def extract(self, image: np.ndarray) -> str:
-        """Extract text from an image array using Tesseract."""
+    # --- tesserocr backend ---
+
+    def _get_api(self):
+        """Get the persistent TessBaseAPI handle for the current thread."""
+        api = getattr(self._local, "api", None)
+        if api is None:
+            api = PyTessBaseAPI(lang=self.lang, psm=PSM(self.psm))
+            self._local.api = api
+            with self._apis_lock:
+                # Handles of threads that have exited are never used again
+                for thread in [t for t in self._apis if not t.is_alive()]:
+                    self._apis.pop(thread).End()
+                self._apis[threading.current_thread()] = api
+            logger.info("Created Tesseract API handle", thread=threading.current_thread().name)
+        return api
+
+    def _prepare_api(self, image: np.ndarray, psm: int, whitelist: Optional[str]):
+        api = self._get_api()
+        api.SetPageSegMode(PSM(psm))
+        # Variables persist on the handle, so always reset the whitelist
+        api.SetVariable("tessedit_char_whitelist", whitelist or "")
+        api.SetImage(Image.fromarray(image))
+        return api
+
+    def _words_tesserocr(self, image: np.ndarray, psm: int, whitelist: Optional[str]) -> List[Dict[str, Any]]:
+        api = self._prepare_api(image, psm, whitelist)
+        words = []
         try:
-            logger.info("Running Tesseract OCR extraction...")
-            pil_image = Image.fromarray(image)
-            text = self.pytesseract.image_to_string(pil_image, lang=self.lang)
-            text = text.strip()
-            logger.info("Tesseract extraction complete", length=len(text))
-            return text
+            api.Recognize()
+            iterator = api.GetIterator()
+            for item in iterate_level(iterator, RIL.WORD):
+                text = item.GetUTF8Text(RIL.WORD)
+                if not text or not text.strip():
+                    continue
+                x1, y1, x2, y2 = item.BoundingBox(RIL.WORD)
+                words.append({
+                    "text": text.strip(),
+                    "confidence": item.Confidence(RIL.WORD) / 100.0,
+                    "bbox": {"x": x1, "y": y1, "width": x2 - x1, "height": y2 - y1}
+                })
+        finally:
+            api.Clear()
+        return words
+
+    # --- pytesseract (subprocess) backend ---
+
+    def _build_config(self, psm: int, whitelist: Optional[str]) -> str:
+        config = f"--psm {psm}"
+        if whitelist:
+            # pytesseract shlex-splits the config string
+            config += " -c " + shlex.quote(f"tessedit_char_whitelist={whitelist}")
+        return config
+
+    def _words_subprocess(self, image: np.ndarray, psm: int, whitelist: Optional[str]) -> List[Dict[str, Any]]:
+        pil_image = Image.fromarray(image)
+        data = self.pytesseract.image_to_data(
+            pil_image,
+            lang=self.lang,
+            config=self._build_config(psm, whitelist),
+            output_type=self.pytesseract.Output.DICT
+        )
+        words = []
+        for i, text in enumerate(data["text"]):
+            confidence = float(data["conf"][i])
+            # conf is -1 for block/paragraph/line rows
+            if confidence < 0 or not text.strip():
+                continue
+            words.append({
+                "text": text.strip(),
+                "confidence": confidence / 100.0,
+                "bbox": {
+                    "x": data["left"][i],
+                    "y": data["top"][i],
+                    "width": data["width"][i],
+                    "height": data["height"][i]
+                }
+            })
+        return words
+
+    # --- Public API ---
+
+    def extract(self, image: np.ndarray, psm: Optional[int] = None, whitelist: Optional[str] = None) -> str:
+        """
+        Extract text from an image array using Tesseract.
+
+        Args:
+            image: NumPy array of the image
+            psm: Page segmentation mode for this call (default: engine psm)
+            whitelist: Restrict recognition to these characters
+        """
+        return self.extract_page(image, psm=psm, whitelist=whitelist).text
+
+    @timed("ocr", "tesseract")
+    def extract_page(
+        self,
+        image: np.ndarray,
+        psm: Optional[int] = None,
+        whitelist: Optional[str] = None
+    ) -> OCRPage:
+        """
+        Extract word boxes with confidences as a structured page.
+        """
+        height, width = image.shape[:2]
+        logger.info("Running Tesseract OCR extraction...", backend=self.backend, psm=psm or self.psm)
+        words = self.extract_words(image, psm=psm, whitelist=whitelist)
+        page = OCRPage.from_detections(words, engine=self.engine_name, width=width, height=height)
+        logger.info("Tesseract extraction complete", length=len(page.text), tokens=len(page))
+        return page
+
+    def extract_words(
+        self,
+        image: np.ndarray,
+        psm: Optional[int] = None,
+        whitelist: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Extract word boxes with confidences.
+
+        Returns:
+            List of {"text", "confidence" (0-1), "bbox": {"x", "y", "width", "height"}}
+        """
+        psm = psm if psm is not None else self.psm
+        try:
+            if self.backend == "tesserocr":
+                return self._words_tesserocr(image, psm, whitelist)
+            return self._words_subprocess(image, psm, whitelist)
         except Exception as e:
-            logger.error("Tesseract extraction failed", error=str(e))
-            return ""
+            logger.error("Tesseract word extraction failed", error=str(e))
+            return []
+
+    def close(self):
+        """End every thread's TessBaseAPI handle (the engine is unusable afterwards)."""
+        with self._apis_lock:
+            apis = list(self._apis.values())
+            self._apis.clear()
+        for api in apis:
+            api.End()
+        self._local = threading.local()
@@ -1,18 +1,26 @@
+import asyncio
 from typing import Dict, Type, Any, Optional
 from src.orchestration.agents.base_agent import BaseAgent
+from src.orchestration.agent_pool import AgentPool
+from src.core.config import get_settings
 from structlog import get_logger
 
 logger = get_logger()
+settings = get_settings()
 
 class AgentManager:
     """
     Central orchestrator for managing agent lifecycles.
     Responsible for registering types, spawning instances, and health checks.
+    Agents shared across concurrent requests live in per-type pools and are
+    reached through dispatch().
     """
 
     def __init__(self):
         self._registry: Dict[str, Type[BaseAgent]] = {}
         self._active_agents: Dict[str, BaseAgent] = {}
+        self._pools: Dict[str, AgentPool] = {}
+        self._reaper: Optional[asyncio.Task] = None
         self.logger = logger.bind(component="AgentManager")
 
     def register_agent_type(self, type_name: str, agent_class: Type[BaseAgent]):
@@ -39,7 +47,71 @@ class AgentManager:
         return agent.agent_id
 
     def get_agent(self, agent_id: str) -> Optional[BaseAgent]:
-        return self._active_agents.get(agent_id)
+        agent = self._active_agents.get(agent_id)
+        if agent is None:
+            for pool in self._pools.values():
+                agent = next((a for a in pool.agents if a.agent_id == agent_id), None)
+                if agent is not None:
+                    break
+        return agent
+
+    # --- Pools ---
+
+    async def create_pool(
+        self,
+        type_name: str,
+        config: Dict[str, Any] = None,
+        min_size: Optional[int] = None,
+        max_size: Optional[int] = None,
+        idle_timeout_s: Optional[float] = None
+    ) -> AgentPool:
+        """
+        Create (or return) the pool for a registered agent type and spawn its
+        minimum agents. max_size defaults to AGENT_POOL_MAX_SIZE, then CPU count.
+        """
+        if type_name in self._pools:
+            return self._pools[type_name]
+        if type_name not in self._registry:
+            raise ValueError(f"Unknown agent type: {type_name}")
+
+        pool = AgentPool(
+            type_name,
+            self._registry[type_name],
+            config=config,
+            min_size=settings.AGENT_POOL_MIN_SIZE if min_size is None else min_size,
+            max_size=max_size or settings.AGENT_POOL_MAX_SIZE or None,
+            idle_timeout_s=settings.AGENT_IDLE_TIMEOUT_S if idle_timeout_s is None else idle_timeout_s
+        )
+        self._pools[type_name] = pool
+        await pool.start()
+        self.logger.info("Agent pool created", type_name=type_name, min_size=pool.min_size, max_size=pool.max_size)
+        return pool
+
+    async def dispatch(self, type_name: str, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Run a request on the type's pool (created with defaults on first use)."""
+        pool = self._pools.get(type_name) or await self.create_pool(type_name)
+        return await pool.submit(input_data)
+
+    def pool_metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Size, busy/idle agents, queue depth and dispatch counters per pool."""
+        return {type_name: pool.metrics() for type_name, pool in self._pools.items()}
+
+    def start_reaper(self, interval_s: Optional[float] = None):
+        """Periodically terminate pool agents idle past their timeout."""
+        if self._reaper is not None:
+            return
+        interval_s = interval_s or settings.AGENT_REAP_INTERVAL_S
+
+        async def reap_forever():
+            while True:
+                await asyncio.sleep(interval_s)
+                for pool in list(self._pools.values()):
+                    try:
+                        await pool.reap_idle()
+                    except Exception as e:
+                        self.logger.warning("Idle reaping failed", type_name=pool.type_name, error=str(e))
+
+        self._reaper = asyncio.create_task(reap_forever())
 
     async def terminate_agent(self, agent_id: str):
         if agent_id in self._active_agents:
@@ -51,11 +123,20 @@ class AgentManager:
     async def shutdown_all(self):
         """Terminate all active agents."""
         self.logger.info("Shutting down all agents", count=len(self._active_agents))
+        if self._reaper is not None:
+            self._reaper.cancel()
+            self._reaper = None
         for agent_id in list(self._active_agents.keys()):
             await self.terminate_agent(agent_id)
+        for pool in self._pools.values():
+            await pool.shutdown()
+        self._pools.clear()
 
     def list_active_agents(self) -> Dict[str, Dict[str, Any]]:
-        return {
+        agents = {
             aid: agent.get_status() 
             for aid, agent in self._active_agents.items()
         }
+        for pool in self._pools.values():
+            agents.update({agent.agent_id: {**agent.get_status(), "pool": pool.type_name} for agent in pool.agents})
+        return agents
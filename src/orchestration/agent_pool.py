@@ -0,0 +1,186 @@
+import asyncio
+import os
+import time
+from typing import Any, Dict, List, Optional, Type
+
+from structlog import get_logger
+
+from src.orchestration.agents.base_agent import AgentStatus, BaseAgent
+
+logger = get_logger()
+
+
+class AgentPool:
+    """
+    A pool of interchangeable agents of one type.
+
+    Requests go to the least-busy healthy agent; when every agent is at its
+    max_concurrency a new one is spawned (up to max_size), otherwise the
+    caller queues. Agents left in ERROR are retired and replaced on demand,
+    and agents idle longer than idle_timeout_s are reaped down to min_size.
+    """
+
+    def __init__(
+        self,
+        type_name: str,
+        agent_class: Type[BaseAgent],
+        config: Optional[Dict[str, Any]] = None,
+        min_size: int = 1,
+        max_size: Optional[int] = None,
+        idle_timeout_s: float = 300.0
+    ):
+        self.type_name = type_name
+        self.agent_class = agent_class
+        self.config = config or {}
+        self.max_size = max_size or os.cpu_count() or 1
+        self.min_size = min(min_size, self.max_size)
+        self.idle_timeout_s = idle_timeout_s
+        self._agents: List[BaseAgent] = []
+        self._spawning = 0
+        self._waiting = 0
+        self._condition = asyncio.Condition()
+        self.logger = logger.bind(component="AgentPool", type_name=type_name)
+
+        # Metrics
+        self.max_queue_depth = 0
+        self.dispatched = 0
+        self.failures = 0
+        self.total_wait_ms = 0.0
+
+    @property
+    def size(self) -> int:
+        return len(self._agents)
+
+    @property
+    def agents(self) -> List[BaseAgent]:
+        return list(self._agents)
+
+    async def start(self):
+        """Spawn the minimum number of agents up front."""
+        await asyncio.gather(*(self._spawn() for _ in range(self.min_size - self.size)))
+
+    async def _spawn(self, reserved: bool = False) -> BaseAgent:
+        """Create one agent; `reserved` means the caller already counted it in _spawning."""
+        if not reserved:
+            async with self._condition:
+                self._spawning += 1
+        try:
+            agent = self.agent_class()
+            await agent.initialize(self.config)
+        except Exception:
+            async with self._condition:
+                self._spawning -= 1
+                self._condition.notify_all()
+            raise
+        async with self._condition:
+            self._spawning -= 1
+            self._agents.append(agent)
+            self._condition.notify_all()
+        self.logger.info("Pool agent spawned", agent_id=agent.agent_id, size=self.size)
+        return agent
+
+    def _least_busy(self) -> Optional[BaseAgent]:
+        available = [
+            agent for agent in self._agents
+            if agent.status != AgentStatus.ERROR and agent.active_tasks < agent.max_concurrency
+        ]
+        if not available:
+            return None
+        # Fewest in-flight requests, then least recently used to spread load
+        return min(available, key=lambda agent: (agent.active_tasks, agent.last_used))
+
+    async def _retire_failed(self):
+        failed = [agent for agent in self._agents if agent.status == AgentStatus.ERROR and agent.active_tasks == 0]
+        for agent in failed:
+            self._agents.remove(agent)
+        for agent in failed:
+            self.logger.warning("Retiring failed agent", agent_id=agent.agent_id)
+            await agent.shutdown()
+
+    async def _acquire(self) -> BaseAgent:
+        start = time.perf_counter()
+        queued = False
+        try:
+            while True:
+                spawn = False
+                async with self._condition:
+                    await self._retire_failed()
+                    agent = self._least_busy()
+                    if agent is not None:
+                        # Reserve the slot before releasing the lock
+                        agent.active_tasks += 1
+                        return agent
+                    if self.size + self._spawning < self.max_size:
+                        self._spawning += 1
+                        spawn = True
+                    else:
+                        if not queued:
+                            queued = True
+                            self._waiting += 1
+                            self.max_queue_depth = max(self.max_queue_depth, self._waiting)
+                        await self._condition.wait()
+                if spawn:
+                    await self._spawn(reserved=True)
+        finally:
+            if queued:
+                async with self._condition:
+                    self._waiting -= 1
+            self.total_wait_ms += (time.perf_counter() - start) * 1000
+
+    async def submit(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Run one request on the least-busy agent, waiting for capacity if needed."""
+        agent = await self._acquire()
+        # process() counts the task itself; drop the reservation now that it will
+        agent.active_tasks -= 1
+        self.dispatched += 1
+        try:
+            return await agent.process(input_data)
+        except Exception:
+            self.failures += 1
+            raise
+        finally:
+            async with self._condition:
+                self._condition.notify_all()
+
+    async def reap_idle(self) -> int:
+        """Terminate agents idle for longer than idle_timeout_s, keeping min_size. Returns the number reaped."""
+        now = time.monotonic()
+        async with self._condition:
+            idle = sorted(
+                (
+                    agent for agent in self._agents
+                    if agent.active_tasks == 0 and now - agent.last_used > self.idle_timeout_s
+                ),
+                key=lambda agent: agent.last_used
+            )
+            reaped = idle[:max(0, self.size - self.min_size)]
+            for agent in reaped:
+                self._agents.remove(agent)
+        for agent in reaped:
+            await agent.shutdown()
+        if reaped:
+            self.logger.info("Reaped idle agents", count=len(reaped), size=self.size)
+        return len(reaped)
+
+    async def shutdown(self):
+        async with self._condition:
+            agents, self._agents = self._agents, []
+        for agent in agents:
+            await agent.shutdown()
+
+    def metrics(self) -> Dict[str, Any]:
+        busy = sum(1 for agent in self._agents if agent.active_tasks > 0)
+        return {
+            "type": self.type_name,
+            "size": self.size,
+            "min_size": self.min_size,
+            "max_size": self.max_size,
+            "busy": busy,
+            "idle": self.size - busy,
+            "in_flight": sum(agent.active_tasks for agent in self._agents),
+            "queue_depth": self._waiting,
+            "max_queue_depth": self.max_queue_depth,
+            "dispatched": self.dispatched,
+            "failures": self.failures,
+            "avg_wait_ms": round(self.total_wait_ms / self.dispatched, 2) if self.dispatched else 0.0
+        }
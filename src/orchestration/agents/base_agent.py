@@ -1,9 +1,12 @@
 from abc import ABC, abstractmethod
 from typing import Any, Dict, Optional
+import time
 import uuid
 from enum import Enum
 from structlog import get_logger
 
+from src.core.tracing import span
+
 logger = get_logger()
 
 class AgentStatus(str, Enum):
@@ -19,10 +22,17 @@ class BaseAgent(ABC):
     Enforces a standard lifecycle and interface.
     """
 
+    # Requests one instance may serve at once. Agents holding a model that
+    # isn't thread-safe keep 1 and are scaled out through an AgentPool.
+    max_concurrency: int = 1
+
     def __init__(self, agent_id: Optional[str] = None):
         self.agent_id = agent_id or str(uuid.uuid4())
         self.status = AgentStatus.IDLE
         self.context: Dict[str, Any] = {}
+        self.active_tasks = 0
+        self.processed_count = 0
+        self.last_used = time.monotonic()
         self.logger = logger.bind(agent_id=self.agent_id, agent_type=self.__class__.__name__)
         
     async def initialize(self, config: Dict[str, Any]) -> bool:
@@ -48,17 +58,26 @@ class BaseAgent(ABC):
         if self.status == AgentStatus.ERROR:
              raise RuntimeError(f"Agent {self.agent_id} is in ERROR state")
         
+        # Status is derived from the in-flight count so overlapping calls
+        # don't flip each other back to IDLE
+        self.active_tasks += 1
         self.status = AgentStatus.PROCESSING
         self.logger.info("Processing task", input_keys=list(input_data.keys()))
         
         try:
-            result = await self._process_impl(input_data)
-            self.status = AgentStatus.IDLE
+            with span(f"agent.{self.__class__.__name__}.process", agent_id=self.agent_id):
+                result = await self._process_impl(input_data)
             return result
         except Exception as e:
             self.status = AgentStatus.ERROR
             self.logger.error("Processing failed", error=str(e))
             raise e
+        finally:
+            self.active_tasks -= 1
+            self.processed_count += 1
+            self.last_used = time.monotonic()
+            if self.active_tasks == 0 and self.status == AgentStatus.PROCESSING:
+                self.status = AgentStatus.IDLE
 
     async def shutdown(self):
         """
@@ -73,6 +92,8 @@ class BaseAgent(ABC):
             "agent_id": self.agent_id,
             "type": self.__class__.__name__,
             "status": self.status,
+            "active_tasks": self.active_tasks,
+            "processed_count": self.processed_count,
             "context_size": len(self.context)
         }
 
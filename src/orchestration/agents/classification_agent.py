@@ -1,4 +1,5 @@
 from typing import Dict, Any
+from src.core.model_registry import get_model_registry
 from src.orchestration.agents.base_agent import BaseAgent
 # Import inside method or try-except block in init if strictly needed, 
 # but usually top level is fine if order is correct.
@@ -11,9 +12,13 @@ class ClassificationAgent(BaseAgent):
     
     async def _initialize_impl(self, config: Dict[str, Any]):
         from src.classification.engine import DocumentClassifier
-        self.classifier = DocumentClassifier()
+        # One engine per process; pooled agents share it
+        self.classifier = get_model_registry().acquire(("classifier",), DocumentClassifier)
         self.logger.info("Classification Agent initialized")
 
+    async def _shutdown_impl(self):
+        get_model_registry().release(("classifier",))
+
     async def _process_impl(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Input: {"ocr_text": str} or {"text": str}
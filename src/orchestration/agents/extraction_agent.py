@@ -1,4 +1,5 @@
 from typing import Dict, Any
+from src.core.model_registry import get_model_registry
 from src.orchestration.agents.base_agent import BaseAgent
 # Import at method level if needed, but safe here if extraction/engine exists
 # from src.extraction.engine import ExtractionEngine
@@ -10,12 +11,16 @@ class ExtractionAgent(BaseAgent):
     
     async def _initialize_impl(self, config: Dict[str, Any]):
         from src.extraction.engine import ExtractionEngine
-        self.engine = ExtractionEngine()
+        # One engine per process; pooled agents share it
+        self.engine = get_model_registry().acquire(("extractor",), ExtractionEngine)
         self.logger.info("Extraction Agent initialized")
 
+    async def _shutdown_impl(self):
+        get_model_registry().release(("extractor",))
+
     async def _process_impl(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """
-        Input: {"text": str, "document_type": str}
+        Input: {"text": str, "document_type": str, "page": Optional[OCRPage]}
         Output: {"extracted_data": dict}
         """
         text = input_data.get("text")
@@ -26,7 +31,7 @@ class ExtractionAgent(BaseAgent):
             
         self.logger.info("Extracting data...", doc_type=doc_type)
         
-        extracted_data = await self.engine.extract(text, doc_type)
+        extracted_data = await self.engine.extract(text, doc_type, page=input_data.get("page"))
         
         return {
             "extracted_data": extracted_data,
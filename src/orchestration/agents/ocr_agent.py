@@ -1,8 +1,9 @@
+import asyncio
 from typing import Dict, Any
 from src.orchestration.agents.base_agent import BaseAgent
 from src.preprocessing.pipeline import ImagePreprocessor
 # Import engine inside initialize to avoid import errors if dependencies missing during registration
-# from src.ocr.paddle_engine import PaddleOCREngine 
+# from src.ocr.router import MultiLanguageOCREngine
 
 class OCRAgent(BaseAgent):
     """
@@ -16,10 +17,14 @@ class OCRAgent(BaseAgent):
         self.logger.info("Initializing Preprocessor...")
         self.preprocessor = ImagePreprocessor(config.get("preprocessing", {}))
         
-        # 2. Initialize OCR Engine
-        if self.engine_name == "paddleocr":
-            from src.ocr.paddle_engine import PaddleOCREngine
-            self.engine = PaddleOCREngine()
+        # 2. Initialize OCR Engine. Each agent owns its models (Tesseract is
+        # still shared, it is thread-safe), so pooled agents don't queue on one
+        # serialized model; the English engine loads now, other languages on demand.
+        if self.engine_name in ("paddleocr", "tesseract", "easyocr"):
+            from src.ocr.router import MultiLanguageOCREngine
+            languages = config.get("languages") or (None if config.get("routing", True) else ["en"])
+            self.engine = MultiLanguageOCREngine(self.engine_name, languages=languages, instance=self.agent_id)
+            await asyncio.to_thread(self.engine.pool.get, "en")
         else:
             # Fallback or other engines
             self.logger.warning("Unknown engine, defaulting to mock", engine=self.engine_name)
@@ -27,34 +32,52 @@ class OCRAgent(BaseAgent):
             
         self.logger.info("OCR Agent initialized", engine=self.engine_name)
 
+    async def _shutdown_impl(self):
+        if self.engine is not None:
+            engine, self.engine = self.engine, None
+            await asyncio.to_thread(engine.close)
+
     async def _process_impl(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """
-        Input: {"image_path": str, "language_hint": str}
-        Output: {"text": str, "raw_result": dict}
+        Input: {"image_path": str, "language_hint": str, "angle_cls": Optional[bool]}
+            or {"image": np.ndarray (already preprocessed), "ocr_options": dict}
+        Output: {"text": str, "page": OCRPage, "confidence": float, "engine": str}
         """
-        image_path = input_data.get("image_path")
-        if not image_path:
-            raise ValueError("image_path is required")
+        processed_image = input_data.get("image")
+        if processed_image is not None:
+            ocr_options = dict(input_data.get("ocr_options") or {})
+        else:
+            image_path = input_data.get("image_path")
+            if not image_path:
+                raise ValueError("image_path or image is required")
+            ocr_options = {"language_hint": input_data.get("language_hint")}
+            if input_data.get("angle_cls") is not None and self.engine_name == "paddleocr":
+                ocr_options["use_angle_cls"] = input_data["angle_cls"]
 
-        self.logger.info("Processing document...", path=image_path)
-        
-        # 1. Preprocessing
-        self.logger.info("Running Preprocessing...")
-        try:
-            processed_image = self.preprocessor.process_path(image_path)
-        except Exception as e:
-            self.logger.error("Preprocessing failed", error=str(e))
-            raise e
+            self.logger.info("Processing document...", path=image_path)
+
+            # 1. Preprocessing (off the event loop so pooled agents run side by side)
+            self.logger.info("Running Preprocessing...")
+            try:
+                processed_image = await asyncio.to_thread(self.preprocessor.process_path, image_path)
+            except Exception as e:
+                self.logger.error("Preprocessing failed", error=str(e))
+                raise e
 
         # 2. OCR Extraction
         self.logger.info("Running OCR...")
         if self.engine:
-            text = self.engine.extract(processed_image)
+            page = await asyncio.to_thread(self.engine.extract_page, processed_image, **ocr_options)
+            text = page.text
+            confidence = page.mean_confidence
         else:
+            page = None
             text = "MOCK OCR RESULT (Engine not found)"
-        
+            confidence = 0.95
+
         return {
             "text": text,
-            "confidence": 0.95 if text else 0.0,
+            "page": page,
+            "confidence": confidence if text else 0.0,
             "engine": self.engine_name
         }
@@ -0,0 +1,180 @@
+"""
+DocVerify AI - Staged Pipeline Executor
+
+A small DAG runner for the verification pipeline. Each stage declares the
+named values it consumes and produces; a stage starts as soon as all of
+its inputs exist, so independent stages (OCR and image checks, say) run
+concurrently without hand-written orchestration.
+
+- Each stage runs at most once per run and its outputs are shared by all
+  consumers (memoized per run). Outputs supplied up front skip the stage
+  that would produce them, which is how callers plug in cached results.
+- Blocking stages run on a given executor instead of the event loop.
+- Per-stage wall-clock timings are recorded on the run, and each stage
+  runs in its own "pipeline.<stage>" tracing span.
+"""
+
+import asyncio
+import contextvars
+import inspect
+import time
+from concurrent.futures import Executor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from structlog import get_logger
+
+from src.core.tracing import span
+
+logger = get_logger()
+
+
+class PipelineError(Exception):
+    """A required stage failed."""
+
+    def __init__(self, stage: str, error: BaseException):
+        super().__init__(f"Stage '{stage}' failed: {error}")
+        self.stage = stage
+        self.error = error
+
+
+@dataclass
+class Stage:
+    """
+    One pipeline step.
+
+    func receives its inputs as keyword arguments. With a single output it
+    returns that value; with several it returns a dict keyed by output name.
+    """
+    name: str
+    func: Callable[..., Any]
+    inputs: Tuple[str, ...] = ()
+    outputs: Tuple[str, ...] = ()
+    executor: Optional[Executor] = None  # run a blocking func off the event loop
+    optional: bool = False  # on failure, outputs become None instead of failing the run
+
+
+@dataclass
+class PipelineRun:
+    """Values produced by one run, with per-stage timings and failures."""
+    values: Dict[str, Any]
+    timings_ms: Dict[str, float] = field(default_factory=dict)
+    errors: Dict[str, str] = field(default_factory=dict)
+    skipped: List[str] = field(default_factory=list)
+
+    def __getitem__(self, name: str) -> Any:
+        return self.values[name]
+
+    def get(self, name: str, default: Any = None) -> Any:
+        return self.values.get(name, default)
+
+
+def agent_stage(name: str, agent, inputs: Tuple[str, ...], outputs: Tuple[str, ...], **options) -> Stage:
+    """Wrap a BaseAgent (input dict -> output dict) as a stage."""
+
+    async def run_agent(**input_data):
+        result = await agent.process(input_data)
+        return result[outputs[0]] if len(outputs) == 1 else {key: result.get(key) for key in outputs}
+
+    return Stage(name=name, func=run_agent, inputs=inputs, outputs=outputs, **options)
+
+
+class StagedPipeline:
+    """Validated stage graph; run() may be called concurrently."""
+
+    def __init__(self, stages: Iterable[Stage]):
+        self.stages: List[Stage] = list(stages)
+        self._producers: Dict[str, Stage] = {}
+        for stage in self.stages:
+            for output in stage.outputs:
+                if output in self._producers:
+                    raise ValueError(f"Output '{output}' produced by both '{self._producers[output].name}' and '{stage.name}'")
+                self._producers[output] = stage
+        self._check_acyclic()
+
+    def _check_acyclic(self):
+        visiting, done = set(), set()
+
+        def visit(stage: Stage):
+            if stage.name in done:
+                return
+            if stage.name in visiting:
+                raise ValueError(f"Pipeline cycle through stage '{stage.name}'")
+            visiting.add(stage.name)
+            for name in stage.inputs:
+                if name in self._producers:
+                    visit(self._producers[name])
+            visiting.discard(stage.name)
+            done.add(stage.name)
+
+        for stage in self.stages:
+            visit(stage)
+
+    async def _call(self, stage: Stage, kwargs: Dict[str, Any]) -> Any:
+        if stage.executor is not None:
+            loop = asyncio.get_running_loop()
+            # Carry the current span (and log context) into the worker thread
+            context = contextvars.copy_context()
+            return await loop.run_in_executor(stage.executor, lambda: context.run(stage.func, **kwargs))
+        result = stage.func(**kwargs)
+        return await result if inspect.isawaitable(result) else result
+
+    async def run(self, **inputs: Any) -> PipelineRun:
+        """
+        Execute every stage whose outputs were not supplied.
+
+        Raises:
+            PipelineError: a non-optional stage raised
+            ValueError: a stage needs a value nobody provides
+        """
+        loop = asyncio.get_running_loop()
+        run = PipelineRun(values=dict(inputs))
+        ready: Dict[str, asyncio.Future] = {}
+        for name, value in inputs.items():
+            ready[name] = loop.create_future()
+            ready[name].set_result(value)
+
+        pending = []
+        for stage in self.stages:
+            if stage.outputs and all(name in inputs for name in stage.outputs):
+                run.skipped.append(stage.name)
+                continue
+            for name in stage.outputs:
+                ready[name] = loop.create_future()
+            pending.append(stage)
+        for stage in pending:
+            missing = [name for name in stage.inputs if name not in ready]
+            if missing:
+                raise ValueError(f"Stage '{stage.name}' needs unknown value(s): {', '.join(missing)}")
+
+        async def execute(stage: Stage):
+            kwargs = {name: await ready[name] for name in stage.inputs}
+            start = time.perf_counter()
+            try:
+                with span(f"pipeline.{stage.name}"):
+                    result = await self._call(stage, kwargs)
+            except Exception as e:
+                run.errors[stage.name] = str(e)
+                if not stage.optional:
+                    raise PipelineError(stage.name, e) from e
+                logger.warning("Optional stage failed", stage=stage.name, error=str(e))
+                result = None if len(stage.outputs) == 1 else {}
+            finally:
+                run.timings_ms[stage.name] = round((time.perf_counter() - start) * 1000, 1)
+
+            produced = {stage.outputs[0]: result} if len(stage.outputs) == 1 else (result or {})
+            for name in stage.outputs:
+                run.values[name] = produced.get(name)
+                ready[name].set_result(run.values[name])
+
+        tasks = [asyncio.ensure_future(execute(stage)) for stage in pending]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            # Let cancelled stages unwind before reporting
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+        logger.debug("Pipeline run complete", timings_ms=run.timings_ms, skipped=run.skipped)
+        return run
@@ -1,108 +1,659 @@
+import asyncio
+import contextvars
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 import cv2
 import numpy as np
 from structlog import get_logger
-from typing import Dict, Any
+from typing import Callable, Dict, Any, Iterator, List, Optional, Tuple
 
 from src.classification.engine import DocumentClassifier
 from src.extraction.engine import ExtractionEngine
 from src.preprocessing.pipeline import ImagePreprocessor
 from src.validation.engine import ValidationEngine
+from src.core.config import get_settings
+from src.core.metrics import observe_stage, record_fallback, track_stage
+from src.core.model_registry import get_model_registry
+from src.core.tracing import traced
+from src.ocr.router import MultiLanguageOCREngine, acquire_engine, release_engine
+from src.ocr.page import OCRPage
+from src.ocr.script_detection import script_histogram, dominant_indic_language
+from src.ingestion import PageLimitError, iter_document_pages
+from src.orchestration.pipeline import PipelineError, Stage, StagedPipeline
+from src.detection import DetectionResult, detect_stamps_and_signatures
+from src.fraud import (
+    CopyMoveResult,
+    FaceRegion,
+    PerceptualHash,
+    TamperResult,
+    compute_perceptual_hash,
+    detect_copy_move,
+    detect_tampering,
+    extract_face
+)
 
 logger = get_logger()
+settings = get_settings()
 
 
-def _create_ocr_engine():
-    """Create OCR engine based on environment. Falls back to lighter engines."""
+def _create_primary_ocr_engine():
+    """
+    Get the shared English OCR engine based on environment. Falls back to lighter engines.
+    Engines come from the model registry, so agents on the same backend reuse the load.
+    """
     ocr_mode = os.environ.get("OCR_ENGINE", "auto")
 
     if ocr_mode == "tesseract":
-        from src.ocr.tesseract_engine import TesseractOCREngine
-        return TesseractOCREngine()
+        return acquire_engine("tesseract", "en")
 
     if ocr_mode == "auto":
         # Try PaddleOCR first, fall back to Tesseract
         try:
-            from src.ocr.paddle_engine import PaddleOCREngine
-            return PaddleOCREngine()
+            return acquire_engine("paddleocr", "en")
         except Exception as e:
             logger.warning("PaddleOCR unavailable, falling back to Tesseract", error=str(e))
+            record_fallback("ocr", "tesseract")
             try:
-                from src.ocr.tesseract_engine import TesseractOCREngine
-                return TesseractOCREngine()
+                return acquire_engine("tesseract", "en")
             except Exception as e2:
                 logger.error("No OCR engine available", error=str(e2))
                 raise e2
 
     # Default: PaddleOCR
-    from src.ocr.paddle_engine import PaddleOCREngine
-    return PaddleOCREngine()
+    return acquire_engine("paddleocr", "en")
+
+
+def _create_ocr_engine():
+    """
+    Create the OCR engine, wrapped in per-language routing when enabled.
+    The primary (English) engine is loaded eagerly; other languages load on demand.
+    """
+    primary = _create_primary_ocr_engine()
+    if not settings.OCR_LANGUAGE_ROUTING:
+        return primary
+    return MultiLanguageOCREngine(backend=primary.engine_name, primary=primary)
+
+
+def group_pages_by_type(page_types: List[Dict[str, Any]]) -> List[List[int]]:
+    """
+    Split a multi-page upload into documents from per-page rule classification.
+
+    A page starts a new document when it is confidently classified as a
+    different type than the current one; unknown or low-confidence pages
+    (backsides, continuation pages) stay with the preceding document.
+    """
+    segments: List[List[int]] = []
+    current_type = None
+    for index, page_type in enumerate(page_types):
+        doc_type = page_type.get("type", "unknown")
+        confident = doc_type != "unknown" and page_type.get("confidence", 0.0) > 0.6
+        if not segments or (confident and current_type is not None and doc_type != current_type):
+            segments.append([index])
+        else:
+            segments[-1].append(index)
+        if confident and (current_type is None or doc_type != current_type):
+            current_type = doc_type
+    return segments
+
+
+@dataclass
+class PageImageChecks:
+    """Image-only checks of one page (no OCR needed, so they run beside it)."""
+    detections: DetectionResult
+    tamper: Optional[TamperResult] = None
+    copy_move: Optional[CopyMoveResult] = None
+    face: Optional[Tuple[FaceRegion, np.ndarray]] = None
+
+
+class PageImageStream:
+    """
+    Hands page images from the OCR thread to the async image-check stage.
+    The one-slot queue gives backpressure, so only a couple of page images
+    are alive at a time however long the document is.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self._loop = loop
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=1)
+        self._abandoned = False
+
+    def put(self, index: int, image: np.ndarray):
+        """Called from the producer thread; blocks while the consumer is busy."""
+        if not self._abandoned:
+            asyncio.run_coroutine_threadsafe(self._queue.put((index, image)), self._loop).result()
+
+    def close(self):
+        self.put(-1, None)
+
+    def abandon(self):
+        """Consumer is gone: drop further pages and unblock a waiting producer."""
+        self._abandoned = True
+        while not self._queue.empty():
+            self._queue.get_nowait()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> Tuple[int, np.ndarray]:
+        index, image = await self._queue.get()
+        if image is None:
+            raise StopAsyncIteration
+        return index, image
+
+
+def run_image_checks(
+    image: np.ndarray,
+    run_fraud_check: bool = True,
+    describe_face: bool = False,
+    cancelled: Optional[threading.Event] = None
+) -> PageImageChecks:
+    """
+    Stamp/signature detection plus, optionally, tamper and copy-move
+    forensics and the portrait descriptor, all on the original page.
+
+    Once `cancelled` is set the remaining checks are skipped (and copy-move
+    stops between LSH tables), so abandoned work frees its worker thread
+    instead of competing with the next request.
+    """
+    cancelled = cancelled or threading.Event()
+    with track_stage("image_checks", "stamps"):
+        checks = PageImageChecks(detections=detect_stamps_and_signatures(image))
+    if run_fraud_check and not cancelled.is_set():
+        with track_stage("image_checks", "tamper"):
+            checks.tamper = detect_tampering(image)
+        if not cancelled.is_set():
+            with track_stage("image_checks", "copy_move"):
+                checks.copy_move = detect_copy_move(image, cancelled=cancelled)
+    if describe_face and not cancelled.is_set():
+        with track_stage("image_checks", "face"):
+            checks.face = extract_face(image)
+    return checks
+
+
+def select_face(checks: Dict[int, PageImageChecks]) -> Dict[str, Any]:
+    """The document's portrait (largest face over all pages) and its descriptor."""
+    faces = [(index, c.face) for index, c in checks.items() if c.face is not None]
+    if not faces:
+        return {"face": None}
+    index, (region, descriptor) = max(faces, key=lambda item: item[1][0].area)
+    return {
+        "face": {**region.to_dict(), "page": index},
+        "face_descriptor": [round(float(v), 6) for v in descriptor]
+    }
+
+
+def summarize_forensics(
+    tamper_results: Dict[int, TamperResult],
+    copy_move_results: Dict[int, CopyMoveResult]
+) -> Dict[str, Any]:
+    """
+    Document-level forensic fields: worst page tamper score, per-page
+    details and fraud flags. Copy-move findings are reported as flags and
+    under copy_move_analysis but not folded into tamper_score.
+    """
+    flags = []
+    for index in sorted(set(tamper_results) | set(copy_move_results)):
+        tamper = tamper_results.get(index)
+        if tamper is not None and tamper.is_suspicious:
+            flags.append({
+                "type": "tampering",
+                "severity": "high",
+                "description": f"Page {index + 1} shows signs of local image manipulation",
+                "page": index,
+                **tamper.to_dict()
+            })
+        copy_move = copy_move_results.get(index)
+        if copy_move is not None and copy_move.is_suspicious:
+            flags.append({
+                "type": "copy_move",
+                "severity": "high",
+                "description": f"Page {index + 1} contains {len(copy_move.region_pairs)} duplicated region(s)",
+                "page": index,
+                **copy_move.to_dict()
+            })
+    return {
+        "tamper_score": max((t.tamper_score for t in tamper_results.values()), default=0.0),
+        "tamper_analysis": {index: t.to_dict() for index, t in sorted(tamper_results.items())},
+        "copy_move_analysis": {index: c.to_dict() for index, c in sorted(copy_move_results.items())},
+        "fraud_flags": flags
+    }
 
 
 class DocumentProcessor:
     """
     Orchestrates the full document verification pipeline.
     Image -> Preprocess -> OCR -> Classify -> Extract -> Validate
+    Text-layer PDFs skip straight from ingestion to Classify.
+    Image-only checks (stamps, tampering, copy-move, portrait) run in a thread pool
+    alongside OCR and are joined before the response.
     """
 
     def __init__(self):
         logger.info("Initializing Document Processor...")
+        self.load_timings: Dict[str, float] = {}
         try:
-            self.preprocessor = ImagePreprocessor()
-            self.ocr = _create_ocr_engine()
-            self.classifier = DocumentClassifier()
-            self.extractor = ExtractionEngine()
-            self.validator = ValidationEngine()
-            logger.info("Document Processor initialized successfully")
+            self.preprocessor = self._timed_load("preprocessor", ImagePreprocessor)
+            self.ocr = self._timed_load("ocr", _create_ocr_engine)
+            registry = get_model_registry()
+            self.classifier = self._timed_load(
+                "classifier", lambda: registry.acquire(("classifier",), DocumentClassifier)
+            )
+            self.extractor = self._timed_load(
+                "extractor", lambda: registry.acquire(("extractor",), ExtractionEngine)
+            )
+            self.validator = self._timed_load(
+                "validator", lambda: registry.acquire(("validator",), ValidationEngine)
+            )
+            # OCR engines aren't thread-safe: one dedicated thread keeps this
+            # processor's requests in order without blocking the event loop
+            # (widened by use_ocr_agents() when agents own their engines)
+            self.ocr_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ocr")
+            # OpenCV releases the GIL, so image checks overlap with OCR
+            self.image_check_executor = ThreadPoolExecutor(
+                max_workers=settings.FRAUD_CHECK_WORKERS,
+                thread_name_prefix="image-checks"
+            )
+            self.ocr_agents = None
+            self._agent_loop: Optional[asyncio.AbstractEventLoop] = None
+            self.pipeline = self.build_pipeline()
+            logger.info("Document Processor initialized successfully", load_timings_ms=self.load_timings)
         except Exception as e:
             logger.error("Failed to initialize Document Processor", error=str(e))
             raise e
 
-    async def process(self, image_path: str) -> Dict[str, Any]:
+    def _timed_load(self, component: str, factory):
+        """Construct a component and record its import/model-load time."""
+        start = time.perf_counter()
+        instance = factory()
+        self.load_timings[component] = round((time.perf_counter() - start) * 1000, 1)
+        return instance
+
+    def warmup(self, image_path: str):
+        """
+        Run one preprocess + OCR pass so first-inference allocations and
+        kernel selection happen before the first real request.
+        LLM fallbacks are not exercised (network-bound, nothing to warm).
+        """
+        logger.info("Running warmup inference", path=image_path)
+        processed_image = self.preprocessor.process_path(image_path)
+        text = self.ocr.extract_page(processed_image).text
+        self.classifier.classify_by_rules(text)
+        logger.info("Warmup inference complete", char_count=len(text))
+
+    def use_ocr_agents(self, agents, loop: asyncio.AbstractEventLoop):
+        """
+        Send page OCR to the "ocr" pool of an AgentManager running on `loop`.
+
+        Pooled agents own their engines, so OCR stages of concurrent requests
+        no longer queue on one thread: the OCR executor grows to the pool's
+        max size and this processor's own engines are released.
+        """
+        max_size = agents.pool_metrics()["ocr"]["max_size"]
+        previous = self.ocr_executor
+        self.ocr_agents = agents
+        self._agent_loop = loop
+        self.ocr_executor = ThreadPoolExecutor(max_workers=max_size, thread_name_prefix="ocr")
+        self.pipeline = self.build_pipeline()
+        previous.shutdown(wait=False)
+
+        if isinstance(self.ocr, MultiLanguageOCREngine):
+            self.ocr.close()
+        # The primary engine came from _create_primary_ocr_engine()
+        release_engine(self.ocr.engine_name, "en")
+        logger.info("OCR served by agent pool", max_size=max_size)
+
+    def extract_page(self, image: np.ndarray, **ocr_options) -> OCRPage:
+        """OCR one preprocessed page, on a pooled agent when use_ocr_agents() was called."""
+        if self.ocr_agents is None:
+            return self.ocr.extract_page(image, **ocr_options)
+        dispatched = self.ocr_agents.dispatch("ocr", {"image": image, "ocr_options": ocr_options})
+        return asyncio.run_coroutine_threadsafe(dispatched, self._agent_loop).result()["page"]
+
+    def build_ocr_options(
+        self,
+        angle_cls: Optional[bool] = None,
+        psm: Optional[int] = None,
+        whitelist: Optional[str] = None,
+        language_hint: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Build per-request keyword arguments understood by the active OCR engine.
+        """
+        options = {}
+        engine_name = getattr(self.ocr, "engine_name", None)
+        if language_hint and isinstance(self.ocr, MultiLanguageOCREngine):
+            options["language_hint"] = language_hint
+        if angle_cls is not None and engine_name == "paddleocr":
+            options["use_angle_cls"] = angle_cls
+        if engine_name == "tesseract":
+            if psm is not None:
+                options["psm"] = psm
+            if whitelist:
+                options["whitelist"] = whitelist
+        return options
+
+    def ocr_document(
+        self,
+        path: str,
+        preprocess: bool = True,
+        use_text_layer: Optional[bool] = None,
+        password: Optional[str] = None,
+        on_image: Optional[Callable[[int, np.ndarray, np.ndarray], None]] = None,
+        **ocr_options
+    ) -> Iterator[OCRPage]:
+        """
+        Stream OCR pages for a document (image or multi-page PDF).
+
+        Pages with a usable embedded text layer skip rendering, preprocessing
+        and OCR entirely (engine "native_text"); rendered pages are released
+        as soon as they have been OCR'd.
+
+        Args:
+            path: Path to an image or PDF
+            preprocess: Run the preprocessing pipeline on rendered pages
+            use_text_layer: Trust embedded PDF text (default: PDF_NATIVE_TEXT)
+            password: Password for encrypted PDFs
+            on_image: Called with (page index, original image, preprocessed image)
+                before OCR, for image-level checks that must not keep pages alive
+            **ocr_options: Per-request OCR engine options
+        """
+        if use_text_layer is None:
+            use_text_layer = settings.PDF_NATIVE_TEXT
+
+        for doc_page in iter_document_pages(path, use_text_layer=use_text_layer, password=password):
+            if doc_page.has_text_layer:
+                language = dominant_indic_language(script_histogram(doc_page.text)) or "en"
+                logger.info("Using embedded text layer", page=doc_page.index, language=language)
+                yield OCRPage.from_text(doc_page.text, engine="native_text", language=language)
+                continue
+
+            original = doc_page.image
+            doc_page.image = None
+            image = self.preprocessor.process(original) if preprocess else original
+            if on_image is not None:
+                on_image(doc_page.index, original, image)
+            del original
+            yield self.extract_page(image, **ocr_options)
+
+    def build_pipeline(self) -> StagedPipeline:
+        """
+        Stage graph behind process(). OCR and the image checks both start
+        from the upload, so they run side by side; analysis waits for OCR
+        only.
+        """
+        return StagedPipeline([
+            Stage(
+                "ocr", self._ocr_stage,
+                inputs=("image_path", "force_ocr", "password", "ocr_options", "page_stream"),
+                outputs=("pages", "page_types", "perceptual_hash"),
+                executor=self.ocr_executor
+            ),
+            Stage(
+                "image_checks", self._image_check_stage,
+                inputs=("page_stream", "run_fraud_check", "describe_face", "fraud_time_budget_ms"),
+                outputs=("image_checks", "timed_out_pages"),
+                optional=True
+            ),
+            Stage("analysis", self._analysis_stage, inputs=("pages", "page_types"), outputs=("documents",)),
+        ])
+
+    def _ocr_stage(
+        self,
+        image_path: str,
+        force_ocr: bool,
+        password: Optional[str],
+        ocr_options: Dict[str, Any],
+        page_stream: PageImageStream
+    ) -> Dict[str, Any]:
+        """Stream pages through preprocessing and OCR, tagging each with a cheap rule-based type."""
+        pages: List[OCRPage] = []
+        page_types: List[Dict[str, Any]] = []
+        image_hashes: List[PerceptualHash] = []
+
+        def inspect_image(index: int, original: np.ndarray, processed: np.ndarray):
+            # The first imaged page identifies the document for near-duplicate search
+            if not image_hashes:
+                image_hashes.append(compute_perceptual_hash(processed))
+            # Image checks need the untouched pixels, not the preprocessed page
+            page_stream.put(index, original)
+
+        try:
+            for ocr_page in self.ocr_document(
+                image_path,
+                use_text_layer=False if force_ocr else None,
+                password=password,
+                on_image=inspect_image,
+                **ocr_options
+            ):
+                pages.append(ocr_page)
+                page_types.append(self.classifier.classify_by_rules(ocr_page.text))
+        finally:
+            page_stream.close()
+        if not pages:
+            raise ValueError(f"No pages found in {image_path}")
+        return {
+            "pages": pages,
+            "page_types": page_types,
+            "perceptual_hash": image_hashes[0] if image_hashes else None
+        }
+
+    async def _image_check_stage(
+        self,
+        page_stream: PageImageStream,
+        run_fraud_check: bool,
+        describe_face: bool,
+        fraud_time_budget_ms: int
+    ) -> Dict[str, Any]:
+        """
+        Run image checks on each page as OCR releases it, for at most the
+        fraud budget counted from when the first page reaches the checks.
+        Pages arriving after that and checks still running then are
+        reported as timed out rather than delaying the response; running
+        checks are told to stop at their next checkpoint.
+        """
+        running: Dict[asyncio.Future, int] = {}
+        results: Dict[int, PageImageChecks] = {}
+        timed_out: List[int] = []
+        cancelled = threading.Event()
+        deadline: Optional[float] = None
+
+        def harvest(done):
+            for task in done:
+                index = running.pop(task)
+                try:
+                    results[index] = task.result()
+                except Exception as e:
+                    logger.warning("Image checks failed", page=index, error=str(e))
+
+        try:
+            async for index, image in page_stream:
+                if deadline is None:
+                    deadline = time.perf_counter() + fraud_time_budget_ms / 1000
+                elif time.perf_counter() > deadline:
+                    timed_out.append(index)
+                    continue
+                # Bound in-flight checks (each holds a page image)
+                if len(running) >= 2 * settings.FRAUD_CHECK_WORKERS:
+                    done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                    harvest(done)
+                future = self.image_check_executor.submit(
+                    contextvars.copy_context().run,
+                    run_image_checks, image, run_fraud_check, describe_face, cancelled
+                )
+                running[asyncio.wrap_future(future)] = index
+        finally:
+            page_stream.abandon()
+
+        if running:
+            done, pending = await asyncio.wait(running, timeout=max(0.0, deadline - time.perf_counter()))
+            harvest(done)
+            if pending:
+                cancelled.set()
+            for task in pending:
+                task.cancel()
+                timed_out.append(running.pop(task))
+        if timed_out:
+            logger.warning("Image checks exceeded time budget", pages=sorted(timed_out))
+        return {"image_checks": results, "timed_out_pages": sorted(timed_out)}
+
+    async def _analysis_stage(self, pages: List[OCRPage], page_types: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Classify, extract and validate each document in the upload.
+        A scanner batch can hold several documents; most uploads hold one.
+        """
+        documents = []
+        for segment in group_pages_by_type(page_types):
+            documents.append(await self._analyze([pages[i] for i in segment], segment))
+        return documents
+
+    async def _analyze(self, pages: List[OCRPage], page_indices: List[int]) -> Dict[str, Any]:
+        """Classify, extract and validate one document made of the given pages."""
+        text = "\n\n".join(p.text for p in pages if p.text)
+
+        # 3. Classification
+        classification = await self.classifier.classify(text)
+        doc_type = classification.get("type", "unknown")
+        logger.info("Document Classified", doc_type=doc_type, pages=page_indices)
+
+        # 4. Extraction (the first page carries the identity fields; layout extraction uses it)
+        extracted_data = {}
+        if doc_type != "unknown":
+            extracted_data = await self.extractor.extract(text, doc_type, page=pages[0])
+
+        # 5. Validation
+        validation_result = {}
+        if extracted_data:
+            validation_result = self.validator.validate(extracted_data, doc_type)
+            logger.info("Validation complete", valid=validation_result.get("is_valid"))
+
+        return {
+            "pages": page_indices,
+            "document_type": doc_type,
+            "confidence": classification.get("confidence", 0.0),
+            "extracted_fields": extracted_data,
+            "validation": validation_result,
+            "classification": classification
+        }
+
+    @traced("processor.process")
+    async def process(
+        self,
+        image_path: str,
+        angle_cls: Optional[bool] = None,
+        language_hint: Optional[str] = None,
+        force_ocr: bool = False,
+        password: Optional[str] = None,
+        run_fraud_check: bool = True,
+        fraud_time_budget_ms: Optional[int] = None,
+        describe_face: bool = True
+    ) -> Dict[str, Any]:
         """
         Process a document from file path.
+
+        Args:
+            image_path: Path to the uploaded document
+            angle_cls: Force PaddleOCR's angle classifier on/off; None = decide per page
+            language_hint: Skip script detection and OCR with this language's model
+            force_ocr: OCR every page even when a PDF has a usable text layer
+            password: Password for encrypted PDFs (e.g. e-Aadhaar)
+            run_fraud_check: Run tamper and copy-move detection on each imaged page
+            fraud_time_budget_ms: How long image checks may run, counted from
+                when the first page reaches them (default: FRAUD_TIME_BUDGET_MS)
+            describe_face: Locate the portrait and compute its descriptor
+                (skip when the document's descriptor is already indexed)
         """
+        start = time.perf_counter()
         try:
             logger.info("Starting processing", path=image_path)
             
-            # 1. Load & Preprocess
-            # ImagePreprocessor handles loading and full pipeline
-            processed_image = self.preprocessor.process_path(image_path)
-            
-            # 2. OCR
-            text = self.ocr.extract(processed_image)
-            logger.info("OCR Text extracted", snippet=text[:100])
-            
-            # 3. Classification
-            classification = await self.classifier.classify(text)
-            doc_type = classification.get("type", "unknown")
-            logger.info("Document Classified", doc_type=doc_type)
-            
-            # 4. Extraction
-            extracted_data = {}
-            if doc_type != "unknown":
-                extracted_data = await self.extractor.extract(text, doc_type)
-            
-            # 5. Validation
-            validation_result = {}
-            if extracted_data:
-                validation_result = self.validator.validate(extracted_data, doc_type)
-                logger.info("Validation complete", valid=validation_result.get("is_valid"))
-                
+            # 1-2. Preprocess & OCR, with image checks alongside;
+            # 3-5. Classify, Extract & Validate once OCR is done
+            run = await self.pipeline.run(
+                image_path=image_path,
+                force_ocr=force_ocr,
+                password=password,
+                ocr_options=self.build_ocr_options(angle_cls=angle_cls, language_hint=language_hint),
+                page_stream=PageImageStream(asyncio.get_running_loop()),
+                run_fraud_check=run_fraud_check,
+                describe_face=describe_face,
+                fraud_time_budget_ms=fraud_time_budget_ms or settings.FRAUD_TIME_BUDGET_MS
+            )
+            for stage, elapsed_ms in run.timings_ms.items():
+                observe_stage("pipeline", stage, elapsed_ms / 1000)
+            pages: List[OCRPage] = run["pages"]
+            page_types = run["page_types"]
+            documents = run["documents"]
+            checks: Dict[int, PageImageChecks] = run.get("image_checks") or {}
+            image_hash: Optional[PerceptualHash] = run["perceptual_hash"]
+
+            text = "\n\n".join(p.text for p in pages if p.text)
+            engines = sorted({p.engine for p in pages})
+            logger.info("OCR Text extracted", snippet=text[:100], pages=len(pages), engines=engines)
+
+            primary = documents[0]
+            page = pages[0]
+            classification = primary["classification"]
+
             result = {
                 "status": "success",
-                "document_type": doc_type,
-                "confidence": classification.get("confidence", 0.0),
-                "extracted_fields": extracted_data,
-                "validation": validation_result,
+                "document_type": primary["document_type"],
+                "confidence": primary["confidence"],
+                "extracted_fields": primary["extracted_fields"],
+                "validation": primary["validation"],
                 "raw_text": text,
-                "classification_method": classification.get("method", "unknown")
+                "ocr_confidence": page.mean_confidence,
+                "ocr_engine_used": "+".join(engines),
+                "detected_language": page.language,
+                "page_count": len(pages),
+                "pages": [
+                    {
+                        "index": index,
+                        "ocr_engine": p.engine,
+                        "char_count": len(p.text),
+                        "ocr_confidence": p.mean_confidence,
+                        "document_type": page_types[index]["type"]
+                    }
+                    for index, p in enumerate(pages)
+                ],
+                "perceptual_hash": image_hash.to_dict() if image_hash else None,
+                "stamps_detected": [
+                    {**stamp, "page": index}
+                    for index, c in sorted(checks.items()) for stamp in c.detections.stamps
+                ],
+                "signatures_detected": [
+                    {**signature, "page": index}
+                    for index, c in sorted(checks.items()) for signature in c.detections.signatures
+                ],
+                "classification_method": classification.get("method", "unknown"),
+                "stage_timings_ms": run.timings_ms,
+                "processing_time_ms": int((time.perf_counter() - start) * 1000)
             }
+            observe_stage("pipeline", "total", time.perf_counter() - start)
+            if run_fraud_check:
+                result.update(summarize_forensics(
+                    {index: c.tamper for index, c in checks.items() if c.tamper},
+                    {index: c.copy_move for index, c in checks.items() if c.copy_move}
+                ))
+                result["fraud_check_timed_out_pages"] = run.get("timed_out_pages") or []
+            if describe_face:
+                result.update(select_face(checks))
+            if len(documents) > 1:
+                result["documents"] = [
+                    {key: value for key, value in doc.items() if key != "classification"}
+                    for doc in documents
+                ]
             return result
             
         except Exception as e:
-            logger.error("Processing failed", error=str(e))
-            return {
+            error = e.error if isinstance(e, PipelineError) else e
+            logger.error("Processing failed", error=str(error), stage=getattr(e, "stage", None))
+            result = {
                 "status": "failed",
-                "error": str(e)
+                "error": str(error)
             }
+            if isinstance(error, PageLimitError):
+                result["error_code"] = "page_limit_exceeded"
+            return result
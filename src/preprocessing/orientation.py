@@ -0,0 +1,175 @@
+"""
+DocVerify AI - Page Orientation Detection
+
+Cheap once-per-page orientation check, run on a thumbnail, used to decide
+whether PaddleOCR's per-line angle classifier is needed at all.
+
+Tesseract OSD reports both orientation and script, so one OSD run per page
+is shared with script detection (see read_osd).
+"""
+
+import threading
+import weakref
+import cv2
+import numpy as np
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+from structlog import get_logger
+
+logger = get_logger()
+
+# Longest side of the thumbnail used for orientation checks
+THUMBNAIL_MAX_SIDE = 1024
+
+# Tesseract OSD orientation confidence below which the result is ignored
+OSD_MIN_CONFIDENCE = 2.0
+
+# Ratio of row/column projection irregularity needed to call the text direction
+PROJECTION_RATIO_THRESHOLD = 1.5
+
+
+@dataclass
+class OrientationResult:
+    """Result of a page orientation check."""
+    rotation: int  # Clockwise degrees needed to make the page upright (0, 90, 180, 270)
+    confidence: float
+    method: str
+    needs_angle_cls: bool
+
+
+def make_thumbnail(image: np.ndarray, max_side: int = THUMBNAIL_MAX_SIDE) -> np.ndarray:
+    """
+    Downscale image to a grayscale thumbnail with the longest side <= max_side.
+    """
+    if len(image.shape) == 3:
+        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    else:
+        gray = image
+
+    height, width = gray.shape[:2]
+    scale = max_side / float(max(height, width))
+    if scale < 1.0:
+        gray = cv2.resize(gray, (int(width * scale), int(height * scale)), interpolation=cv2.INTER_AREA)
+    return gray
+
+
+# Last page OSD'd in each thread: OCR threads work one page at a time, so
+# orientation and script detection on the same page array share one run
+_osd_cache = threading.local()
+
+
+def _run_osd(image: np.ndarray) -> Optional[Dict[str, Any]]:
+    try:
+        import pytesseract
+        from PIL import Image
+
+        return pytesseract.image_to_osd(
+            Image.fromarray(make_thumbnail(image)),
+            output_type=pytesseract.Output.DICT
+        )
+    except Exception as e:
+        logger.debug("Tesseract OSD unavailable", error=str(e))
+        return None
+
+
+def read_osd(image: np.ndarray) -> Optional[Dict[str, Any]]:
+    """
+    Tesseract OSD for a page (orientation and script), or None when
+    pytesseract / osd.traineddata are unavailable.
+
+    The result is cached for the last page array seen in this thread, so
+    asking again for the same page does not start another subprocess.
+    """
+    cached = getattr(_osd_cache, "entry", None)
+    if cached is not None and cached[0]() is image:
+        return cached[1]
+    osd = _run_osd(image)
+    _osd_cache.entry = (weakref.ref(image), osd)
+    return osd
+
+
+def _detect_with_osd(image: np.ndarray) -> Optional[OrientationResult]:
+    """
+    Use Tesseract OSD when pytesseract and osd.traineddata are available.
+    """
+    osd = read_osd(image)
+    if osd is None:
+        return None
+    confidence = float(osd.get("orientation_conf", 0.0))
+    if confidence < OSD_MIN_CONFIDENCE:
+        return None
+
+    rotation = int(osd.get("rotate", 0)) % 360
+    return OrientationResult(
+        rotation=rotation,
+        confidence=confidence,
+        method="tesseract_osd",
+        # OSD already resolved 180° flips, so per-line classification is redundant
+        needs_angle_cls=False
+    )
+
+
+def _detect_with_projection(thumbnail: np.ndarray) -> OrientationResult:
+    """
+    Projection-profile heuristic.
+
+    Horizontal text lines make the row profile alternate between ink and gaps,
+    while the column profile stays flat; vertical text does the opposite.
+    The heuristic cannot tell 0° from 180°, so it only skips the angle classifier
+    when lines are clearly horizontal.
+    """
+    _, binary = cv2.threshold(thumbnail, 0, 255, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU)
+    ink = binary.astype(np.float32) / 255.0
+
+    rows = ink.sum(axis=1)
+    cols = ink.sum(axis=0)
+    row_cv = rows.std() / (rows.mean() + 1e-6)
+    col_cv = cols.std() / (cols.mean() + 1e-6)
+    ratio = row_cv / (col_cv + 1e-6)
+
+    if ratio >= PROJECTION_RATIO_THRESHOLD:
+        return OrientationResult(rotation=0, confidence=ratio, method="projection", needs_angle_cls=False)
+
+    if ratio <= 1.0 / PROJECTION_RATIO_THRESHOLD:
+        # Text runs vertically: rotate a quarter turn, let the classifier fix any remaining flip
+        return OrientationResult(rotation=90, confidence=1.0 / ratio, method="projection", needs_angle_cls=True)
+
+    return OrientationResult(rotation=0, confidence=ratio, method="projection", needs_angle_cls=True)
+
+
+def detect_orientation(image: np.ndarray, use_osd: bool = True) -> OrientationResult:
+    """
+    Detect page orientation once per page on a thumbnail.
+    Tries Tesseract OSD first, then falls back to the projection heuristic.
+    """
+    try:
+        result = _detect_with_osd(image) if use_osd else None
+        if result is None:
+            result = _detect_with_projection(make_thumbnail(image))
+
+        logger.info(
+            "Orientation detected",
+            rotation=result.rotation,
+            method=result.method,
+            needs_angle_cls=result.needs_angle_cls
+        )
+        return result
+
+    except Exception as e:
+        logger.error("Orientation detection failed", error=str(e))
+        return OrientationResult(rotation=0, confidence=0.0, method="failed", needs_angle_cls=True)
+
+
+def correct_orientation(image: np.ndarray, rotation: int) -> np.ndarray:
+    """
+    Rotate image clockwise by a multiple of 90 degrees.
+    """
+    rotations = {
+        90: cv2.ROTATE_90_CLOCKWISE,
+        180: cv2.ROTATE_180,
+        270: cv2.ROTATE_90_COUNTERCLOCKWISE,
+    }
+    code = rotations.get(rotation % 360)
+    if code is None:
+        return image
+    return cv2.rotate(image, code)
@@ -5,6 +5,7 @@ from structlog import get_logger
 from src.preprocessing.deskew import deskew_image
 from src.preprocessing.denoise import denoise_image
 from src.preprocessing.enhance import enhance_contrast
+from src.core.metrics import track_stage
 
 logger = get_logger()
 
@@ -37,15 +38,18 @@ class ImagePreprocessor:
         
         # 1. Deskew
         if self.do_deskew:
-            processed = deskew_image(processed)
+            with track_stage("preprocessing", "deskew"):
+                processed = deskew_image(processed)
             
         # 2. Denoise
         if self.do_denoise:
-            processed = denoise_image(processed)
+            with track_stage("preprocessing", "denoise"):
+                processed = denoise_image(processed)
             
         # 3. Enhance
         if self.do_enhance:
-            processed = enhance_contrast(processed)
+            with track_stage("preprocessing", "enhance"):
+                processed = enhance_contrast(processed)
             
         return processed
 
@@ -1,5 +1,6 @@
 from typing import Dict, Any, List
 from structlog import get_logger
+from src.core.metrics import timed
 from src.validation.validators import (
     validate_aadhaar, validate_pan, validate_date_format,
     validate_voter_id, validate_driving_license, validate_passport
@@ -12,6 +13,7 @@ class ValidationEngine:
     Orchestrates validation rules based on document type.
     """
     
+    @timed("validation", "rules")
     def validate(self, data: Dict[str, Any], doc_type: str) -> Dict[str, Any]:
         logger.info(f"Validating {doc_type}", fields=list(data.keys()))
         
@@ -0,0 +1,4 @@
+import os
+
+# Settings validation requires a key; unit tests never call the API
+os.environ.setdefault("GOOGLE_API_KEY", "test")
@@ -0,0 +1,121 @@
+import asyncio
+import time
+
+import pytest
+
+from src.orchestration.agent_manager import AgentManager
+from src.orchestration.agent_pool import AgentPool
+from src.orchestration.agents.base_agent import AgentStatus, BaseAgent
+
+
+class SleepAgent(BaseAgent):
+    spawned = 0
+    shut_down = 0
+
+    async def _initialize_impl(self, config):
+        SleepAgent.spawned += 1
+        self.delay = config.get("delay", 0.05)
+
+    async def _process_impl(self, input_data):
+        if input_data.get("fail"):
+            raise RuntimeError("boom")
+        await asyncio.sleep(self.delay)
+        return {"agent_id": self.agent_id, "value": input_data.get("value")}
+
+    async def _shutdown_impl(self):
+        SleepAgent.shut_down += 1
+
+
+@pytest.fixture(autouse=True)
+def reset_counters():
+    SleepAgent.spawned = SleepAgent.shut_down = 0
+
+
+def test_min_size_spawned_up_front():
+    async def scenario():
+        pool = AgentPool("sleep", SleepAgent, min_size=2, max_size=4)
+        await pool.start()
+        assert pool.size == 2
+        await pool.shutdown()
+        assert pool.size == 0
+
+    asyncio.run(scenario())
+    assert SleepAgent.spawned == SleepAgent.shut_down == 2
+
+
+def test_scales_out_to_max_size_then_queues():
+    async def scenario():
+        pool = AgentPool("sleep", SleepAgent, config={"delay": 0.1}, min_size=1, max_size=2)
+        await pool.start()
+        start = time.perf_counter()
+        results = await asyncio.gather(*(pool.submit({"value": i}) for i in range(4)))
+        elapsed = time.perf_counter() - start
+        metrics = pool.metrics()
+        await pool.shutdown()
+        return results, elapsed, metrics
+
+    results, elapsed, metrics = asyncio.run(scenario())
+    assert [result["value"] for result in results] == [0, 1, 2, 3]
+    assert len({result["agent_id"] for result in results}) == 2
+    # Two agents, four 100 ms requests: two rounds, not four
+    assert 0.18 < elapsed < 0.35
+    assert metrics["size"] == 2
+    assert metrics["dispatched"] == 4
+    assert metrics["max_queue_depth"] >= 1
+    assert metrics["in_flight"] == 0
+
+
+def test_failed_agents_are_retired_and_replaced():
+    async def scenario():
+        pool = AgentPool("sleep", SleepAgent, config={"delay": 0}, min_size=1, max_size=1)
+        await pool.start()
+        first = pool.agents[0]
+        with pytest.raises(RuntimeError):
+            await pool.submit({"fail": True})
+        assert first.status == AgentStatus.ERROR
+
+        result = await pool.submit({"value": 1})
+        failures = pool.metrics()["failures"]
+        await pool.shutdown()
+        return first, result, failures
+
+    first, result, failures = asyncio.run(scenario())
+    assert result["agent_id"] != first.agent_id
+    assert failures == 1
+    assert SleepAgent.spawned == 2
+
+
+def test_idle_agents_reaped_down_to_min_size():
+    async def scenario():
+        pool = AgentPool("sleep", SleepAgent, config={"delay": 0.05}, min_size=1, max_size=3, idle_timeout_s=0.05)
+        await pool.start()
+        await asyncio.gather(*(pool.submit({}) for _ in range(3)))
+        assert pool.size == 3
+        assert await pool.reap_idle() == 0  # not idle long enough yet
+        await asyncio.sleep(0.1)
+        reaped = await pool.reap_idle()
+        size = pool.size
+        await pool.shutdown()
+        return reaped, size
+
+    assert asyncio.run(scenario()) == (2, 1)
+
+
+def test_manager_dispatch_and_reaper():
+    async def scenario():
+        manager = AgentManager()
+        manager.register_agent_type("sleep", SleepAgent)
+        await manager.create_pool("sleep", config={"delay": 0}, min_size=0, max_size=2, idle_timeout_s=0.01)
+        result = await manager.dispatch("sleep", {"value": 7})
+        assert manager.pool_metrics()["sleep"]["size"] == 1
+
+        manager.start_reaper(interval_s=0.02)
+        await asyncio.sleep(0.1)
+        size = manager.pool_metrics()["sleep"]["size"]
+        await manager.shutdown_all()
+        return result, size
+
+    result, size = asyncio.run(scenario())
+    assert result["value"] == 7
+    assert size == 0
+    assert SleepAgent.shut_down == 1
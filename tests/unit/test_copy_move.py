@@ -0,0 +1,76 @@
+from pathlib import Path
+
+import cv2
+import numpy as np
+import pytest
+
+from src.fraud import CopyMoveResult, detect_copy_move
+from src.orchestration.processor import summarize_forensics
+
+ROOT = Path(__file__).resolve().parents[2]
+CLEAN_SAMPLES = sorted(
+    list(ROOT.glob("synthetic_data/samples/*.jpg"))
+    + [ROOT / name for name in ("sample_aadhaar.jpg", "valid_aadhaar.jpg", "test_input.jpg") if (ROOT / name).exists()]
+)
+
+# Generous budget so slow CI machines still run every LSH table
+BUDGET_MS = 5000
+
+
+def reencode(image):
+    _, buffer = cv2.imencode(".jpg", image, [cv2.IMWRITE_JPEG_QUALITY, 90])
+    return cv2.imdecode(buffer, cv2.IMREAD_COLOR)
+
+
+def card_with_text():
+    """A synthetic card: repeated labels and values in one font, like the shipped samples."""
+    image = np.full((540, 850, 3), 250, dtype=np.uint8)
+    for row, (label, value) in enumerate([
+        ("Name / Naam", "RAJESH KUMAR"),
+        ("Father's Name / Pita", "SURESH KUMAR"),
+        ("Date of Birth", "15/05/1990"),
+        ("Date of Issue", "15/05/2010"),
+    ]):
+        y = 80 + row * 90
+        cv2.putText(image, label, (40, y), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (60, 60, 60), 1, cv2.LINE_AA)
+        cv2.putText(image, value, (40, y + 35), cv2.FONT_HERSHEY_SIMPLEX, 0.9, (0, 0, 0), 2, cv2.LINE_AA)
+    return image
+
+
+@pytest.mark.parametrize("path", CLEAN_SAMPLES, ids=lambda path: path.name)
+def test_clean_samples_are_not_suspicious(path):
+    result = detect_copy_move(cv2.imread(str(path)), time_budget_ms=BUDGET_MS)
+
+    assert not result.is_suspicious, result.region_pairs
+    assert result.score == 0.0
+
+
+def test_repeated_text_is_not_a_clone():
+    result = detect_copy_move(reencode(card_with_text()), time_budget_ms=BUDGET_MS)
+
+    assert not result.is_suspicious, result.region_pairs
+
+
+def test_cloned_block_is_reported_with_its_displacement():
+    image = card_with_text()
+    texture = cv2.GaussianBlur(np.random.default_rng(1).integers(0, 255, (120, 120, 3), dtype=np.uint8), (3, 3), 0)
+    image[330:450, 400:520] = texture
+    image[100:220, 600:720] = texture
+
+    result = detect_copy_move(reencode(image), time_budget_ms=BUDGET_MS)
+
+    assert result.is_suspicious
+    assert result.score == 1.0
+    pair = result.region_pairs[0]
+    assert abs(pair["displacement"]["dx"] - 200) <= 6 and abs(pair["displacement"]["dy"] + 230) <= 6
+    assert abs(pair["source"]["x"] - 400) <= 10 and abs(pair["source"]["y"] - 330) <= 10
+    assert abs(pair["target"]["x"] - 600) <= 10 and abs(pair["target"]["y"] - 100) <= 10
+
+
+def test_copy_move_score_is_not_folded_into_tamper_score():
+    copy_move = CopyMoveResult(1.0, region_pairs=[{"matches": 40}])
+
+    summary = summarize_forensics({}, {0: copy_move})
+
+    assert summary["tamper_score"] == 0.0
+    assert [flag["type"] for flag in summary["fraud_flags"]] == ["copy_move"]
@@ -0,0 +1,97 @@
+import random
+
+from src.fraud.duplicate_index import BAND_OFFSETS, BAND_WIDTHS, NearDuplicateIndex
+from src.fraud.perceptual_hash import PerceptualHash
+
+
+def flip(value, positions):
+    for position in positions:
+        value ^= 1 << position
+    return value
+
+
+def spread(bits_per_band):
+    """Bit positions flipping the given number of bits in each band."""
+    positions = []
+    for offset, count in zip(BAND_OFFSETS, bits_per_band):
+        positions.extend(range(offset, offset + count))
+    return positions
+
+
+BASE = PerceptualHash(phash=0x0F0F_3C3C_A5A5_5A5A, dhash=0x1234_5678_9ABC_DEF0)
+
+
+def make_index(**thresholds):
+    index = NearDuplicateIndex(max_phash_distance=8, max_dhash_distance=10, **thresholds)
+    index.add("base", BASE)
+    return index
+
+
+def test_bands_cover_all_64_bits():
+    assert sum(BAND_WIDTHS) == 64
+    assert BAND_OFFSETS[0] == 0
+
+
+def test_exact_and_threshold_distance_found():
+    index = make_index()
+    assert [m.document_id for m in index.search(BASE)] == ["base"]
+
+    # 8 bits spread 3/3/2: only the last band is within its probe radius
+    query = PerceptualHash(flip(BASE.phash, spread((3, 3, 2))), BASE.dhash)
+    match = index.best_match(query)
+    assert match.document_id == "base"
+    assert match.phash_distance == 8
+
+    # All 8 flips in one band: the other two bands match exactly
+    query = PerceptualHash(flip(BASE.phash, spread((8, 0, 0))), BASE.dhash)
+    assert index.best_match(query).phash_distance == 8
+
+
+def test_beyond_threshold_not_found():
+    index = make_index()
+    query = PerceptualHash(flip(BASE.phash, spread((3, 3, 3))), BASE.dhash)
+    assert index.search(query) == []
+
+
+def test_matches_exhaustive_scan():
+    rng = random.Random(7)
+    index = NearDuplicateIndex(max_phash_distance=8, max_dhash_distance=64)
+    stored = {}
+    for i in range(200):
+        hashes = PerceptualHash(flip(BASE.phash, rng.sample(range(64), rng.randint(0, 12))), 0)
+        stored[f"doc{i}"] = hashes
+        index.add(f"doc{i}", hashes)
+
+    expected = sorted(doc_id for doc_id, h in stored.items() if BASE.distance(h) <= 8)
+    found = sorted(m.document_id for m in index.search(PerceptualHash(BASE.phash, 0), limit=len(stored)))
+    assert found == expected
+
+
+def test_dhash_confirmation_and_exclude():
+    index = make_index()
+    far_dhash = PerceptualHash(BASE.phash, flip(BASE.dhash, range(11)))
+    assert index.search(far_dhash) == []
+    assert index.search(BASE, exclude="base") == []
+
+
+def test_results_sorted_and_limited():
+    index = make_index()
+    index.add("near", PerceptualHash(flip(BASE.phash, [0]), BASE.dhash))
+    index.add("farther", PerceptualHash(flip(BASE.phash, [0, 30, 60]), BASE.dhash))
+    query = PerceptualHash(flip(BASE.phash, [0]), BASE.dhash)
+
+    assert [m.document_id for m in index.search(query)] == ["near", "base", "farther"]
+    assert [m.document_id for m in index.search(query, limit=2)] == ["near", "base"]
+
+
+def test_remove_and_replace():
+    index = make_index()
+    moved = PerceptualHash(~BASE.phash & (2 ** 64 - 1), BASE.dhash)
+    index.add("base", moved)
+    assert len(index) == 1
+    assert index.search(BASE) == []
+    assert index.best_match(moved).document_id == "base"
+
+    index.remove("base")
+    assert len(index) == 0
+    assert index.search(moved) == []
@@ -0,0 +1,50 @@
+import pytest
+
+from src.core.model_registry import ModelRegistry
+from src.ocr import easy_engine
+from src.ocr.easy_engine import EasyOCREngine
+
+
+class FakeReader:
+    def __init__(self, langs):
+        self.langs = langs
+
+    def readtext(self, image, **kwargs):
+        return []
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    registry = ModelRegistry()
+    monkeypatch.setattr(easy_engine, "get_model_registry", lambda: registry)
+    monkeypatch.setattr(easy_engine, "_create_reader", lambda langs, device, quantize: FakeReader(langs))
+    return registry
+
+
+def test_engines_share_a_reader_until_the_last_release(registry):
+    first = EasyOCREngine(languages=["hi", "en"], device="cpu", quantize=True)
+    second = EasyOCREngine(languages=["hi", "en"], device="cpu", quantize=True)
+
+    assert first._get_reader() is second._get_reader()
+    assert len(registry.stats()) == 1
+
+    first.close()
+    # Still held by the second engine
+    assert second._get_reader().readtext(None) == []
+    assert len(registry.stats()) == 1
+
+    second.close()
+    second.close()  # idempotent
+    assert registry.stats() == {}
+
+
+def test_instances_and_language_sets_get_their_own_readers(registry):
+    shared = EasyOCREngine(languages=["en"], device="cpu", quantize=True)
+    private = EasyOCREngine(languages=["en"], device="cpu", quantize=True, instance="agent-1")
+    tamil = EasyOCREngine(languages=["ta", "en"], device="cpu", quantize=True)
+
+    readers = {id(engine._get_reader().wrapped) for engine in (shared, private, tamil)}
+    assert len(readers) == 3
+
+    private.close()
+    assert len(registry.stats()) == 2
@@ -0,0 +1,92 @@
+from src.fraud.identity_index import IdentityIndex, normalize_identifier, normalize_name
+
+
+def test_normalize_identifier():
+    assert normalize_identifier("2345 6789 0124") == "234567890124"
+    assert normalize_identifier("2345-6789-0124") == "234567890124"
+    assert normalize_identifier("abcde1234f") == "ABCDE1234F"
+    assert normalize_identifier("MH/12/2015-0001234") == "MH1220150001234"
+    assert normalize_identifier(234567890124) == "234567890124"
+
+
+def test_normalize_name():
+    assert normalize_name("  rahul   kumar ") == "RAHUL KUMAR"
+    assert normalize_name("Rahul.Kumar-Sharma") == "RAHUL KUMAR SHARMA"
+    assert normalize_name(None) == ""
+
+
+def test_lookup_matches_formatting_variants():
+    index = IdentityIndex()
+    index.add("doc1", {"aadhaar_number": "2345 6789 0124", "name": "Rahul Kumar"})
+
+    assert index.lookup("aadhaar_number", "2345-6789-0124") == {"doc1": "RAHUL KUMAR"}
+    assert index.lookup("pan_number", "2345 6789 0124") == {}
+
+
+def test_find_reuse_reports_other_documents_and_names():
+    index = IdentityIndex()
+    index.add("doc1", {"aadhaar_number": "2345 6789 0124", "name": "Rahul Kumar"})
+    index.add("doc2", {"aadhaar_number": "234567890124", "name": "rahul  kumar"})
+    index.add("doc3", {"aadhaar_number": "2345-6789-0124", "pan_number": "ABCDE1234F", "name": "Priya Singh"})
+
+    fields = {"aadhaar_number": "2345 6789 0124", "pan_number": "abcde 1234 f", "name": "Rahul Kumar"}
+    findings = {finding["field"]: finding for finding in index.find_reuse("doc1", fields)}
+
+    aadhaar = findings["aadhaar_number"]
+    assert aadhaar["label"] == "Aadhaar"
+    assert aadhaar["document_ids"] == ["doc2", "doc3"]
+    assert aadhaar["other_document_count"] == 2
+    assert aadhaar["different_names"] == ["PRIYA SINGH"]
+    assert findings["pan_number"]["document_ids"] == ["doc3"]
+
+
+def test_no_reuse_for_own_document_or_missing_identifiers():
+    index = IdentityIndex()
+    index.add("doc1", {"pan_number": "ABCDE1234F", "name": "Rahul Kumar"})
+
+    assert index.find_reuse("doc1", {"pan_number": "ABCDE1234F"}) == []
+    assert index.find_reuse("doc2", {"name": "Rahul Kumar"}) == []
+    index.add("doc2", {"name": "No Identifiers"})
+    assert len(index) == 1
+
+
+def test_readd_and_remove_update_postings():
+    index = IdentityIndex()
+    index.add("doc1", {"pan_number": "ABCDE1234F"})
+    index.add("doc1", {"pan_number": "ZZZZZ9999Z"})
+    assert index.lookup("pan_number", "ABCDE1234F") == {}
+    assert list(index.lookup("pan_number", "ZZZZZ9999Z")) == ["doc1"]
+
+    index.remove("doc1")
+    assert len(index) == 0
+    assert index.find_reuse("doc2", {"pan_number": "ZZZZZ9999Z"}) == []
+
+
+def test_conflicting_identifiers():
+    index = IdentityIndex()
+    index.add("doc1", {"pan_number": "ABCDE1234F", "aadhaar_number": "234567890124"})
+
+    conflicts = index.conflicting_identifiers(
+        {"pan_number": "abcde-1234-f", "aadhaar_number": "987654321012", "voter_id_number": "XYZ1234567"}, "doc1"
+    )
+    assert conflicts == [{"field": "aadhaar_number", "label": "Aadhaar"}]
+
+
+def test_invalid_identifiers_are_not_indexed():
+    index = IdentityIndex()
+    # A bare "DL No:" label extracted as the number, and a bad Aadhaar checksum
+    index.add("doc1", {"dl_number": "DL", "aadhaar_number": "2345 6789 0123", "name": "Rahul Kumar"})
+    index.add("doc2", {"dl_number": "DL", "name": "Priya Singh"})
+
+    assert len(index) == 0
+    assert index.find_reuse("doc2", {"dl_number": "DL"}) == []
+
+
+def test_different_driving_licences_do_not_collide():
+    index = IdentityIndex()
+    index.add("doc1", {"dl_number": "MH12 20150001234", "name": "Rahul Kumar"})
+    index.add("doc2", {"dl_number": "KA01 19990012345", "name": "Priya Singh"})
+
+    assert index.find_reuse("doc2", {"dl_number": "KA01 19990012345"}) == []
+    reuse = index.find_reuse("doc3", {"dl_number": "MH-12-2015-0001234", "name": "Amit Shah"})
+    assert [finding["document_ids"] for finding in reuse] == [["doc1"]]
@@ -0,0 +1,39 @@
+import asyncio
+
+from src.extraction.engine import ExtractionEngine
+from src.ocr.page import OCRPage
+
+PAN_TEXT = "\n".join([
+    "INCOME TAX DEPARTMENT",
+    "Name: RAHUL KUMAR",
+    "Father's Name: SURESH KUMAR",
+    "Date of Birth 15/08/1990 Permanent Account Number",
+    "ABCDE1234F",
+])
+
+
+def make_engine():
+    engine = ExtractionEngine()
+    engine.close()  # rules only
+    return engine
+
+
+def test_layout_date_keeps_only_the_formatted_part():
+    page = OCRPage.from_text(PAN_TEXT, engine="test")
+    fields = make_engine().extract_by_layout(page, "pan_card")
+
+    assert fields["dob"] == "15/08/1990"
+    assert fields["name"] == "RAHUL KUMAR"
+    assert fields["father_name"] == "SURESH KUMAR"
+
+
+def test_unformatted_layout_value_does_not_replace_regex_match():
+    text = "Name: RAHUL KUMAR\nDate of Birth: see overleaf\nABCDE1234F\n15/08/1990"
+    page = OCRPage.from_text(text, engine="test")
+    engine = make_engine()
+
+    assert "dob" not in engine.extract_by_layout(page, "pan_card")
+    fields = asyncio.run(engine.extract(text, "pan_card", page=page))
+    assert fields["dob"] == "15/08/1990"
+    assert fields["name"] == "RAHUL KUMAR"
+    assert fields["pan_number"] == "ABCDE1234F"
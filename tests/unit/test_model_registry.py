@@ -0,0 +1,90 @@
+import threading
+import time
+
+import pytest
+
+from src.core.model_registry import ModelRegistry, SerializedModel
+
+
+class Model:
+    def __init__(self):
+        self.closed = False
+        self.calls = 0
+
+    def predict(self, value):
+        self.calls += 1
+        return value * 2
+
+    def close(self):
+        self.closed = True
+
+
+def test_acquire_shares_and_last_release_closes():
+    registry = ModelRegistry()
+    loads = []
+
+    def factory():
+        loads.append(1)
+        return Model()
+
+    first = registry.acquire(("ocr", "en"), factory)
+    second = registry.acquire(("ocr", "en"), factory)
+    assert first is second
+    assert loads == [1]
+    assert registry.stats()["('ocr', 'en')"]["refcount"] == 2
+
+    registry.release(("ocr", "en"))
+    assert not first.closed
+    registry.release(("ocr", "en"))
+    assert first.closed
+    assert registry.stats() == {}
+
+
+def test_concurrent_acquires_load_once():
+    registry = ModelRegistry()
+    loads = []
+
+    def slow_factory():
+        loads.append(1)
+        time.sleep(0.1)
+        return Model()
+
+    handles = []
+    threads = [
+        threading.Thread(target=lambda: handles.append(registry.acquire("key", slow_factory)))
+        for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert loads == [1]
+    assert len({id(handle) for handle in handles}) == 1
+    assert registry.stats()["key"]["refcount"] == 4
+
+
+def test_non_thread_safe_models_are_serialized():
+    registry = ModelRegistry()
+    handle = registry.acquire("key", Model, thread_safe=False)
+
+    assert isinstance(handle, SerializedModel)
+    assert handle.predict(2) == 4
+    assert handle.wrapped.calls == 1
+
+
+def test_failed_load_is_recorded_and_retried():
+    registry = ModelRegistry()
+
+    def broken():
+        raise RuntimeError("weights missing")
+
+    with pytest.raises(RuntimeError):
+        registry.acquire("key", broken)
+    assert registry.load_failures() == {"key": "weights missing"}
+    assert registry._loading == {}
+    assert registry.stats() == {}
+
+    model = registry.acquire("key", Model)
+    assert isinstance(model, Model)
+    assert registry.load_failures() == {}
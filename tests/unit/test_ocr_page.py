@@ -0,0 +1,70 @@
+import numpy as np
+
+from src.ocr.page import OCRPage
+
+
+def detection(text, x, y, width=40, height=10, confidence=0.9):
+    return {"text": text, "confidence": confidence, "bbox": {"x": x, "y": y, "width": width, "height": height}}
+
+
+def card_page():
+    # Shuffled engine output: two lines plus a value printed below its label
+    return OCRPage.from_detections([
+        detection("KUMAR", 100, 11),
+        detection("Name:", 0, 10),
+        detection("RAHUL", 50, 12),
+        detection("Father's Name", 0, 40, width=90),
+        detection("SURESH KUMAR", 5, 60, width=90),
+        detection("stray", -200, 61),
+    ], engine="test", width=300, height=100)
+
+
+def test_tokens_are_sorted_into_reading_order():
+    page = card_page()
+
+    assert page.lines() == ["Name: RAHUL KUMAR", "Father's Name", "stray SURESH KUMAR"]
+    assert page.text == "Name: RAHUL KUMAR\nFather's Name\nstray SURESH KUMAR"
+    assert page.line_count == 3
+    assert list(page.line_ids) == [0, 0, 0, 1, 2, 2]
+    assert page.boxes.dtype == np.float32
+
+
+def test_value_after_label_same_line_and_below():
+    page = card_page()
+
+    assert page.value_after_label(r"^name") == "RAHUL KUMAR"
+    # Below the label, ignoring tokens left of the label's column
+    assert page.value_after_label(r"father'?s\s+name") == "SURESH KUMAR"
+    assert page.value_after_label(r"date\s+of\s+birth") is None
+
+
+def test_polygons_and_empty_detections():
+    page = OCRPage.from_polygons([
+        ([[10, 0], [50, 0], [50, 10], [10, 10]], "PAN", 0.8),
+        ([[0, 0], [8, 0], [8, 10], [0, 10]], " ", 0.1),
+    ], engine="paddleocr")
+
+    assert page.tokens == ["PAN"]
+    assert page.boxes.tolist() == [[10, 0, 40, 10]]
+    assert abs(page.mean_confidence - 0.8) < 1e-6
+    assert len(OCRPage.from_detections([], engine="test")) == 0
+    assert OCRPage.empty().mean_confidence == 0.0
+
+
+def test_region_queries_and_serialization():
+    page = card_page()
+
+    assert list(page.line_box(0)) == [0, 10, 140, 22]
+    assert page.line_box(9) is None
+    assert [page.tokens[i] for i in page.tokens_in_region(40, 0, 200, 30)] == ["RAHUL", "KUMAR"]
+
+    data = page.to_dict()
+    assert data["tokens"] == page.tokens
+    assert data["line_ids"] == [0, 0, 0, 1, 2, 2]
+    assert len(data["boxes"]) == len(data["confidences"]) == 6
+
+
+def test_from_text_keeps_one_token_per_line():
+    page = OCRPage.from_text("Name: RAHUL\n\n  DOB 15/08/1990 ", engine="native_text", language="en")
+    assert page.lines() == ["Name: RAHUL", "DOB 15/08/1990"]
+    assert page.language == "en"
@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+from PIL import Image
+
+from src.ingestion import PDFDocument, PageLimitError, is_pdf, iter_document_pages
+
+
+def write_pdf(path, pages=3):
+    """Image-only PDF whose page i is filled with gray level 40 * (i + 1)."""
+    images = [Image.new("RGB", (200, 100), (40 * (i + 1),) * 3) for i in range(pages)]
+    images[0].save(path, save_all=True, append_images=images[1:], resolution=72)
+    return str(path)
+
+
+def test_is_pdf_checks_the_signature(tmp_path):
+    pdf = write_pdf(tmp_path / "scan.pdf")
+    renamed = tmp_path / "scan.jpg"
+    renamed.write_bytes(open(pdf, "rb").read())
+    fake = tmp_path / "fake.pdf"
+    fake.write_bytes(b"not a pdf")
+
+    assert is_pdf(pdf)
+    assert is_pdf(str(renamed))
+    assert not is_pdf(str(fake))
+    assert not is_pdf(str(tmp_path / "missing.pdf"))
+
+
+def test_scanned_pages_are_rendered_in_order(tmp_path):
+    path = write_pdf(tmp_path / "scan.pdf")
+    with PDFDocument(path, dpi=72) as pdf:
+        assert pdf.page_count == 3
+        pages = list(pdf.iter_pages())
+
+    assert [page.index for page in pages] == [0, 1, 2]
+    assert all(page.source == "pdf_raster" and not page.has_text_layer for page in pages)
+    assert pages[0].image.shape[:2] == (100, 200)
+    assert [int(np.median(page.image)) for page in pages] == [40, 80, 120]
+
+
+def test_rendered_pages_are_lru_bounded(tmp_path):
+    path = write_pdf(tmp_path / "scan.pdf")
+    with PDFDocument(path, dpi=72, max_rendered_pages=1) as pdf:
+        first = pdf.render(0)
+        assert pdf.render(0) is first
+        pdf.render(1)
+        assert list(pdf._rendered) == [1]
+
+
+def test_pdfs_over_the_page_limit_are_rejected(tmp_path):
+    path = write_pdf(tmp_path / "long.pdf", pages=3)
+    with pytest.raises(PageLimitError) as info:
+        PDFDocument(path, max_pages=2)
+    assert (info.value.page_count, info.value.max_pages) == (3, 2)
+
+    with PDFDocument(path, max_pages=3) as pdf:
+        assert pdf.page_count == 3
+
+
+def test_loader_streams_pdf_pages(tmp_path):
+    path = write_pdf(tmp_path / "scan.pdf", pages=2)
+    assert [page.index for page in iter_document_pages(path)] == [0, 1]
@@ -0,0 +1,142 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.orchestration.pipeline import PipelineError, Stage, StagedPipeline
+
+
+def run(pipeline, **inputs):
+    return asyncio.run(pipeline.run(**inputs))
+
+
+def test_stages_run_after_their_inputs():
+    order = []
+
+    def stage(name, result):
+        def func(**kwargs):
+            order.append(name)
+            return result
+        return func
+
+    pipeline = StagedPipeline([
+        # Declared out of order: consumers before producers
+        Stage("report", stage("report", "done"), inputs=("summary",), outputs=("report",)),
+        Stage("summarize", stage("summarize", "s"), inputs=("text",), outputs=("summary",)),
+        Stage("ocr", stage("ocr", "t"), inputs=("image",), outputs=("text",)),
+    ])
+    result = run(pipeline, image="img")
+
+    assert order == ["ocr", "summarize", "report"]
+    assert result["report"] == "done"
+    assert set(result.timings_ms) == {"ocr", "summarize", "report"}
+
+
+def test_independent_stages_overlap():
+    executor = ThreadPoolExecutor(max_workers=2)
+
+    def slow(**kwargs):
+        time.sleep(0.2)
+        return True
+
+    pipeline = StagedPipeline([
+        Stage("a", slow, inputs=("x",), outputs=("a",), executor=executor),
+        Stage("b", slow, inputs=("x",), outputs=("b",), executor=executor),
+    ])
+    start = time.perf_counter()
+    run(pipeline, x=1)
+    assert time.perf_counter() - start < 0.35
+    executor.shutdown()
+
+
+def test_multiple_outputs_are_shared_by_consumers():
+    calls = []
+
+    def produce(x):
+        calls.append(x)
+        return {"left": x + 1, "right": x + 2}
+
+    pipeline = StagedPipeline([
+        Stage("split", produce, inputs=("x",), outputs=("left", "right")),
+        Stage("add", lambda left, right: left + right, inputs=("left", "right"), outputs=("sum",)),
+        Stage("double", lambda left: left * 2, inputs=("left",), outputs=("double",)),
+    ])
+    result = run(pipeline, x=1)
+
+    assert calls == [1]
+    assert result["sum"] == 5
+    assert result["double"] == 4
+
+
+def test_supplied_outputs_skip_their_stage():
+    def fail(**kwargs):
+        raise AssertionError("should be skipped")
+
+    pipeline = StagedPipeline([
+        Stage("ocr", fail, inputs=("image",), outputs=("text",)),
+        Stage("classify", lambda text: text.upper(), inputs=("text",), outputs=("label",)),
+    ])
+    result = run(pipeline, image="img", text="cached")
+
+    assert result.skipped == ["ocr"]
+    assert result["label"] == "CACHED"
+    assert "ocr" not in result.timings_ms
+
+
+def test_optional_failure_yields_none_and_continues():
+    def broken(**kwargs):
+        raise RuntimeError("detector crashed")
+
+    pipeline = StagedPipeline([
+        Stage("checks", broken, inputs=("image",), outputs=("checks",), optional=True),
+        Stage("multi", broken, inputs=("image",), outputs=("m1", "m2"), optional=True),
+        Stage("report", lambda checks, m1: (checks, m1), inputs=("checks", "m1"), outputs=("report",)),
+    ])
+    result = run(pipeline, image="img")
+
+    assert result["report"] == (None, None)
+    assert result["m2"] is None
+    assert result.errors == {"checks": "detector crashed", "multi": "detector crashed"}
+
+
+def test_required_failure_raises_and_cancels_the_rest():
+    cancelled = []
+
+    async def waits_forever(x):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    def broken(x):
+        raise ValueError("bad page")
+
+    pipeline = StagedPipeline([
+        Stage("slow", waits_forever, inputs=("x",), outputs=("slow",)),
+        Stage("ocr", broken, inputs=("x",), outputs=("text",)),
+    ])
+    with pytest.raises(PipelineError) as info:
+        run(pipeline, x=1)
+
+    assert info.value.stage == "ocr"
+    assert isinstance(info.value.error, ValueError)
+    assert cancelled == [True]
+
+
+def test_invalid_graphs_are_rejected():
+    with pytest.raises(ValueError, match="cycle"):
+        StagedPipeline([
+            Stage("a", lambda b: b, inputs=("b",), outputs=("a",)),
+            Stage("b", lambda a: a, inputs=("a",), outputs=("b",)),
+        ])
+    with pytest.raises(ValueError, match="produced by both"):
+        StagedPipeline([
+            Stage("a", lambda: 1, outputs=("x",)),
+            Stage("b", lambda: 2, outputs=("x",)),
+        ])
+
+    pipeline = StagedPipeline([Stage("a", lambda missing: missing, inputs=("missing",), outputs=("a",))])
+    with pytest.raises(ValueError, match="unknown value"):
+        run(pipeline)
@@ -0,0 +1,76 @@
+from pathlib import Path
+
+import cv2
+import numpy as np
+import pytest
+
+from src.core.config import get_settings
+from src.fraud import detect_tampering
+from src.fraud.tamper import TILE, _windows
+
+ROOT = Path(__file__).resolve().parents[2]
+CLEAN_SAMPLES = sorted(
+    list(ROOT.glob("synthetic_data/samples/*.jpg"))
+    + [ROOT / name for name in ("sample_aadhaar.jpg", "valid_aadhaar.jpg", "test_input.jpg") if (ROOT / name).exists()]
+)
+
+
+def reencode(image, quality=92):
+    _, buffer = cv2.imencode(".jpg", image, [cv2.IMWRITE_JPEG_QUALITY, quality])
+    return cv2.imdecode(buffer, cv2.IMREAD_COLOR)
+
+
+def photographed_page(height=1200, width=1800):
+    """A phone photo of a document: uneven lighting, sensor noise and text, larger than one window."""
+    rng = np.random.default_rng(0)
+    lighting = rng.uniform(150, 230, (height // 60, width // 60, 3)).astype(np.float32)
+    page = cv2.resize(lighting, (width, height), interpolation=cv2.INTER_CUBIC)
+    for row in range(12):
+        cv2.putText(page, f"LINE {row} NAME SURNAME 1234 5678", (60, 90 + row * 90),
+                    cv2.FONT_HERSHEY_SIMPLEX, 1.2, (30, 30, 30), 2, cv2.LINE_AA)
+    page = np.clip(page + rng.normal(0, 3, page.shape), 0, 255).astype(np.uint8)
+    return reencode(page)
+
+
+@pytest.mark.parametrize("path", CLEAN_SAMPLES, ids=lambda path: path.name)
+def test_clean_samples_stay_below_threshold(path):
+    result = detect_tampering(cv2.imread(str(path)))
+
+    assert result.tamper_score < get_settings().TAMPER_THRESHOLD, result.to_dict()
+    assert not result.is_suspicious
+
+
+def test_clean_photographed_page_is_not_suspicious():
+    assert not detect_tampering(photographed_page()).is_suspicious
+
+
+def test_edit_in_the_page_margin_is_found():
+    page = photographed_page()
+    # Retouched patch (noise smoothed away) in the bottom-right corner, outside any centre window
+    page[1040:1168, 1620:1780] = cv2.GaussianBlur(page[1040:1168, 1620:1780], (7, 7), 0)
+
+    result = detect_tampering(reencode(page), max_side=1280)
+
+    assert result.is_suspicious
+    assert not result.timed_out
+    region = result.regions[0]
+    assert region["x"] >= 1600 and region["y"] >= 1024
+
+
+def test_windows_cover_the_page_on_tile_boundaries():
+    windows = _windows(1200, 1808, 1280)
+
+    assert len(windows) == 2
+    covered = np.zeros((1200, 1808), dtype=int)
+    for rows, cols in windows:
+        assert rows.start % TILE == 0 and cols.start % TILE == 0
+        assert rows.stop - rows.start <= 1280 and cols.stop - cols.start <= 1280
+        covered[rows, cols] += 1
+    assert (covered == 1).all()
+
+
+def test_windows_past_the_budget_are_skipped():
+    result = detect_tampering(photographed_page(), max_side=256, time_budget_ms=1)
+
+    assert result.timed_out
+    assert 0.0 <= result.tamper_score <= 1.0
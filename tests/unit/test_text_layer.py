@@ -0,0 +1,33 @@
+from src.ingestion import assess_text_layer, is_usable_text_layer
+
+AADHAAR_TEXT = "Government of India\nRahul Kumar\nDOB: 15/08/1990\nMale\n2345 6789 0124"
+
+
+def test_real_text_is_usable():
+    quality = assess_text_layer(AADHAAR_TEXT)
+    assert quality.usable
+    assert quality.reason == ""
+    assert quality.alnum_ratio > 0.8
+
+
+def test_indic_scripts_count_as_word_characters():
+    # Devanagari vowel signs are combining marks, not punctuation
+    assert is_usable_text_layer("भारत सरकार राहुल कुमार जन्म तिथि पुरुष", min_chars=10)
+
+
+def test_empty_and_short_layers_need_ocr():
+    assert assess_text_layer("").reason == "too_short"
+    assert assess_text_layer("   \n  ").reason == "too_short"
+    assert assess_text_layer("Page 1", min_chars=20).reason == "too_short"
+
+
+def test_unmapped_glyphs_need_ocr():
+    cid_text = " ".join(["(cid:12)(cid:34)"] * 10) + " Aadhaar"
+    assert assess_text_layer(cid_text, min_chars=5).reason == "unmapped_glyphs"
+    assert assess_text_layer("Rahul ���� Kumar ��", min_chars=5).reason == "unmapped_glyphs"
+
+
+def test_symbol_soup_needs_ocr():
+    quality = assess_text_layer("|||| ~~~~ //// .... ---- ;;;; AB", min_chars=5)
+    assert not quality.usable
+    assert quality.reason == "low_alnum_ratio"
@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+from PIL import Image
+
+from src.ingestion import PageLimitError, TIFFDocument, is_tiff, iter_document_pages
+from src.orchestration.processor import group_pages_by_type
+
+
+def write_tiff(path, frames=3, mode="RGB"):
+    """Multi-page TIFF whose frame i is filled with gray level 40 * (i + 1)."""
+    images = [Image.new(mode, (60, 30), 40 * (i + 1) if mode in ("L", "1") else (40 * (i + 1),) * 3) for i in range(frames)]
+    images[0].save(path, save_all=True, append_images=images[1:])
+    return str(path)
+
+
+def test_is_tiff_checks_the_signature(tmp_path):
+    path = write_tiff(tmp_path / "batch.tif")
+    fake = tmp_path / "fake.tif"
+    fake.write_bytes(b"not a tiff")
+
+    assert is_tiff(path)
+    assert not is_tiff(str(fake))
+
+
+def test_frames_stream_as_bgr_pages(tmp_path):
+    path = write_tiff(tmp_path / "batch.tif", mode="L")
+    with TIFFDocument(path) as tiff:
+        assert tiff.page_count == 3
+        pages = list(tiff.iter_pages())
+
+    assert [page.index for page in pages] == [0, 1, 2]
+    assert all(page.source == "tiff_frame" for page in pages)
+    assert pages[0].image.shape == (30, 60, 3)
+    assert pages[0].image.dtype == np.uint8
+    assert [int(page.image[0, 0, 0]) for page in pages] == [40, 80, 120]
+
+
+def test_tiffs_over_the_page_limit_are_rejected(tmp_path):
+    path = write_tiff(tmp_path / "batch.tif", frames=3)
+    with pytest.raises(PageLimitError):
+        TIFFDocument(path, max_pages=2)
+    assert len(list(iter_document_pages(path))) == 3
+
+
+def test_batches_split_on_confident_type_changes():
+    page_types = [
+        {"type": "aadhaar_card", "confidence": 0.9},
+        {"type": "unknown", "confidence": 0.0},  # backside stays with its card
+        {"type": "pan_card", "confidence": 0.8},
+        {"type": "aadhaar_card", "confidence": 0.4},  # not confident enough to split
+        {"type": "passport", "confidence": 0.95},
+    ]
+    assert group_pages_by_type(page_types) == [[0, 1], [2, 3], [4]]
@@ -0,0 +1,127 @@
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from src.fraud import vector_index
+from src.fraud.vector_index import HAS_HNSWLIB, VectorIndex
+
+DIM = 16
+BACKENDS = ["numpy"] + (["hnswlib"] if HAS_HNSWLIB else [])
+
+
+def unit(seed):
+    vector = np.random.default_rng(seed).normal(size=DIM).astype(np.float32)
+    return vector / np.linalg.norm(vector)
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+@pytest.fixture
+def indexes():
+    """Close every index a test opens, stopping its maintenance thread."""
+    opened = []
+
+    def open_index(directory=None, backend="numpy"):
+        index = VectorIndex(DIM, directory=str(directory) if directory else None, backend=backend)
+        opened.append(index)
+        return index
+
+    yield open_index
+    for index in opened:
+        index.close()
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_add_search_remove(indexes, backend):
+    index = indexes(backend=backend)
+    for i in range(20):
+        index.add(f"doc-{i}", unit(i))
+
+    assert index.search(unit(7), k=1) == [("doc-7", pytest.approx(1.0, abs=1e-5))]
+    assert "doc-7" not in [doc_id for doc_id, _ in index.search(unit(7), k=3, exclude="doc-7")]
+
+    index.remove("doc-7")
+    assert "doc-7" not in index
+    assert index.search(unit(7), k=1)[0][0] != "doc-7"
+    assert len(index) == 19
+
+
+def test_rejects_wrong_dimension(indexes):
+    with pytest.raises(ValueError):
+        indexes().add("doc", np.zeros(DIM + 1, dtype=np.float32))
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_snapshot_round_trip_keeps_deletions(indexes, tmp_path, backend):
+    index = indexes(tmp_path, backend)
+    index.add("kept", unit(1))
+    index.add("deleted", unit(2))
+    index.remove("deleted")
+    index.close()
+
+    reloaded = indexes(tmp_path, backend)
+    assert "kept" in reloaded and "deleted" not in reloaded
+    np.testing.assert_allclose(reloaded.get("kept"), unit(1), atol=1e-6)
+
+
+def test_other_workers_shards_are_merged(indexes, tmp_path, monkeypatch):
+    monkeypatch.setattr(vector_index, "SHARD_REFRESH_SECONDS", 0.05)
+    monkeypatch.setenv("DOCVERIFY_WORKER_ID", "1")
+    other = indexes(tmp_path)
+    other.add("from-worker-1", unit(1))
+    other.close()
+
+    monkeypatch.setenv("DOCVERIFY_WORKER_ID", "0")
+    index = indexes(tmp_path)
+    assert "from-worker-1" in index
+
+    # Shards saved while serving are picked up by the maintenance thread
+    monkeypatch.setenv("DOCVERIFY_WORKER_ID", "1")
+    other = indexes(tmp_path)
+    other.add("later", unit(2))
+    other.remove("from-worker-1")
+    other.close()
+    monkeypatch.setenv("DOCVERIFY_WORKER_ID", "0")
+
+    assert wait_for(lambda: "later" in index and "from-worker-1" not in index)
+
+
+def test_inserts_and_searches_do_not_wait_for_snapshot_writes(indexes, tmp_path, monkeypatch):
+    monkeypatch.setattr(vector_index.settings, "EMBEDDING_INDEX_SAVE_EVERY", 2)
+    writing, release = threading.Event(), threading.Event()
+    original_save = vector_index._NumpyBackend.save
+
+    def slow_save(backend, path):
+        writing.set()
+        release.wait(5)
+        original_save(backend, path)
+
+    monkeypatch.setattr(vector_index._NumpyBackend, "save", slow_save)
+    index = indexes(tmp_path)
+    index.add("a", unit(1))
+    index.add("b", unit(2))
+    assert writing.wait(5), "snapshot was not handed to the maintenance thread"
+
+    # The disk write is stalled; the request path must still go through
+    done = threading.Event()
+
+    def request_path():
+        index.add("c", unit(3))
+        index.search(unit(3), k=1)
+        done.set()
+
+    threading.Thread(target=request_path, daemon=True).start()
+    assert done.wait(1)
+
+    release.set()
+    assert wait_for(lambda: (tmp_path / "index.numpy.0.json").exists())
+    assert index._unsaved == 1  # "c" arrived during the write and is left for the next snapshot